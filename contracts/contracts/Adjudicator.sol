@@ -28,6 +28,32 @@ contract Adjudicator {
         address indexed stakingProvider
     );
 
+    struct CFragEvaluation {
+        bytes capsule;
+        bytes cFrag;
+        bytes cFragSignature;
+        bytes taskSignature;
+        bytes requesterPublicKey;
+        bytes operatorPublicKey;
+        bytes operatorIdentityEvidence;
+        bytes preComputedData;
+    }
+
+    enum EvaluationStatus {
+        EVALUATED,
+        ALREADY_EVALUATED,
+        FAILED
+    }
+
+    struct CFragVerdict {
+        bytes32 evaluationHash;
+        EvaluationStatus status;
+        bool correctness;
+        address operator;
+        address stakingProvider;
+        string failure;
+    }
+
     SignatureVerifier.HashAlgorithm public immutable hashAlgorithm;
     uint256 public immutable basePenalty;
     uint256 public immutable penaltyHistoryCoefficient;
@@ -73,14 +99,14 @@ contract Adjudicator {
      * @param _preComputedData Additional pre-computed data for CFrag correctness verification
      */
     function evaluateCFrag(
-        bytes memory _capsuleBytes,
-        bytes memory _cFragBytes,
+        bytes calldata _capsuleBytes,
+        bytes calldata _cFragBytes,
         bytes memory _cFragSignature,
         bytes memory _taskSignature,
         bytes memory _requesterPublicKey,
         bytes memory _operatorPublicKey,
         bytes memory _operatorIdentityEvidence,
-        bytes memory _preComputedData
+        bytes calldata _preComputedData
     ) public {
         // 1. Check that CFrag is not evaluated yet
         bytes32 evaluationHash = SignatureVerifier.hash(
@@ -91,14 +117,187 @@ contract Adjudicator {
         evaluatedCFrags[evaluationHash] = true;
 
         // 2. Verify correctness of re-encryption
-        bool cFragIsCorrect = ReEncryptionValidator.validateCFrag(
+        // Capsule, CFrag and precomputed data are deserialized once, directly from calldata
+        UmbralDeserializer.PreComputedData memory precomp = _preComputedData
+            .toPreComputedDataCalldata();
+        bool cFragIsCorrect;
+        // metadata is scoped to keep the capsule within reach of the stack below
+        {
+            bytes memory metadata;
+            (cFragIsCorrect, metadata) = verifyCFrag(_capsuleBytes, _cFragBytes, precomp);
+            emit CFragEvaluated(evaluationHash, msg.sender, cFragIsCorrect);
+
+            // 3. Verify associated public keys and signatures
+            verifySignatures(
+                _cFragBytes,
+                _cFragSignature,
+                _taskSignature,
+                _requesterPublicKey,
+                _operatorPublicKey,
+                metadata,
+                precomp
+            );
+        }
+
+        // Verify that _taskSignature is bob's signature of the task specification.
+        // 4. Extract operator address from stamp signature.
+        address operator = recoverOperator(
             _capsuleBytes,
-            _cFragBytes,
-            _preComputedData
+            _taskSignature,
+            _requesterPublicKey,
+            _operatorPublicKey,
+            _operatorIdentityEvidence,
+            precomp
+        );
+        address stakingProvider = application.operatorToStakingProvider(operator);
+        require(stakingProvider != address(0), "Operator must be associated with a provider");
+
+        // 5. Check that staking provider can be slashed
+        uint96 stakingProviderValue = application.authorizedStake(stakingProvider);
+        require(stakingProviderValue > 0, "Provider has no tokens");
+
+        // 6. If CFrag was incorrect, slash staking provider
+        if (!cFragIsCorrect) {
+            // uint96 penalty = calculatePenalty(stakingProvider, stakingProviderValue);
+            // application.slash(stakingProvider, penalty, msg.sender);
+            emit IncorrectCFragVerdict(evaluationHash, operator, stakingProvider);
+        }
+    }
+
+    /**
+     * @notice Submit several CFrags for evaluation in one transaction
+     * @dev CFrags that have already been evaluated, including duplicates within the batch,
+     * are skipped. CFrags that can't be evaluated, e.g. because of an invalid signature or
+     * an unbonded operator, are reported as failed instead of reverting the whole batch
+     * @param _evaluations Arguments of `evaluateCFrag` for each CFrag
+     * @return verdicts Result of the evaluation for each CFrag, in order
+     */
+    function evaluateCFrags(
+        CFragEvaluation[] calldata _evaluations
+    ) external returns (CFragVerdict[] memory verdicts) {
+        verdicts = new CFragVerdict[](_evaluations.length);
+        for (uint256 i = 0; i < _evaluations.length; i++) {
+            CFragEvaluation calldata evaluation = _evaluations[i];
+            CFragVerdict memory verdict = verdicts[i];
+            verdict.evaluationHash = SignatureVerifier.hash(
+                abi.encodePacked(evaluation.capsule, evaluation.cFrag),
+                hashAlgorithm
+            );
+            if (evaluatedCFrags[verdict.evaluationHash]) {
+                verdict.status = EvaluationStatus.ALREADY_EVALUATED;
+                continue;
+            }
+
+            try this.checkCFrag(evaluation) returns (
+                bool cFragIsCorrect,
+                address operator,
+                address stakingProvider
+            ) {
+                evaluatedCFrags[verdict.evaluationHash] = true;
+                verdict.status = EvaluationStatus.EVALUATED;
+                verdict.correctness = cFragIsCorrect;
+                verdict.operator = operator;
+                verdict.stakingProvider = stakingProvider;
+            } catch Error(string memory reason) {
+                verdict.status = EvaluationStatus.FAILED;
+                verdict.failure = reason;
+                continue;
+            } catch {
+                verdict.status = EvaluationStatus.FAILED;
+                continue;
+            }
+
+            emit CFragEvaluated(verdict.evaluationHash, msg.sender, verdict.correctness);
+            if (!verdict.correctness) {
+                emit IncorrectCFragVerdict(
+                    verdict.evaluationHash,
+                    verdict.operator,
+                    verdict.stakingProvider
+                );
+            }
+        }
+    }
+
+    /**
+     * @notice Verify correctness, keys and signatures of one CFrag without recording the result
+     * @dev Reverts if the CFrag can't be evaluated
+     * @param _evaluation Arguments of `evaluateCFrag`
+     * @return cFragIsCorrect Correctness of re-encryption
+     * @return operator Operator that created the CFrag
+     * @return stakingProvider Staking provider of the operator
+     */
+    function checkCFrag(
+        CFragEvaluation calldata _evaluation
+    ) external view returns (bool cFragIsCorrect, address operator, address stakingProvider) {
+        (cFragIsCorrect, operator) = evaluate(_evaluation);
+        stakingProvider = application.operatorToStakingProvider(operator);
+        require(stakingProvider != address(0), "Operator must be associated with a provider");
+        require(application.authorizedStake(stakingProvider) > 0, "Provider has no tokens");
+    }
+
+    /**
+     * @notice Verify correctness, keys and signatures of one CFrag from the batch
+     * @return cFragIsCorrect Correctness of re-encryption
+     * @return operator Operator that created the CFrag
+     */
+    function evaluate(
+        CFragEvaluation calldata _evaluation
+    ) internal view virtual returns (bool cFragIsCorrect, address operator) {
+        UmbralDeserializer.PreComputedData memory precomp = _evaluation
+            .preComputedData
+            .toPreComputedDataCalldata();
+        bytes memory metadata;
+        (cFragIsCorrect, metadata) = verifyCFrag(_evaluation.capsule, _evaluation.cFrag, precomp);
+        verifySignatures(
+            _evaluation.cFrag,
+            _evaluation.cFragSignature,
+            _evaluation.taskSignature,
+            _evaluation.requesterPublicKey,
+            _evaluation.operatorPublicKey,
+            metadata,
+            precomp
+        );
+        operator = recoverOperator(
+            _evaluation.capsule,
+            _evaluation.taskSignature,
+            _evaluation.requesterPublicKey,
+            _evaluation.operatorPublicKey,
+            _evaluation.operatorIdentityEvidence,
+            precomp
         );
-        emit CFragEvaluated(evaluationHash, msg.sender, cFragIsCorrect);
+    }
 
-        // 3. Verify associated public keys and signatures
+    /**
+     * @notice Verify correctness of re-encryption
+     * @return cFragIsCorrect Correctness of re-encryption
+     * @return metadata Metadata of the CFrag correctness proof
+     */
+    function verifyCFrag(
+        bytes calldata _capsuleBytes,
+        bytes calldata _cFragBytes,
+        UmbralDeserializer.PreComputedData memory _precomp
+    ) internal pure returns (bool cFragIsCorrect, bytes memory metadata) {
+        UmbralDeserializer.CapsuleFrag memory cFrag = _cFragBytes.toCapsuleFragCalldata();
+        cFragIsCorrect = ReEncryptionValidator.validateCFrag(
+            _capsuleBytes.toCapsuleCalldata(),
+            cFrag,
+            _precomp
+        );
+        metadata = cFrag.proof.metadata;
+    }
+
+    /**
+     * @notice Verify associated public keys and operator's signatures of CFrag and task
+     */
+    function verifySignatures(
+        bytes calldata _cFragBytes,
+        bytes memory _cFragSignature,
+        bytes memory _taskSignature,
+        bytes memory _requesterPublicKey,
+        bytes memory _operatorPublicKey,
+        bytes memory _metadata,
+        UmbralDeserializer.PreComputedData memory _precomp
+    ) internal view {
         require(
             ReEncryptionValidator.checkSerializedCoordinates(_operatorPublicKey),
             "Staker's public key is invalid"
@@ -108,13 +307,11 @@ contract Adjudicator {
             "Requester's public key is invalid"
         );
 
-        UmbralDeserializer.PreComputedData memory precomp = _preComputedData.toPreComputedData();
-
         // Verify operator's signature of CFrag
         require(
             SignatureVerifier.verify(
                 _cFragBytes,
-                abi.encodePacked(_cFragSignature, precomp.lostBytes[1]),
+                abi.encodePacked(_cFragSignature, _precomp.lostBytes[1]),
                 _operatorPublicKey,
                 hashAlgorithm
             ),
@@ -122,24 +319,35 @@ contract Adjudicator {
         );
 
         // Verify operator's signature of taskSignature and that it corresponds to cfrag.proof.metadata
-        UmbralDeserializer.CapsuleFrag memory cFrag = _cFragBytes.toCapsuleFrag();
         require(
             SignatureVerifier.verify(
                 _taskSignature,
-                abi.encodePacked(cFrag.proof.metadata, precomp.lostBytes[2]),
+                abi.encodePacked(_metadata, _precomp.lostBytes[2]),
                 _operatorPublicKey,
                 hashAlgorithm
             ),
             "Task signature is invalid"
         );
+    }
 
-        // Verify that _taskSignature is bob's signature of the task specification.
-        // A task specification is: capsule + ursula pubkey + alice address + blockhash
+    /**
+     * @notice Verify that _taskSignature is bob's signature of the task specification
+     * and extract operator address from stamp signature
+     * @dev A task specification is: capsule + ursula pubkey + alice address + blockhash
+     */
+    function recoverOperator(
+        bytes calldata _capsuleBytes,
+        bytes memory _taskSignature,
+        bytes memory _requesterPublicKey,
+        bytes memory _operatorPublicKey,
+        bytes memory _operatorIdentityEvidence,
+        UmbralDeserializer.PreComputedData memory _precomp
+    ) internal view returns (address operator) {
         bytes32 stampXCoord;
         assembly {
             stampXCoord := mload(add(_operatorPublicKey, 32))
         }
-        bytes memory stamp = abi.encodePacked(precomp.lostBytes[4], stampXCoord);
+        bytes memory stamp = abi.encodePacked(_precomp.lostBytes[4], stampXCoord);
 
         require(
             SignatureVerifier.verify(
@@ -147,34 +355,20 @@ contract Adjudicator {
                     _capsuleBytes,
                     stamp,
                     _operatorIdentityEvidence,
-                    precomp.alicesKeyAsAddress,
+                    _precomp.alicesKeyAsAddress,
                     bytes32(0)
                 ),
-                abi.encodePacked(_taskSignature, precomp.lostBytes[3]),
+                abi.encodePacked(_taskSignature, _precomp.lostBytes[3]),
                 _requesterPublicKey,
                 hashAlgorithm
             ),
             "Specification signature is invalid"
         );
 
-        // 4. Extract operator address from stamp signature.
-        address operator = SignatureVerifier.recover(
+        operator = SignatureVerifier.recover(
             SignatureVerifier.hashEIP191(stamp, bytes1(0x45)), // Currently, we use version E (0x45) of EIP191 signatures
             _operatorIdentityEvidence
         );
-        address stakingProvider = application.operatorToStakingProvider(operator);
-        require(stakingProvider != address(0), "Operator must be associated with a provider");
-
-        // 5. Check that staking provider can be slashed
-        uint96 stakingProviderValue = application.authorizedStake(stakingProvider);
-        require(stakingProviderValue > 0, "Provider has no tokens");
-
-        // 6. If CFrag was incorrect, slash staking provider
-        if (!cFragIsCorrect) {
-            // uint96 penalty = calculatePenalty(stakingProvider, stakingProviderValue);
-            // application.slash(stakingProvider, penalty, msg.sender);
-            emit IncorrectCFragVerdict(evaluationHash, operator, stakingProvider);
-        }
     }
 
     /**
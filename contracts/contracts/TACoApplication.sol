@@ -290,6 +290,18 @@ contract TACoApplication is ITACoChildToRoot, OwnableUpgradeable {
         return stakingProviderInfo[_stakingProvider].authorized;
     }
 
+    /**
+     * @notice Get tokens delegated to several staking providers in one call
+     */
+    function authorizedStakes(
+        address[] calldata _stakingProviders
+    ) external view returns (uint96[] memory stakes) {
+        stakes = new uint96[](_stakingProviders.length);
+        for (uint256 i = 0; i < _stakingProviders.length; i++) {
+            stakes[i] = stakingProviderInfo[_stakingProviders[i]].authorized;
+        }
+    }
+
     /**
      * @notice Returns the amount of stake that are going to be effectively
      *         staked until the specified date. I.e: in case a deauthorization
@@ -156,10 +156,11 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
     mapping(uint256 index => Ritual ritual) public rituals;
     uint256 public numberOfRituals;
     mapping(bytes32 handoverKey => Handover handover) public handovers;
+    mapping(uint256 index => bytes32 digest) internal aggregatedTranscriptDigests;
     // Note: Adjust the __preSentinelGap size if more contract variables are added
 
     // Storage area for sentinel values
-    uint256[15] internal __preSentinelGap;
+    uint256[14] internal __preSentinelGap;
     Participant internal __sentinelParticipant;
     uint256[20] internal __postSentinelGap;
 
@@ -369,37 +370,40 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         uint32 id = uint32(numberOfRituals);
         Ritual storage ritual = rituals[id];
         numberOfRituals += 1;
+        // Writes are grouped by slot and never read back, see `scripts/storage_layout.py`
+        uint32 initTimestamp = uint32(block.timestamp);
         ritual.initiator = msg.sender;
+        ritual.initTimestamp = initTimestamp;
+        ritual.endTimestamp = initTimestamp + duration;
+        //
         ritual.authority = authority;
         ritual.dkgSize = length;
         ritual.threshold = getThresholdForRitualSize(length);
-        ritual.initTimestamp = uint32(block.timestamp);
-        ritual.endTimestamp = ritual.initTimestamp + duration;
+        //
         ritual.accessController = accessController;
         ritual.feeModel = feeModel;
 
+        // TODO: Improve check for eligible nodes (staking, etc) - nucypher#3109
+        uint96[] memory authorizedStakes = application.authorizedStakes(providers);
         address previous = address(0);
         for (uint256 i = 0; i < length; i++) {
             Participant storage newParticipant = ritual.participant.push();
             address current = providers[i];
             // Make sure that current provider has already set their public key
-            ParticipantKey[] storage participantHistory = participantKeysHistory[current];
-            require(participantHistory.length > 0, "Provider has not set their public key");
-
-            require(previous < current, "Providers must be sorted");
-            // TODO: Improve check for eligible nodes (staking, etc) - nucypher#3109
-            // TODO: Change check to isAuthorized(), without amount
             require(
-                application.authorizedStake(current) >= minAuthorization,
-                "Not enough authorization"
+                participantKeysHistory[current].length > 0,
+                "Provider has not set their public key"
             );
+
+            require(previous < current, "Providers must be sorted");
+            require(authorizedStakes[i] >= minAuthorization, "Not enough authorization");
             newParticipant.provider = current;
             previous = current;
         }
 
         feeModel.processRitualPayment(msg.sender, id, length, duration);
 
-        emit StartRitual(id, ritual.authority, providers);
+        emit StartRitual(id, authority, providers);
         return id;
     }
 
@@ -428,27 +432,52 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
     // }
 
     function publishTranscript(uint32 ritualId, bytes calldata transcript) external {
-        _postTranscript(ritualId, transcript);
+        uint256 initialGasLeft = gasleft();
+        address provider = application.operatorToStakingProvider(msg.sender);
+        _postTranscript(ritualId, transcript, provider);
+        requireAuthorization(provider);
+        processReimbursement(initialGasLeft);
     }
 
-    function _postTranscript(uint32 ritualId, bytes calldata transcript) internal {
+    /**
+     * @notice Publishes transcripts for several rituals in a single transaction
+     * @dev The operator is resolved, its authorization checked and the submitter
+     * reimbursed once for the whole batch
+     */
+    function publishTranscripts(uint32[] calldata ritualIds, bytes[] calldata transcripts) external {
         uint256 initialGasLeft = gasleft();
+        uint256 length = ritualIds.length;
+        require(length > 0 && length == transcripts.length, "Invalid batch");
+        address provider = application.operatorToStakingProvider(msg.sender);
+        for (uint256 i = 0; i < length; i++) {
+            _postTranscript(ritualIds[i], transcripts[i], provider);
+        }
+        requireAuthorization(provider);
+        processReimbursement(initialGasLeft);
+    }
 
+    function requireAuthorization(address provider) internal view {
+        require(application.authorizedStake(provider) > 0, "Not enough authorization");
+    }
+
+    function _postTranscript(
+        uint32 ritualId,
+        bytes calldata transcript,
+        address provider
+    ) internal {
         Ritual storage ritual = rituals[ritualId];
         require(
             getRitualState(ritual) == RitualState.DKG_AWAITING_TRANSCRIPTS,
             "Not waiting for transcripts"
         );
 
+        uint16 dkgSize = ritual.dkgSize;
         require(
-            transcript.length == expectedTranscriptSize(ritual.dkgSize, ritual.threshold),
+            transcript.length == expectedTranscriptSize(dkgSize, ritual.threshold),
             "Invalid transcript size"
         );
 
-        address provider = application.operatorToStakingProvider(msg.sender);
         Participant storage participant = getParticipant(ritual, provider);
-
-        require(application.authorizedStake(provider) > 0, "Not enough authorization");
         require(participant.transcript.length == 0, "Node already posted transcript");
 
         // TODO: Validate transcript size based on dkg size
@@ -457,13 +486,13 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         bytes32 transcriptDigest = keccak256(transcript);
         participant.transcript = transcript;
         emit TranscriptPosted(ritualId, provider, transcriptDigest);
-        ritual.totalTranscripts++;
+        uint16 totalTranscripts = ritual.totalTranscripts + 1;
+        ritual.totalTranscripts = totalTranscripts;
 
         // end round
-        if (ritual.totalTranscripts == ritual.dkgSize) {
+        if (totalTranscripts == dkgSize) {
             emit StartAggregationRound(ritualId);
         }
-        processReimbursement(initialGasLeft);
     }
 
     function getAuthority(uint32 ritualId) external view returns (address) {
@@ -477,67 +506,120 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         bytes calldata decryptionRequestStaticKey
     ) external {
         uint256 initialGasLeft = gasleft();
+        address provider = application.operatorToStakingProvider(msg.sender);
+        _postAggregation(
+            ritualId,
+            aggregatedTranscript,
+            dkgPublicKey,
+            decryptionRequestStaticKey,
+            provider
+        );
+        requireAuthorization(provider);
+        processReimbursement(initialGasLeft);
+    }
+
+    /**
+     * @notice Posts aggregations for several rituals in a single transaction
+     * @dev The operator is resolved, its authorization checked and the submitter
+     * reimbursed once for the whole batch
+     */
+    function postAggregations(
+        uint32[] calldata ritualIds,
+        bytes[] calldata aggregatedTranscripts,
+        BLS12381.G1Point[] calldata dkgPublicKeys,
+        bytes[] calldata decryptionRequestStaticKeys
+    ) external {
+        uint256 initialGasLeft = gasleft();
+        uint256 length = ritualIds.length;
+        require(
+            length > 0 &&
+                length == aggregatedTranscripts.length &&
+                length == dkgPublicKeys.length &&
+                length == decryptionRequestStaticKeys.length,
+            "Invalid batch"
+        );
+        address provider = application.operatorToStakingProvider(msg.sender);
+        for (uint256 i = 0; i < length; i++) {
+            _postAggregation(
+                ritualIds[i],
+                aggregatedTranscripts[i],
+                dkgPublicKeys[i],
+                decryptionRequestStaticKeys[i],
+                provider
+            );
+        }
+        requireAuthorization(provider);
+        processReimbursement(initialGasLeft);
+    }
 
+    function _postAggregation(
+        uint32 ritualId,
+        bytes calldata aggregatedTranscript,
+        BLS12381.G1Point calldata dkgPublicKey,
+        bytes calldata decryptionRequestStaticKey,
+        address provider
+    ) internal {
         Ritual storage ritual = rituals[ritualId];
         require(
             getRitualState(ritual) == RitualState.DKG_AWAITING_AGGREGATIONS,
             "Not waiting for aggregations"
         );
 
-        address provider = application.operatorToStakingProvider(msg.sender);
-        Participant storage participant = getParticipant(ritual, provider);
-        require(application.authorizedStake(provider) > 0, "Not enough authorization");
+        {
+            Participant storage participant = getParticipant(ritual, provider);
+            require(!participant.aggregated, "Node already posted aggregation");
 
-        require(!participant.aggregated, "Node already posted aggregation");
+            require(
+                participant.decryptionRequestStaticKey.length == 0,
+                "Node already provided decryption request static key"
+            );
 
-        require(
-            participant.decryptionRequestStaticKey.length == 0,
-            "Node already provided decryption request static key"
-        );
+            require(
+                decryptionRequestStaticKey.length == DECRYPTION_REQUEST_KEY_LENGTH,
+                "Invalid length for decryption request static key"
+            );
 
-        require(
-            decryptionRequestStaticKey.length == DECRYPTION_REQUEST_KEY_LENGTH,
-            "Invalid length for decryption request static key"
-        );
+            participant.aggregated = true;
+            participant.decryptionRequestStaticKey = decryptionRequestStaticKey;
+        }
 
+        uint16 dkgSize = ritual.dkgSize;
         require(
-            aggregatedTranscript.length == expectedTranscriptSize(ritual.dkgSize, ritual.threshold),
+            aggregatedTranscript.length == expectedTranscriptSize(dkgSize, ritual.threshold),
             "Invalid transcript size"
         );
 
         // nodes commit to their aggregation result
         bytes32 aggregatedTranscriptDigest = keccak256(aggregatedTranscript);
-        participant.aggregated = true;
-        participant.decryptionRequestStaticKey = decryptionRequestStaticKey;
         emit AggregationPosted(ritualId, provider, aggregatedTranscriptDigest);
 
         if (ritual.aggregatedTranscript.length == 0) {
             ritual.aggregatedTranscript = aggregatedTranscript;
             ritual.publicKey = dkgPublicKey;
+            aggregatedTranscriptDigests[ritualId] = aggregatedTranscriptDigest;
         } else if (
             !BLS12381.eqG1Point(ritual.publicKey, dkgPublicKey) ||
-            keccak256(ritual.aggregatedTranscript) != aggregatedTranscriptDigest
+            getAggregatedTranscriptDigest(ritualId, ritual) != aggregatedTranscriptDigest
         ) {
             ritual.aggregationMismatch = true;
             delete ritual.publicKey;
             emit EndRitual({ritualId: ritualId, successful: false});
+            return;
         }
 
-        if (!ritual.aggregationMismatch) {
-            ritual.totalAggregations++;
-            if (ritual.totalAggregations == ritual.dkgSize) {
-                // processPendingFee(ritualId); TODO consider to notify feeModel
-                // Register ritualId + 1 to discern ritualID#0 from unregistered keys.
-                // See getRitualIdFromPublicKey() for inverse operation.
-                bytes32 registryKey = keccak256(
-                    abi.encodePacked(BLS12381.g1PointToBytes(dkgPublicKey))
-                );
-                ritualPublicKeyRegistry[registryKey] = ritualId + 1;
-                emit EndRitual({ritualId: ritualId, successful: true});
-            }
+        uint16 totalAggregations = ritual.totalAggregations + 1;
+        ritual.totalAggregations = totalAggregations;
+        if (totalAggregations == dkgSize) {
+            // processPendingFee(ritualId); TODO consider to notify feeModel
+            // Register ritualId + 1 to discern ritualID#0 from unregistered keys.
+            // See getRitualIdFromPublicKey() for inverse operation.
+            bytes32 registryKey = keccak256(
+                abi.encodePacked(BLS12381.g1PointToBytes(dkgPublicKey))
+            );
+            ritualPublicKeyRegistry[registryKey] = ritualId + 1;
+            emit EndRitual({ritualId: ritualId, successful: true});
+            application.addRitualParticipants(ritualId);
         }
-
-        processReimbursement(initialGasLeft);
     }
 
     function handoverRequest(
@@ -640,9 +722,16 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         emit HandoverCanceled(ritualId, departingParticipant, incomingParticipant);
     }
 
+    /**
+     * @notice Finalizes the handover by replacing the departing participant's share
+     * @param aggregatedTranscript Aggregated transcript with the blinded share of the
+     * incoming participant in place of the departing one. Only the replaced share is read
+     * from storage to check it against the current transcript.
+     */
     function finalizeHandover(
         uint32 ritualId,
-        address departingParticipant
+        address departingParticipant,
+        bytes calldata aggregatedTranscript
     ) external onlyRole(HANDOVER_SUPERVISOR_ROLE) {
         require(isRitualActive(ritualId), "Ritual is not active");
 
@@ -663,8 +752,13 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         delete participant.transcript;
 
         uint256 startIndex = blindedSharePosition(participantIndex, ritual.threshold);
-        replaceStorageBytes(ritual.aggregatedTranscript, handover.blindedShare, startIndex);
-        bytes32 aggregatedTranscriptDigest = keccak256(ritual.aggregatedTranscript);
+        bytes32 aggregatedTranscriptDigest = replaceBlindedShare(
+            ritualId,
+            ritual,
+            aggregatedTranscript,
+            handover.blindedShare,
+            startIndex
+        );
         emit AggregationPosted(ritualId, incomingParticipant, aggregatedTranscriptDigest);
 
         handover.requestTimestamp = 0;
@@ -674,9 +768,90 @@ contract Coordinator is Initializable, AccessControlDefaultAdminRulesUpgradeable
         delete handover.decryptionRequestStaticKey;
 
         emit HandoverFinalized(ritualId, departingParticipant, incomingParticipant);
+        application.replaceRitualParticipant(ritualId, departingParticipant, incomingParticipant);
         application.release(departingParticipant);
     }
 
+    function getAggregatedTranscriptDigest(
+        uint32 ritualId,
+        Ritual storage ritual
+    ) internal view returns (bytes32 digest) {
+        digest = aggregatedTranscriptDigests[ritualId];
+        // rituals aggregated before digests were recorded
+        if (digest == bytes32(0)) {
+            digest = keccak256(ritual.aggregatedTranscript);
+        }
+    }
+
+    function replaceBlindedShare(
+        uint32 ritualId,
+        Ritual storage ritual,
+        bytes calldata aggregatedTranscript,
+        bytes memory blindedShare,
+        uint256 startIndex
+    ) internal returns (bytes32 aggregatedTranscriptDigest) {
+        uint256 endIndex = startIndex + BLS12381.G2_POINT_SIZE;
+        require(
+            aggregatedTranscript.length == ritual.aggregatedTranscript.length,
+            "Invalid transcript size"
+        );
+        require(
+            keccak256(aggregatedTranscript[startIndex:endIndex]) == keccak256(blindedShare),
+            "Wrong blinded share"
+        );
+        bytes memory previousShare = readStorageBytes(
+            ritual.aggregatedTranscript,
+            startIndex,
+            BLS12381.G2_POINT_SIZE
+        );
+        require(
+            keccak256(
+                abi.encodePacked(
+                    aggregatedTranscript[:startIndex],
+                    previousShare,
+                    aggregatedTranscript[endIndex:]
+                )
+            ) == getAggregatedTranscriptDigest(ritualId, ritual),
+            "Aggregated transcript mismatch"
+        );
+
+        replaceStorageBytes(ritual.aggregatedTranscript, blindedShare, startIndex);
+        aggregatedTranscriptDigest = keccak256(aggregatedTranscript);
+        aggregatedTranscriptDigests[ritualId] = aggregatedTranscriptDigest;
+    }
+
+    function readStorageBytes(
+        bytes storage _bytes,
+        uint256 startIndex,
+        uint256 length
+    ) internal view returns (bytes memory result) {
+        assembly {
+            result := mload(0x40)
+            mstore(result, length)
+
+            // get the keccak hash to get the contents of the array
+            mstore(0x0, _bytes.slot)
+            // Start reading from the word that contains `startIndex`
+            let sc := add(keccak256(0x0, 0x20), div(startIndex, 32))
+            let shift := mul(mod(startIndex, 32), 8)
+
+            let mc := add(result, 0x20)
+            let end := add(mc, length)
+            // Each memory word is stitched from the tail of one stored word
+            // and the head of the next one
+            for {
+
+            } lt(mc, end) {
+                sc := add(sc, 1)
+                mc := add(mc, 0x20)
+            } {
+                mstore(mc, or(shl(shift, sload(sc)), shr(sub(256, shift), sload(add(sc, 1)))))
+            }
+
+            mstore(0x40, mc)
+        }
+    }
+
     function replaceStorageBytes(
         bytes storage _preBytes,
         bytes memory _postBytes,
@@ -27,4 +27,9 @@ interface ITACoRootToChild {
     ) external;
 
     function release(address stakingProvider) external;
+
+    /**
+     * @notice Applies encoded calls of `updateOperator`, `updateAuthorization` and `release` in order
+     */
+    function batchUpdate(bytes[] calldata updates) external;
 }
@@ -25,6 +25,16 @@ contract ReimbursementPool is Ownable, ReentrancyGuard, IReimbursementPool {
     ///         against malicious operator-miners.
     uint256 public maxGasPrice;
 
+    /// @notice If enabled, refunds are accrued per receiver instead of being
+    ///         sent right away. Receivers withdraw accrued refunds with `claim`.
+    bool public accrualMode;
+
+    /// @notice Refunds accrued per receiver and not claimed yet.
+    mapping(address => uint256) public accrued;
+
+    /// @notice Sum of all accrued refunds; reserved from the pool balance.
+    uint256 public totalAccrued;
+
     event StaticGasUpdated(uint256 newStaticGas);
 
     event MaxGasPriceUpdated(uint256 newMaxGasPrice);
@@ -37,6 +47,12 @@ contract ReimbursementPool is Ownable, ReentrancyGuard, IReimbursementPool {
 
     event FundsWithdrawn(uint256 withdrawnAmount, address receiver);
 
+    event AccrualModeUpdated(bool enabled);
+
+    event RefundAccrued(uint256 refundAmount, address indexed receiver);
+
+    event RefundClaimed(uint256 claimedAmount, address indexed receiver);
+
     constructor(uint256 _staticGas, uint256 _maxGasPrice) Ownable(msg.sender) {
         staticGas = _staticGas;
         maxGasPrice = _maxGasPrice;
@@ -63,6 +79,18 @@ contract ReimbursementPool is Ownable, ReentrancyGuard, IReimbursementPool {
 
         uint256 refundAmount = (gasSpent + staticGas) * gasPrice;
 
+        if (accrualMode) {
+            // Accruals are only recorded while they are covered by the pool balance
+            if (address(this).balance < totalAccrued + refundAmount) {
+                emit SendingEtherFailed(refundAmount, receiver);
+                return;
+            }
+            accrued[receiver] += refundAmount;
+            totalAccrued += refundAmount;
+            emit RefundAccrued(refundAmount, receiver);
+            return;
+        }
+
         /* solhint-disable avoid-low-level-calls */
         // slither-disable-next-line low-level-calls,unchecked-lowlevel
         (bool sent, ) = receiver.call{value: refundAmount}("");
@@ -73,6 +101,22 @@ contract ReimbursementPool is Ownable, ReentrancyGuard, IReimbursementPool {
         }
     }
 
+    /// @notice Sends all refunds accrued for the caller.
+    function claim() external nonReentrant {
+        uint256 amount = accrued[msg.sender];
+        require(amount > 0, "Nothing to claim");
+
+        accrued[msg.sender] = 0;
+        totalAccrued -= amount;
+        emit RefundClaimed(amount, msg.sender);
+
+        /* solhint-disable avoid-low-level-calls */
+        // slither-disable-next-line low-level-calls
+        (bool sent, ) = msg.sender.call{value: amount}("");
+        /* solhint-enable avoid-low-level-calls */
+        require(sent, "Failed to send Ether");
+    }
+
     /// @notice Authorize a contract that can interact with this reimbursment pool.
     ///         Can be authorized by the owner only.
     /// @param _contract Authorized contract.
@@ -110,11 +154,20 @@ contract ReimbursementPool is Ownable, ReentrancyGuard, IReimbursementPool {
         emit MaxGasPriceUpdated(_maxGasPrice);
     }
 
+    /// @notice Enables or disables accrual of refunds. Refunds accrued before
+    ///         disabling remain claimable. Can be set by the owner only.
+    /// @param enabled Whether refunds should be accrued.
+    function setAccrualMode(bool enabled) external onlyOwner {
+        accrualMode = enabled;
+
+        emit AccrualModeUpdated(enabled);
+    }
+
     /// @notice Withdraws all ETH from this pool which are sent to a given
-    ///         address. Can be set by the owner only.
+    ///         address, except for accrued refunds. Can be set by the owner only.
     /// @param receiver An address where ETH is sent.
     function withdrawAll(address receiver) external onlyOwner {
-        withdraw(address(this).balance, receiver);
+        withdraw(address(this).balance - totalAccrued, receiver);
     }
 
     /// @notice Withdraws ETH amount from this pool which are sent to a given
@@ -122,7 +175,10 @@ contract ReimbursementPool is Ownable, ReentrancyGuard, IReimbursementPool {
     /// @param amount Amount to withdraw from the pool.
     /// @param receiver An address where ETH is sent.
     function withdraw(uint256 amount, address receiver) public onlyOwner {
-        require(address(this).balance >= amount, "Insufficient contract balance");
+        require(
+            address(this).balance >= totalAccrued + amount,
+            "Insufficient contract balance"
+        );
         require(receiver != address(0), "Receiver's address cannot be zero");
 
         emit FundsWithdrawn(amount, receiver);
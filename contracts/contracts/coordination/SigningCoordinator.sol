@@ -241,13 +241,11 @@ contract SigningCoordinator is Initializable, AccessControlDefaultAdminRulesUpgr
         signingCohort.endTimestamp = signingCohort.initTimestamp + duration;
         signingCohort.chains.push(chainId);
 
+        uint96[] memory authorizedStakes = application.authorizedStakes(providers);
         address previous = address(0);
         for (uint256 i = 0; i < length; i++) {
             address current = providers[i];
-            require(
-                application.authorizedStake(current) >= minAuthorization,
-                "Not enough authorization"
-            );
+            require(authorizedStakes[i] >= minAuthorization, "Not enough authorization");
             require(previous < current, "Providers must be sorted");
             SigningCohortParticipant storage newParticipant = signingCohort.signers.push();
             newParticipant.provider = current;
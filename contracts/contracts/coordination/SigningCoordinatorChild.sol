@@ -12,9 +12,15 @@ contract SigningCoordinatorChild is ISigningCoordinatorChild, Initializable, Own
     mapping(uint32 => address) public cohortMultisigs;
     ThresholdSigningMultisigCloneFactory public signingMultisigFactory;
     address public allowedCaller;
+    // Counterfactual mode: only the cohort parameters are recorded and the
+    // multisig clone is deployed lazily via `deployPendingCohortMultiSig`
+    bool public counterfactualDeployment;
+    mapping(uint32 => bytes32) public pendingCohortParameters;
 
     event MultisigFactoryUpdated(address oldFactory, address newFactory);
     event AllowedCallerUpdated(address oldCaller, address newCaller);
+    event CounterfactualDeploymentSet(bool enabled);
+    event CohortMultisigRegistered(uint32 indexed cohortId, address predictedMultisig);
 
     constructor() {
         _disableInitializers();
@@ -46,6 +52,34 @@ contract SigningCoordinatorChild is ISigningCoordinatorChild, Initializable, Own
         allowedCaller = _allowedCaller;
     }
 
+    function setCounterfactualDeployment(bool enabled) external onlyOwner {
+        counterfactualDeployment = enabled;
+        emit CounterfactualDeploymentSet(enabled);
+    }
+
+    function getCohortParametersHash(
+        address[] calldata signers,
+        uint16 threshold
+    ) public pure returns (bytes32) {
+        return keccak256(abi.encode(signers, threshold));
+    }
+
+    /**
+     * @notice Returns the multisig address for the cohort, whether deployed or pending
+     * @dev Pending multisigs resolve to the address precomputed by the current factory
+     */
+    function getCohortMultisig(uint32 cohortId) external view returns (address) {
+        address multisig = cohortMultisigs[cohortId];
+        if (multisig == address(0) && pendingCohortParameters[cohortId] != bytes32(0)) {
+            multisig = signingMultisigFactory.getCloneAddress(cohortId);
+        }
+        return multisig;
+    }
+
+    function isCohortMultisigPending(uint32 cohortId) external view returns (bool) {
+        return pendingCohortParameters[cohortId] != bytes32(0);
+    }
+
     function deployCohortMultiSig(
         uint32 cohortId,
         address[] calldata signers,
@@ -53,6 +87,46 @@ contract SigningCoordinatorChild is ISigningCoordinatorChild, Initializable, Own
     ) external {
         require(allowedCaller == msg.sender, "Unauthorized caller");
         require(cohortMultisigs[cohortId] == address(0), "Multisig already deployed");
+        require(pendingCohortParameters[cohortId] == bytes32(0), "Multisig already registered");
+        if (counterfactualDeployment) {
+            require(
+                signers.length > 0 && threshold > 0 && threshold <= signers.length,
+                "Invalid arguments"
+            );
+            pendingCohortParameters[cohortId] = getCohortParametersHash(signers, threshold);
+            emit CohortMultisigRegistered(
+                cohortId,
+                signingMultisigFactory.getCloneAddress(cohortId)
+            );
+            return;
+        }
+        _deployCohortMultiSig(cohortId, signers, threshold);
+    }
+
+    /**
+     * @notice Deploys a previously registered multisig on first use
+     * @dev Anyone can pay for the deployment, parameters must match the recorded ones
+     */
+    function deployPendingCohortMultiSig(
+        uint32 cohortId,
+        address[] calldata signers,
+        uint16 threshold
+    ) external returns (address) {
+        bytes32 parametersHash = pendingCohortParameters[cohortId];
+        require(parametersHash != bytes32(0), "Multisig not registered");
+        require(
+            parametersHash == getCohortParametersHash(signers, threshold),
+            "Invalid cohort parameters"
+        );
+        delete pendingCohortParameters[cohortId];
+        return _deployCohortMultiSig(cohortId, signers, threshold);
+    }
+
+    function _deployCohortMultiSig(
+        uint32 cohortId,
+        address[] calldata signers,
+        uint16 threshold
+    ) internal returns (address) {
         address multisig = signingMultisigFactory.deploySigningMultisig(
             signers,
             threshold,
@@ -61,6 +135,7 @@ contract SigningCoordinatorChild is ISigningCoordinatorChild, Initializable, Own
         );
         cohortMultisigs[cohortId] = multisig;
         emit CohortMultisigDeployed(cohortId, multisig);
+        return multisig;
     }
 
     function updateMultiSigParameters(
@@ -71,6 +146,23 @@ contract SigningCoordinatorChild is ISigningCoordinatorChild, Initializable, Own
     ) external {
         require(allowedCaller == msg.sender, "Unauthorized caller");
         address multisig = cohortMultisigs[cohortId];
+        if (multisig == address(0) && pendingCohortParameters[cohortId] != bytes32(0)) {
+            // not deployed yet, so only a full replacement can be recorded
+            require(clearSigners, "Multisig pending deployment");
+            require(
+                signers.length > 0 && threshold > 0 && threshold <= signers.length,
+                "Invalid arguments"
+            );
+            pendingCohortParameters[cohortId] = getCohortParametersHash(signers, threshold);
+            emit CohortMultisigUpdated(
+                cohortId,
+                signingMultisigFactory.getCloneAddress(cohortId),
+                signers,
+                threshold,
+                clearSigners
+            );
+            return;
+        }
         require(multisig != address(0), "Multisig not deployed");
         IThresholdSigningMultisig multisigContract = IThresholdSigningMultisig(multisig);
         multisigContract.updateMultiSigParameters(signers, threshold, clearSigners);
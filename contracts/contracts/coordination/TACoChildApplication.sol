@@ -43,6 +43,9 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         bool released;
     }
 
+    bytes4 internal constant UPDATE_AUTHORIZATION_SELECTOR =
+        bytes4(keccak256("updateAuthorization(address,uint96,uint96,uint64)"));
+
     ITACoChildToRoot public immutable rootApplication;
     address public coordinator;
 
@@ -54,6 +57,8 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
     address public adjudicator;
     uint32[] public blockingRituals;
     address public blockingRitualsAdmin;
+    mapping(uint32 ritualId => bool) public isBlockingRitual;
+    mapping(address stakingProvider => uint32 endTimestamp) public blockedUntil;
 
     /**
      * @dev Checks caller is root application
@@ -95,12 +100,113 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         blockingRitualsAdmin = _blockingRitualsAdmin;
     }
 
+    /**
+     * @notice Records participants of blocking rituals that were set before the upgrade
+     * @dev Derived from Coordinator state only, so anyone can call it once after the upgrade
+     */
+    function initializeBlockedProviders() external reinitializer(4) {
+        for (uint256 i = 0; i < blockingRituals.length; i++) {
+            uint32 ritualId = blockingRituals[i];
+            isBlockingRitual[ritualId] = true;
+            _blockRitualParticipants(ritualId);
+        }
+    }
+
     function setBlockingRituals(uint32[] memory _blockingRituals) external {
         require(msg.sender == blockingRitualsAdmin, "Only admin can change blocking rituals");
+        for (uint256 i = 0; i < blockingRituals.length; i++) {
+            uint32 ritualId = blockingRituals[i];
+            isBlockingRitual[ritualId] = false;
+            address[] memory providers = Coordinator(coordinator).getProviders(ritualId);
+            for (uint256 j = 0; j < providers.length; j++) {
+                delete blockedUntil[providers[j]];
+            }
+        }
+        for (uint256 i = 0; i < _blockingRituals.length; i++) {
+            uint32 ritualId = _blockingRituals[i];
+            isBlockingRitual[ritualId] = true;
+            _blockRitualParticipants(ritualId);
+        }
         blockingRituals = _blockingRituals;
     }
 
-    function authorizedStake(address _stakingProvider) external view returns (uint96) {
+    /**
+     * @notice Removes the blocking ritual that failed during DKG
+     * @dev Participants of failed rituals were never blocked, so this only shortens the list
+     */
+    function endBlockingRitual(uint32 ritualId) external {
+        require(isBlockingRitual[ritualId], "Not a blocking ritual");
+        Coordinator.RitualState state = Coordinator(coordinator).getRitualState(ritualId);
+        require(
+            state == Coordinator.RitualState.DKG_TIMEOUT ||
+                state == Coordinator.RitualState.DKG_INVALID,
+            "Ritual DKG has not failed"
+        );
+        isBlockingRitual[ritualId] = false;
+        uint256 length = blockingRituals.length;
+        for (uint256 i = 0; i < length; i++) {
+            if (blockingRituals[i] == ritualId) {
+                blockingRituals[i] = blockingRituals[length - 1];
+                blockingRituals.pop();
+                break;
+            }
+        }
+    }
+
+    /**
+     * @notice Blocks release of participants of the activated ritual until it ends,
+     * in case the ritual was set as blocking in advance
+     */
+    function addRitualParticipants(uint32 ritualId) external override {
+        require(msg.sender == coordinator, "Only Coordinator allowed to add participants");
+        if (isBlockingRitual[ritualId]) {
+            _blockRitualParticipants(ritualId);
+        }
+    }
+
+    function replaceRitualParticipant(
+        uint32 ritualId,
+        address departingProvider,
+        address incomingProvider
+    ) external override {
+        require(msg.sender == coordinator, "Only Coordinator allowed to replace participants");
+        if (!isBlockingRitual[ritualId] || !Coordinator(coordinator).isRitualActive(ritualId)) {
+            return;
+        }
+        (, uint32 endTimestamp) = Coordinator(coordinator).getTimestamps(ritualId);
+        _blockUntil(incomingProvider, endTimestamp);
+        // departing provider can still be a participant of other blocking rituals
+        delete blockedUntil[departingProvider];
+        for (uint256 i = 0; i < blockingRituals.length; i++) {
+            uint32 otherRitualId = blockingRituals[i];
+            if (
+                Coordinator(coordinator).isRitualActive(otherRitualId) &&
+                Coordinator(coordinator).isParticipant(otherRitualId, departingProvider)
+            ) {
+                (, endTimestamp) = Coordinator(coordinator).getTimestamps(otherRitualId);
+                _blockUntil(departingProvider, endTimestamp);
+            }
+        }
+    }
+
+    function _blockRitualParticipants(uint32 ritualId) internal {
+        if (!Coordinator(coordinator).isRitualActive(ritualId)) {
+            return;
+        }
+        (, uint32 endTimestamp) = Coordinator(coordinator).getTimestamps(ritualId);
+        address[] memory providers = Coordinator(coordinator).getProviders(ritualId);
+        for (uint256 i = 0; i < providers.length; i++) {
+            _blockUntil(providers[i], endTimestamp);
+        }
+    }
+
+    function _blockUntil(address stakingProvider, uint32 endTimestamp) internal {
+        if (blockedUntil[stakingProvider] < endTimestamp) {
+            blockedUntil[stakingProvider] = endTimestamp;
+        }
+    }
+
+    function authorizedStake(address _stakingProvider) public view returns (uint96) {
         StakingProviderInfo storage info = stakingProviderInfo[_stakingProvider];
         if (info.released) {
             return 0;
@@ -108,6 +214,18 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         return info.authorized;
     }
 
+    /**
+     * @notice Returns authorized stakes of several staking providers in one call
+     */
+    function authorizedStakes(
+        address[] calldata _stakingProviders
+    ) external view returns (uint96[] memory stakes) {
+        stakes = new uint96[](_stakingProviders.length);
+        for (uint256 i = 0; i < _stakingProviders.length; i++) {
+            stakes[i] = authorizedStake(_stakingProviders[i]);
+        }
+    }
+
     /**
      * @notice Returns the amount of stake that is pending authorization
      *         decrease for the given staking provider. If no authorization
@@ -163,6 +281,30 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
         _updateAuthorization(stakingProvider, authorized, deauthorizing);
     }
 
+    function batchUpdate(bytes[] calldata updates) external override onlyRootApplication {
+        for (uint256 i = 0; i < updates.length; i++) {
+            bytes calldata update = updates[i];
+            bytes4 selector = bytes4(update);
+            if (selector == this.updateOperator.selector) {
+                (address stakingProvider, address operator) = abi.decode(
+                    update[4:],
+                    (address, address)
+                );
+                _updateOperator(stakingProvider, operator);
+            } else if (selector == UPDATE_AUTHORIZATION_SELECTOR) {
+                (address stakingProvider, uint96 authorized, uint96 deauthorizing, ) = abi.decode(
+                    update[4:],
+                    (address, uint96, uint96, uint64)
+                );
+                _updateAuthorization(stakingProvider, authorized, deauthorizing);
+            } else if (selector == this.release.selector) {
+                _release(abi.decode(update[4:], (address)));
+            } else {
+                revert("Unsupported update");
+            }
+        }
+    }
+
     function _updateOperator(address stakingProvider, address operator) internal {
         StakingProviderInfo storage info = stakingProviderInfo[stakingProvider];
         address oldOperator = info.operator;
@@ -297,19 +439,17 @@ contract TACoChildApplication is ITACoRootToChild, ITACoChildApplication, Initia
                 msg.sender == coordinator,
             "Can't call release"
         );
+        _release(_stakingProvider);
+    }
+
+    function _release(address _stakingProvider) internal {
+        StakingProviderInfo storage info = stakingProviderInfo[_stakingProvider];
         if (info.released || eligibleStake(_stakingProvider) >= minimumAuthorization) {
             return;
         }
-        // check all active rituals
-        for (uint256 i = 0; i < blockingRituals.length; i++) {
-            uint32 ritualId = blockingRituals[i];
-            if (
-                Coordinator(coordinator).isRitualActive(ritualId) &&
-                Coordinator(coordinator).isParticipant(ritualId, _stakingProvider)
-            ) {
-                // still part of the ritual
-                return;
-            }
+        if (block.timestamp <= blockedUntil[_stakingProvider]) {
+            // still part of the active blocking ritual
+            return;
         }
         info.released = true;
         emit Released(_stakingProvider);
@@ -10,7 +10,11 @@ import "./AbstractSubscription.sol";
  */
 abstract contract EncryptorSlotsSubscription is AbstractSubscription {
     uint32 public startOfSubscription;
-    uint256 public usedEncryptorSlots;
+    // Packed with `startOfSubscription`: both are read on the authorization paths
+    uint216 internal encryptorSlotsInUse;
+    // Whether `usedEncryptorSlotsStub` was folded into `encryptorSlotsInUse`
+    bool internal encryptorSlotsMigrated;
+    uint256 internal usedEncryptorSlotsStub; // former usedEncryptorSlots
     // example of storage layout
     // mapping(uint256 periodNumber => Billing billing) public billingInfo;
 
@@ -42,36 +46,56 @@ abstract contract EncryptorSlotsSubscription is AbstractSubscription {
 
     function getPaidEncryptorSlots(uint256 periodNumber) public view virtual returns (uint256);
 
+    function usedEncryptorSlots() public view returns (uint256) {
+        if (encryptorSlotsMigrated) {
+            return encryptorSlotsInUse;
+        }
+        return encryptorSlotsInUse + usedEncryptorSlotsStub;
+    }
+
+    /**
+     * @dev Updates used slots with a single write of the packed slot; the value stored
+     * before the slots were packed is folded in by the first update
+     */
+    function setUsedEncryptorSlots(uint256 slots) internal {
+        if (!encryptorSlotsMigrated) {
+            usedEncryptorSlotsStub = 0;
+        }
+        encryptorSlotsInUse = uint216(slots);
+        encryptorSlotsMigrated = true;
+    }
+
     function getCurrentPeriodNumber() public view returns (uint256) {
-        if (startOfSubscription == 0) {
+        uint32 start = startOfSubscription;
+        if (start == 0) {
             return 0;
         }
-        return (block.timestamp - startOfSubscription) / subscriptionPeriodDuration;
+        return (block.timestamp - start) / subscriptionPeriodDuration;
     }
 
     function getEndOfSubscription() public view override returns (uint32 endOfSubscription) {
-        if (startOfSubscription == 0) {
+        uint32 start = startOfSubscription;
+        if (start == 0) {
             return 0;
         }
 
-        uint256 currentPeriodNumber = getCurrentPeriodNumber();
-        if (currentPeriodNumber == 0 && !isPeriodPaid(currentPeriodNumber)) {
+        uint256 currentPeriodNumber = (block.timestamp - start) / subscriptionPeriodDuration;
+        bool currentPeriodPaid = isPeriodPaid(currentPeriodNumber);
+        if (currentPeriodNumber == 0 && !currentPeriodPaid) {
             return 0;
         }
 
-        if (isPeriodPaid(currentPeriodNumber)) {
-            while (isPeriodPaid(currentPeriodNumber)) {
+        if (currentPeriodPaid) {
+            do {
                 currentPeriodNumber++;
-            }
+            } while (isPeriodPaid(currentPeriodNumber));
         } else {
-            while (!isPeriodPaid(currentPeriodNumber)) {
+            do {
                 currentPeriodNumber--;
-            }
+            } while (!isPeriodPaid(currentPeriodNumber));
             currentPeriodNumber++;
         }
-        endOfSubscription = uint32(
-            startOfSubscription + currentPeriodNumber * subscriptionPeriodDuration
-        );
+        endOfSubscription = uint32(start + currentPeriodNumber * subscriptionPeriodDuration);
     }
 
     function beforeSetAuthorization(
@@ -80,29 +104,30 @@ abstract contract EncryptorSlotsSubscription is AbstractSubscription {
         bool value
     ) public virtual override {
         super.beforeSetAuthorization(ritualId, addresses, value);
+        uint256 slots = usedEncryptorSlots();
         if (value) {
             uint256 currentPeriodNumber = getCurrentPeriodNumber();
             uint256 encryptorSlots = isPeriodPaid(currentPeriodNumber)
                 ? getPaidEncryptorSlots(currentPeriodNumber)
                 : 0;
-            usedEncryptorSlots += addresses.length;
-            require(usedEncryptorSlots <= encryptorSlots, "Encryptors slots filled up");
+            slots += addresses.length;
+            require(slots <= encryptorSlots, "Encryptors slots filled up");
+        } else if (slots >= addresses.length) {
+            slots -= addresses.length;
         } else {
-            if (usedEncryptorSlots >= addresses.length) {
-                usedEncryptorSlots -= addresses.length;
-            } else {
-                usedEncryptorSlots = 0;
-            }
+            slots = 0;
         }
+        setUsedEncryptorSlots(slots);
     }
 
     function beforeIsAuthorized(uint32 ritualId) public view virtual override {
         super.beforeIsAuthorized(ritualId);
-        // used encryptor slots must be paid
-        if (block.timestamp <= getEndOfSubscription()) {
-            uint256 currentPeriodNumber = getCurrentPeriodNumber();
+        // used encryptor slots must be paid while the current period is paid;
+        // billing and subscription slots are already warm after the check above
+        uint256 currentPeriodNumber = getCurrentPeriodNumber();
+        if (isPeriodPaid(currentPeriodNumber)) {
             require(
-                usedEncryptorSlots <= getPaidEncryptorSlots(currentPeriodNumber),
+                usedEncryptorSlots() <= getPaidEncryptorSlots(currentPeriodNumber),
                 "Encryptors slots filled up"
             );
         }
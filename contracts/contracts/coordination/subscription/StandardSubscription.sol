@@ -4,6 +4,7 @@ pragma solidity ^0.8.0;
 
 import "@openzeppelin/contracts/token/ERC20/IERC20.sol";
 import "@openzeppelin/contracts/token/ERC20/utils/SafeERC20.sol";
+import "@openzeppelin/contracts/utils/math/Math.sol";
 import "@openzeppelin-upgradeable/contracts/proxy/utils/Initializable.sol";
 import "@openzeppelin-upgradeable/contracts/access/OwnableUpgradeable.sol";
 import "./EncryptorSlotsSubscription.sol";
@@ -23,6 +24,7 @@ contract StandardSubscription is EncryptorSlotsSubscription, Initializable, Owna
 
     uint32 public constant INACTIVE_RITUAL_ID = type(uint32).max;
     uint256 public constant INCREASE_BASE = 10000;
+    uint256 public constant FEE_RATE_PRECISION = 10 ** 27;
 
     GlobalAllowList public immutable accessController;
     IERC20 public immutable feeToken;
@@ -32,6 +34,8 @@ contract StandardSubscription is EncryptorSlotsSubscription, Initializable, Owna
     uint256 public immutable baseFeeRateIncrease;
     uint256 public immutable encryptorFeeRate;
     uint256 public immutable maxNodes;
+    // Base fee growth per period, fraction of FEE_RATE_PRECISION
+    uint256 private immutable baseFeeGrowthFactor;
 
     uint32 public activeRitualId;
     mapping(uint256 periodNumber => Billing billing) public billingInfo;
@@ -131,6 +135,9 @@ contract StandardSubscription is EncryptorSlotsSubscription, Initializable, Owna
         adopterSetter = _adopterSetter;
         initialBaseFeeRate = _initialBaseFeeRate;
         baseFeeRateIncrease = _baseFeeRateIncrease;
+        baseFeeGrowthFactor =
+            ((INCREASE_BASE + _baseFeeRateIncrease) * FEE_RATE_PRECISION) /
+            INCREASE_BASE;
         encryptorFeeRate = _encryptorFeeRate;
         maxNodes = _maxNodes;
         accessController = _accessController;
@@ -181,12 +188,37 @@ contract StandardSubscription is EncryptorSlotsSubscription, Initializable, Owna
         return baseFees(currentPeriodNumber);
     }
 
-    /// @dev potential overflow after 15-16 periods
+    /**
+     * @notice Base fees for the specified period: fees of the first period compounded
+     * by `baseFeeRateIncrease` once per period
+     * @dev Compounding is done in fixed point with exponentiation by squaring, so the cost
+     * is logarithmic in the period number and intermediate values can't overflow.
+     * Mirrored by `deployment.subscription.StandardSubscriptionFees`
+     */
     function baseFees(uint256 periodNumber) public view returns (uint256) {
-        uint256 baseFeeRate = initialBaseFeeRate *
-            (INCREASE_BASE + baseFeeRateIncrease) ** periodNumber;
+        uint256 growth = compound(baseFeeGrowthFactor, periodNumber);
         return
-            (baseFeeRate * subscriptionPeriodDuration * maxNodes) / (INCREASE_BASE ** periodNumber);
+            Math.mulDiv(
+                initialBaseFeeRate * subscriptionPeriodDuration * maxNodes,
+                growth,
+                FEE_RATE_PRECISION
+            );
+    }
+
+    /**
+     * @notice Raises a fixed-point factor to the specified power, rounding down
+     */
+    function compound(uint256 factor, uint256 exponent) internal pure returns (uint256 result) {
+        result = FEE_RATE_PRECISION;
+        while (exponent > 0) {
+            if (exponent & 1 == 1) {
+                result = Math.mulDiv(result, factor, FEE_RATE_PRECISION);
+            }
+            exponent >>= 1;
+            if (exponent > 0) {
+                factor = Math.mulDiv(factor, factor, FEE_RATE_PRECISION);
+            }
+        }
     }
 
     function encryptorFees(uint128 encryptorSlots, uint32 duration) public view returns (uint256) {
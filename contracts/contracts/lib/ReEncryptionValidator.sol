@@ -53,10 +53,25 @@ library ReEncryptionValidator {
         bytes memory _cFragBytes,
         bytes memory _precomputedBytes
     ) internal pure returns (bool) {
-        UmbralDeserializer.Capsule memory _capsule = _capsuleBytes.toCapsule();
-        UmbralDeserializer.CapsuleFrag memory _cFrag = _cFragBytes.toCapsuleFrag();
-        UmbralDeserializer.PreComputedData memory _precomputed = _precomputedBytes
-            .toPreComputedData();
+        return
+            validateCFrag(
+                _capsuleBytes.toCapsule(),
+                _cFragBytes.toCapsuleFrag(),
+                _precomputedBytes.toPreComputedData()
+            );
+    }
+
+    /**
+     * @notice Check correctness of re-encryption
+     * @param _capsule Deserialized capsule
+     * @param _cFrag Deserialized capsule frag
+     * @param _precomputed Deserialized additional precomputed data
+     */
+    function validateCFrag(
+        UmbralDeserializer.Capsule memory _capsule,
+        UmbralDeserializer.CapsuleFrag memory _cFrag,
+        UmbralDeserializer.PreComputedData memory _precomputed
+    ) internal pure returns (bool) {
 
         // Extract Alice's address and check that it corresponds to the one provided
         address alicesAddress = SignatureVerifier.recover(
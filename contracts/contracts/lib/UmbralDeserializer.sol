@@ -231,6 +231,87 @@ library UmbralDeserializer {
         require(pointer == initialPointer + PRECOMPUTED_DATA_SIZE);
     }
 
+    /**
+     * @notice Deserialize to capsule (not activated) reading directly from calldata
+     */
+    function toCapsuleCalldata(
+        bytes calldata _capsuleBytes
+    ) internal pure returns (Capsule memory capsule) {
+        // solhint-disable-next-line reason-string
+        require(_capsuleBytes.length == CAPSULE_SIZE);
+        uint256 offset = getCalldataOffset(_capsuleBytes);
+        offset = copyCalldataPoint(offset, capsule.pointE);
+        offset = copyCalldataPoint(offset, capsule.pointV);
+        capsule.bnSig = uint256(getCalldataBytes32(offset));
+    }
+
+    /**
+     * @notice Deserialize to correctness proof reading directly from calldata
+     */
+    function toCorrectnessProofCalldata(
+        bytes calldata _proofBytes
+    ) internal pure returns (CorrectnessProof memory proof) {
+        // solhint-disable-next-line reason-string
+        require(_proofBytes.length >= CORRECTNESS_PROOF_SIZE);
+
+        uint256 offset = getCalldataOffset(_proofBytes);
+        offset = copyCalldataPoint(offset, proof.pointE2);
+        offset = copyCalldataPoint(offset, proof.pointV2);
+        offset = copyCalldataPoint(offset, proof.pointKFragCommitment);
+        offset = copyCalldataPoint(offset, proof.pointKFragPok);
+        proof.bnSig = uint256(getCalldataBytes32(offset));
+
+        uint256 signatureOffset = CORRECTNESS_PROOF_SIZE - SIGNATURE_SIZE;
+        proof.kFragSignature = _proofBytes[signatureOffset:CORRECTNESS_PROOF_SIZE];
+        if (_proofBytes.length > CORRECTNESS_PROOF_SIZE) {
+            proof.metadata = _proofBytes[CORRECTNESS_PROOF_SIZE:];
+        }
+    }
+
+    /**
+     * @notice Deserialize to CapsuleFrag reading directly from calldata
+     */
+    function toCapsuleFragCalldata(
+        bytes calldata _cFragBytes
+    ) internal pure returns (CapsuleFrag memory cFrag) {
+        // solhint-disable-next-line reason-string
+        require(_cFragBytes.length >= FULL_CAPSULE_FRAG_SIZE);
+
+        uint256 offset = getCalldataOffset(_cFragBytes);
+        offset = copyCalldataPoint(offset, cFrag.pointE1);
+        offset = copyCalldataPoint(offset, cFrag.pointV1);
+        cFrag.kFragId = getCalldataBytes32(offset);
+        offset += BIGNUM_SIZE;
+        copyCalldataPoint(offset, cFrag.pointPrecursor);
+
+        cFrag.proof = toCorrectnessProofCalldata(_cFragBytes[CAPSULE_FRAG_SIZE:]);
+    }
+
+    /**
+     * @notice Deserialize to precomputed data reading directly from calldata
+     */
+    function toPreComputedDataCalldata(
+        bytes calldata _preComputedData
+    ) internal pure returns (PreComputedData memory data) {
+        // solhint-disable-next-line reason-string
+        require(_preComputedData.length == PRECOMPUTED_DATA_SIZE);
+        uint256 offset = getCalldataOffset(_preComputedData);
+
+        // Coordinates and the hashed message are serialized as words in the order of the struct
+        // members, and each member of a memory struct takes exactly one word
+        uint256 wordsSize = 20 * BIGNUM_SIZE + 32;
+        assembly {
+            calldatacopy(data, offset, wordsSize)
+        }
+        offset += wordsSize;
+
+        data.alicesKeyAsAddress = address(bytes20(getCalldataBytes32(offset)));
+        offset += 20;
+
+        // Lost bytes, see `toPreComputedData`
+        data.lostBytes = bytes5(getCalldataBytes32(offset));
+    }
+
     // TODO extract to external library if needed (#1500)
     /**
      * @notice Get the memory pointer for start of array
@@ -281,6 +362,42 @@ library UmbralDeserializer {
         }
     }
 
+    /**
+     * @notice Get the calldata offset for start of array
+     */
+    function getCalldataOffset(bytes calldata _bytes) internal pure returns (uint256 offset) {
+        assembly {
+            offset := _bytes.offset
+        }
+    }
+
+    /**
+     * @notice Copy point data from calldata in the offset position
+     */
+    function copyCalldataPoint(
+        uint256 _offset,
+        Point memory _point
+    ) internal pure returns (uint256 resultOffset) {
+        uint8 temp;
+        uint256 xCoord;
+        assembly {
+            temp := byte(0, calldataload(_offset))
+            xCoord := calldataload(add(_offset, 1))
+        }
+        _point.sign = temp;
+        _point.xCoord = xCoord;
+        resultOffset = _offset + POINT_SIZE;
+    }
+
+    /**
+     * @notice Read 32 bytes from calldata in the offset position
+     */
+    function getCalldataBytes32(uint256 _offset) internal pure returns (bytes32 result) {
+        assembly {
+            result := calldataload(_offset)
+        }
+    }
+
     /**
      * @notice Copy bytes from the source pointer to the target array
      * @dev Assumes that enough memory has been allocated to store in target.
@@ -64,6 +64,9 @@ contract MockPolygonRoot is Ownable, ITACoChildToRoot, ITACoRootToChild {
         uint96 deauthorizing,
         uint64 endDeauthorization // solhint-disable-next-line no-empty-blocks
     ) external {}
+
+    // solhint-disable-next-line no-empty-blocks
+    function batchUpdate(bytes[] calldata updates) external {}
 }
 
 contract MockPolygonChild is Ownable, ITACoChildToRoot, ITACoRootToChild {
@@ -103,6 +106,10 @@ contract MockPolygonChild is Ownable, ITACoChildToRoot, ITACoRootToChild {
         );
     }
 
+    function batchUpdate(bytes[] calldata _updates) external override onlyOwner {
+        childApplication.batchUpdate(_updates);
+    }
+
     function childRelease(address _stakingProvider) external {
         childApplication.release(_stakingProvider);
     }
@@ -10,10 +10,15 @@ import "../contracts/lib/SignatureVerifier.sol";
  */
 contract TACoApplicationForAdjudicatorMock {
     uint32 public immutable secondsPerPeriod = 1;
+    address public immutable token;
     mapping(address => uint96) public stakingProviderInfo;
     mapping(address => uint256) public rewardInfo;
     mapping(address => address) internal _stakingProviderFromOperator;
 
+    constructor(address _token) {
+        token = _token;
+    }
+
     function operatorToStakingProvider(address _operator) public view returns (address) {
         return _stakingProviderFromOperator[_operator];
     }
@@ -40,6 +45,27 @@ contract TACoApplicationForAdjudicatorMock {
     }
 }
 
+/**
+ * @notice Adjudicator with scripted CFrag evaluation for testing batches
+ * @dev The capsule encodes whether signatures are valid, the correctness and the operator
+ */
+contract AdjudicatorForBatchMock is Adjudicator {
+    constructor(
+        TACoApplication _application
+    ) Adjudicator(_application, SignatureVerifier.HashAlgorithm.SHA256, 0, 0, 1) {}
+
+    function evaluate(
+        CFragEvaluation calldata _evaluation
+    ) internal pure override returns (bool cFragIsCorrect, address operator) {
+        bool signaturesAreValid;
+        (signaturesAreValid, cFragIsCorrect, operator) = abi.decode(
+            _evaluation.capsule,
+            (bool, bool, address)
+        );
+        require(signaturesAreValid, "CFrag signature is invalid");
+    }
+}
+
 ///**
 //* @notice Upgrade to this contract must lead to fail
 //*/
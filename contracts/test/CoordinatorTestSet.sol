@@ -17,6 +17,7 @@ contract ChildApplicationForCoordinatorMock is ITACoChildApplication {
     mapping(address => bool) public confirmations;
 
     mapping(address => bool) public stakingProviderReleased;
+    mapping(address => uint256) public ritualsCount;
 
     function updateOperator(address _stakingProvider, address _operator) external {
         address oldOperator = stakingProviderToOperator[_stakingProvider];
@@ -29,6 +30,15 @@ contract ChildApplicationForCoordinatorMock is ITACoChildApplication {
         authorizedStake[_stakingProvider] = _amount;
     }
 
+    function authorizedStakes(
+        address[] calldata _stakingProviders
+    ) external view returns (uint96[] memory stakes) {
+        stakes = new uint96[](_stakingProviders.length);
+        for (uint256 i = 0; i < _stakingProviders.length; i++) {
+            stakes[i] = authorizedStake[_stakingProviders[i]];
+        }
+    }
+
     function confirmOperatorAddress(address _operator) external {
         confirmations[_operator] = true;
     }
@@ -40,4 +50,62 @@ contract ChildApplicationForCoordinatorMock is ITACoChildApplication {
     function release(address _stakingProvider) external override {
         stakingProviderReleased[_stakingProvider] = true;
     }
+
+    function addRitualParticipants(uint32 _ritualId) external {
+        address[] memory providers = Coordinator(msg.sender).getProviders(_ritualId);
+        for (uint256 i = 0; i < providers.length; i++) {
+            ritualsCount[providers[i]] += 1;
+        }
+    }
+
+    function replaceRitualParticipant(
+        uint32,
+        address _departingProvider,
+        address _incomingProvider
+    ) external {
+        ritualsCount[_departingProvider] -= 1;
+        ritualsCount[_incomingProvider] += 1;
+    }
+}
+
+/**
+ * @notice Measures querying authorizations one by one, as coordinators did before,
+ * against querying them in one call
+ */
+contract AuthorizedStakesGasMock {
+    function authorizedStakeGas(
+        ITACoChildApplication _application,
+        address[] calldata _stakingProviders
+    ) external view returns (uint256 gasUsed) {
+        gasUsed = gasleft();
+        for (uint256 i = 0; i < _stakingProviders.length; i++) {
+            _application.authorizedStake(_stakingProviders[i]);
+        }
+        gasUsed -= gasleft();
+    }
+
+    function authorizedStakesGas(
+        ITACoChildApplication _application,
+        address[] calldata _stakingProviders
+    ) external view returns (uint256 gasUsed) {
+        gasUsed = gasleft();
+        _application.authorizedStakes(_stakingProviders);
+        gasUsed -= gasleft();
+    }
+}
+
+/**
+ * @notice Coordinator with rituals that were aggregated before digests of aggregated
+ * transcripts were recorded
+ */
+contract LegacyDigestCoordinatorMock is Coordinator {
+    constructor(
+        ITACoChildApplication _application,
+        uint32 _dkgTimeout,
+        uint32 _handoverTimeout
+    ) Coordinator(_application, _dkgTimeout, _handoverTimeout) {}
+
+    function deleteAggregatedTranscriptDigest(uint32 ritualId) external {
+        delete aggregatedTranscriptDigests[ritualId];
+    }
 }
@@ -0,0 +1,41 @@
+// SPDX-License-Identifier: AGPL-3.0-or-later
+
+pragma solidity ^0.8.0;
+
+/**
+ * @notice Emulates StateSender contract, so the cost of a state sync is accounted on L1
+ */
+contract StateSenderMock {
+    event StateSynced(uint256 indexed id, address indexed contractAddress, bytes data);
+
+    uint256 public counter;
+    mapping(address receiver => address sender) public registrations;
+
+    function register(address sender, address receiver) external {
+        registrations[receiver] = sender;
+    }
+
+    function syncState(address receiver, bytes calldata data) external {
+        require(registrations[receiver] == msg.sender, "Invalid sender");
+        counter++;
+        emit StateSynced(counter, receiver, data);
+    }
+}
+
+/**
+ * @notice Emulates FxRoot contract, messages must be relayed to the child tunnel manually
+ */
+contract FxRootMock {
+    StateSenderMock public stateSender;
+    address public fxChild;
+
+    constructor(StateSenderMock _stateSender, address _fxChild) {
+        stateSender = _stateSender;
+        fxChild = _fxChild;
+    }
+
+    function sendMessageToChild(address _receiver, bytes calldata _data) external {
+        bytes memory data = abi.encode(msg.sender, _receiver, _data);
+        stateSender.syncState(fxChild, data);
+    }
+}
@@ -169,6 +169,83 @@ contract UmbralDeserializerMock {
         pointPrecursorSign = bytes1(cFrag.pointPrecursor.sign);
         pointPrecursorXCoord = bytes32(cFrag.pointPrecursor.xCoord);
     }
+
+    function toCapsuleCalldata(
+        bytes calldata _capsuleBytes
+    )
+        public
+        pure
+        returns (
+            bytes1 pointESign,
+            bytes32 pointEXCoord,
+            bytes1 pointVSign,
+            bytes32 pointVXCoord,
+            bytes32 bnSig
+        )
+    {
+        UmbralDeserializer.Capsule memory capsule = _capsuleBytes.toCapsuleCalldata();
+        pointESign = bytes1(capsule.pointE.sign);
+        pointEXCoord = bytes32(capsule.pointE.xCoord);
+        pointVSign = bytes1(capsule.pointV.sign);
+        pointVXCoord = bytes32(capsule.pointV.xCoord);
+        bnSig = bytes32(capsule.bnSig);
+    }
+
+    // Serialized back to bytes because of EVM stack problems with many variables
+    function toCorrectnessProofFromCapsuleFragCalldata(
+        bytes calldata _cFragBytes
+    ) public pure returns (bytes memory) {
+        UmbralDeserializer.CorrectnessProof memory proof = _cFragBytes
+            .toCapsuleFragCalldata()
+            .proof;
+        bytes memory points = abi.encodePacked(
+            bytes1(proof.pointE2.sign),
+            bytes32(proof.pointE2.xCoord),
+            bytes1(proof.pointV2.sign),
+            bytes32(proof.pointV2.xCoord),
+            bytes1(proof.pointKFragCommitment.sign),
+            bytes32(proof.pointKFragCommitment.xCoord),
+            bytes1(proof.pointKFragPok.sign),
+            bytes32(proof.pointKFragPok.xCoord),
+            bytes32(proof.bnSig)
+        );
+        return bytes.concat(points, proof.kFragSignature, proof.metadata);
+    }
+
+    function toCapsuleFragCalldata(
+        bytes calldata _cFragBytes
+    )
+        public
+        pure
+        returns (
+            bytes1 pointE1Sign,
+            bytes32 pointE1XCoord,
+            bytes1 pointV1Sign,
+            bytes32 pointV1XCoord,
+            bytes32 kFragId,
+            bytes1 pointPrecursorSign,
+            bytes32 pointPrecursorXCoord
+        )
+    {
+        UmbralDeserializer.CapsuleFrag memory cFrag = _cFragBytes.toCapsuleFragCalldata();
+        pointE1Sign = bytes1(cFrag.pointE1.sign);
+        pointE1XCoord = bytes32(cFrag.pointE1.xCoord);
+        pointV1Sign = bytes1(cFrag.pointV1.sign);
+        pointV1XCoord = bytes32(cFrag.pointV1.xCoord);
+        kFragId = cFrag.kFragId;
+        pointPrecursorSign = bytes1(cFrag.pointPrecursor.sign);
+        pointPrecursorXCoord = bytes32(cFrag.pointPrecursor.xCoord);
+    }
+
+    function toPreComputedData(bytes memory _preComputedData) public pure returns (bytes memory) {
+        return abi.encode(_preComputedData.toPreComputedData());
+    }
+
+    function toPreComputedDataCalldata(
+        bytes calldata _preComputedData
+    ) public pure returns (bytes memory) {
+        return abi.encode(_preComputedData.toPreComputedDataCalldata());
+    }
 }
 
 /**
@@ -5,6 +5,7 @@ pragma solidity ^0.8.0;
 import "../contracts/coordination/IEncryptionAuthorizer.sol";
 import "../contracts/coordination/Coordinator.sol";
 import "../contracts/coordination/IFeeModel.sol";
+import "../contracts/coordination/subscription/StandardSubscription.sol";
 
 contract CoordinatorForStandardSubscriptionMock {
     struct Ritual {
@@ -83,3 +84,69 @@ contract CoordinatorForStandardSubscriptionMock {
         return true;
     }
 }
+
+/**
+ * @notice Keeps used encryptor slots in a separate slot, as before the slots were packed
+ */
+contract LegacyStandardSubscriptionMock is StandardSubscription {
+    constructor(
+        Coordinator _coordinator,
+        GlobalAllowList _accessController,
+        IERC20 _feeToken,
+        address _adopterSetter,
+        uint256 _initialBaseFeeRate,
+        uint256 _baseFeeRateIncrease,
+        uint256 _encryptorFeeRate,
+        uint256 _maxNodes,
+        uint32 _subscriptionPeriodDuration,
+        uint32 _yellowPeriodDuration,
+        uint32 _redPeriodDuration
+    )
+        StandardSubscription(
+            _coordinator,
+            _accessController,
+            _feeToken,
+            _adopterSetter,
+            _initialBaseFeeRate,
+            _baseFeeRateIncrease,
+            _encryptorFeeRate,
+            _maxNodes,
+            _subscriptionPeriodDuration,
+            _yellowPeriodDuration,
+            _redPeriodDuration
+        )
+    {}
+
+    function beforeSetAuthorization(
+        uint32 ritualId,
+        address[] calldata addresses,
+        bool value
+    ) public override {
+        AbstractSubscription.beforeSetAuthorization(ritualId, addresses, value);
+        if (value) {
+            uint256 currentPeriodNumber = getCurrentPeriodNumber();
+            uint256 encryptorSlots = isPeriodPaid(currentPeriodNumber)
+                ? getPaidEncryptorSlots(currentPeriodNumber)
+                : 0;
+            usedEncryptorSlotsStub += addresses.length;
+            require(usedEncryptorSlotsStub <= encryptorSlots, "Encryptors slots filled up");
+        } else {
+            if (usedEncryptorSlotsStub >= addresses.length) {
+                usedEncryptorSlotsStub -= addresses.length;
+            } else {
+                usedEncryptorSlotsStub = 0;
+            }
+        }
+    }
+
+    function beforeIsAuthorized(uint32 ritualId) public view override {
+        AbstractSubscription.beforeIsAuthorized(ritualId);
+        if (block.timestamp <= getEndOfSubscription()) {
+            uint256 currentPeriodNumber = getCurrentPeriodNumber();
+            require(
+                usedEncryptorSlotsStub <= getPaidEncryptorSlots(currentPeriodNumber),
+                "Encryptors slots filled up"
+            );
+        }
+    }
+}
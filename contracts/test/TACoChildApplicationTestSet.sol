@@ -3,7 +3,8 @@
 pragma solidity ^0.8.0;
 
 import "../contracts/coordination/ITACoRootToChild.sol";
-import "../contracts/coordination/ITACoChildToRoot.sol";
+import "../threshold/ITACoChildApplication.sol";
+import "../contracts/coordination/TACoChildApplication.sol";
 
 /**
  * @notice Contract for testing TACo child application contract
@@ -67,11 +68,13 @@ contract RootApplicationForTACoChildApplicationMock {
 }
 
 contract CoordinatorForTACoChildApplicationMock {
-    ITACoChildToRoot public immutable application;
+    ITACoChildApplication public immutable application;
 
-    mapping(uint32 ritualId => mapping(address provider => bool participant)) internal rituals;
+    mapping(uint32 ritualId => address[] providers) internal participants;
+    mapping(uint32 ritualId => uint8 state) public getRitualState;
+    mapping(uint32 ritualId => uint32 endTimestamp) internal endTimestamps;
 
-    constructor(ITACoChildToRoot _application) {
+    constructor(ITACoChildApplication _application) {
         application = _application;
     }
 
@@ -80,18 +83,70 @@ contract CoordinatorForTACoChildApplicationMock {
     }
 
     function setRitualParticipant(uint32 ritualId, address provider) external {
-        rituals[ritualId][provider] = true;
+        participants[ritualId].push(provider);
     }
 
-    function isRitualActive(uint32) external pure returns (bool) {
-        return true;
+    function activateRitual(uint32 ritualId, uint32 endTimestamp) external {
+        getRitualState[ritualId] = uint8(Coordinator.RitualState.ACTIVE);
+        endTimestamps[ritualId] = endTimestamp;
+        application.addRitualParticipants(ritualId);
+    }
+
+    function replaceRitualParticipant(
+        uint32 ritualId,
+        address departingProvider,
+        address incomingProvider
+    ) external {
+        address[] storage providers = participants[ritualId];
+        for (uint256 i = 0; i < providers.length; i++) {
+            if (providers[i] == departingProvider) {
+                providers[i] = incomingProvider;
+            }
+        }
+        application.replaceRitualParticipant(ritualId, departingProvider, incomingProvider);
+    }
+
+    function setRitualState(uint32 ritualId, uint8 state) external {
+        getRitualState[ritualId] = state;
+    }
+
+    function isRitualActive(uint32 ritualId) external view returns (bool) {
+        return getRitualState[ritualId] == uint8(Coordinator.RitualState.ACTIVE);
+    }
+
+    function getTimestamps(uint32 ritualId) external view returns (uint32, uint32) {
+        return (0, endTimestamps[ritualId]);
+    }
+
+    function getProviders(uint32 ritualId) external view returns (address[] memory) {
+        return participants[ritualId];
     }
 
     function isParticipant(uint32 ritualId, address provider) external view returns (bool) {
-        return rituals[ritualId][provider];
+        address[] storage providers = participants[ritualId];
+        for (uint256 i = 0; i < providers.length; i++) {
+            if (providers[i] == provider) {
+                return true;
+            }
+        }
+        return false;
     }
 
     function release(address _stakingProvider) external {
         application.release(_stakingProvider);
     }
 }
+
+/**
+ * @notice TACo child application that sets blocking rituals the way it did before the upgrade
+ */
+contract LegacyTACoChildApplicationMock is TACoChildApplication {
+    constructor(
+        ITACoChildToRoot _rootApplication,
+        uint96 _minimumAuthorization
+    ) TACoChildApplication(_rootApplication, _minimumAuthorization) {}
+
+    function setLegacyBlockingRituals(uint32[] memory _blockingRituals) external {
+        blockingRituals = _blockingRituals;
+    }
+}
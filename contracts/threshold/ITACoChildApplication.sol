@@ -9,6 +9,18 @@ interface ITACoChildApplication is ITACoChildToRoot {
 
     function authorizedStake(address _stakingProvider) external view returns (uint96);
 
+    function authorizedStakes(
+        address[] calldata _stakingProviders
+    ) external view returns (uint96[] memory);
+
     function minimumAuthorization() external view returns (uint96);
+
+    function addRitualParticipants(uint32 ritualId) external;
+
+    function replaceRitualParticipant(
+        uint32 ritualId,
+        address departingProvider,
+        address incomingProvider
+    ) external;
     //TODO: Function to get locked stake duration?
 }
@@ -3,16 +3,30 @@
 pragma solidity ^0.8.0;
 
 import "@fx-portal/contracts/tunnel/FxBaseRootTunnel.sol";
+import "@openzeppelin/contracts/access/Ownable.sol";
+import "../contracts/coordination/ITACoRootToChild.sol";
+
+contract PolygonRoot is FxBaseRootTunnel, Ownable {
+    event BatchingUpdated(bool enabled);
+    event MaxBatchSizeUpdated(uint256 maxBatchSize);
+    event UpdateQueued(bytes update);
+    event UpdatesFlushed(bytes32 updatesHash, uint256 updates);
 
-contract PolygonRoot is FxBaseRootTunnel {
     address public immutable rootApplication;
 
+    bool public batching;
+    // Queued updates are kept in logs, only the hash chain over them is stored
+    bytes32 public queuedUpdatesHash;
+    bytes32 public flushedUpdatesHash;
+    // State syncs are executed on the child with a fixed gas limit and are not retried on failure
+    uint256 public maxBatchSize = 50;
+
     constructor(
         address _checkpointManager,
         address _fxRoot,
         address _rootApplication,
         address _fxChildTunnel
-    ) FxBaseRootTunnel(_checkpointManager, _fxRoot) {
+    ) FxBaseRootTunnel(_checkpointManager, _fxRoot) Ownable(msg.sender) {
         require(
             _rootApplication != address(0) && _fxChildTunnel != address(0),
             "Wrong input parameters"
@@ -27,8 +41,62 @@ contract PolygonRoot is FxBaseRootTunnel {
         require(success, "Root tx failed");
     }
 
+    /**
+     * @notice Enables or disables accumulation of messages from the root application
+     * @dev While batching is enabled messages reach the child only through `flush`
+     */
+    function setBatching(bool enabled) external onlyOwner {
+        require(enabled || !hasQueuedUpdates(), "Queue is not empty");
+        batching = enabled;
+        emit BatchingUpdated(enabled);
+    }
+
+    /**
+     * @notice Sets the maximum number of messages sent to the child in one batch
+     */
+    function setMaxBatchSize(uint256 _maxBatchSize) external onlyOwner {
+        require(_maxBatchSize > 0, "Batch size must be specified");
+        maxBatchSize = _maxBatchSize;
+        emit MaxBatchSizeUpdated(_maxBatchSize);
+    }
+
+    function hasQueuedUpdates() public view returns (bool) {
+        return queuedUpdatesHash != flushedUpdatesHash;
+    }
+
+    /**
+     * @notice Sends the oldest queued messages to the child as one batch
+     * @param updates Messages from `UpdateQueued` events since the last flush, in order
+     * @param remainingUpdateHashes Hashes of the rest of the queued messages, in order
+     */
+    function flush(bytes[] calldata updates, bytes32[] calldata remainingUpdateHashes) external {
+        require(updates.length > 0, "Nothing to flush");
+        require(updates.length <= maxBatchSize, "Too many updates");
+        bytes32 updatesHash = flushedUpdatesHash;
+        for (uint256 i = 0; i < updates.length; i++) {
+            updatesHash = chainUpdate(updatesHash, keccak256(updates[i]));
+        }
+        bytes32 checkpoint = updatesHash;
+        for (uint256 i = 0; i < remainingUpdateHashes.length; i++) {
+            updatesHash = chainUpdate(updatesHash, remainingUpdateHashes[i]);
+        }
+        require(updatesHash == queuedUpdatesHash, "Updates don't match the queue");
+        flushedUpdatesHash = checkpoint;
+        emit UpdatesFlushed(checkpoint, updates.length);
+        _sendMessageToChild(abi.encodeCall(ITACoRootToChild.batchUpdate, (updates)));
+    }
+
+    function chainUpdate(bytes32 updatesHash, bytes32 updateHash) internal pure returns (bytes32) {
+        return keccak256(abi.encodePacked(updatesHash, updateHash));
+    }
+
     fallback() external payable {
         require(msg.sender == rootApplication, "Caller must be the root app");
-        _sendMessageToChild(msg.data);
+        if (!batching) {
+            _sendMessageToChild(msg.data);
+            return;
+        }
+        queuedUpdatesHash = chainUpdate(queuedUpdatesHash, keccak256(msg.data));
+        emit UpdateQueued(msg.data);
     }
 }
@@ -1,8 +1,7 @@
 from enum import IntEnum
+from functools import lru_cache
 from pathlib import Path
 
-from ape import project
-
 import deployment
 
 #
@@ -12,6 +11,7 @@ import deployment
 DEPLOYMENT_DIR = Path(deployment.__file__).parent
 CONSTRUCTOR_PARAMS_DIR = DEPLOYMENT_DIR / "constructor_params"
 ARTIFACTS_DIR = DEPLOYMENT_DIR / "artifacts"
+STORAGE_LAYOUTS_DIR = DEPLOYMENT_DIR / "storage_layouts"
 
 #
 # Domains
@@ -60,7 +60,8 @@ TESTNET_PROVIDERS = {
 # Contracts
 #
 
-OZ_DEPENDENCY = project.dependencies["openzeppelin"]["5.0.0"]
+OZ_DEPENDENCY_NAME = "openzeppelin"
+OZ_DEPENDENCY_VERSION = "5.0.0"
 
 # EIP1967 Admin slot - https://eips.ethereum.org/EIPS/eip-1967#admin-address
 EIP1967_ADMIN_SLOT = 0xB53127684A568B3173AE13B9F8A6016E243E63B6E8EE1178D6A717850B5D6103
@@ -103,3 +104,17 @@ class RitualState(IntEnum):
 
 
 HEARTBEAT_ARTIFACT_FILENAME = "heartbeat-rituals.json"
+
+
+@lru_cache(maxsize=None)
+def _get_oz_dependency():
+    from ape import project
+
+    return project.dependencies[OZ_DEPENDENCY_NAME][OZ_DEPENDENCY_VERSION]
+
+
+def __getattr__(name: str):
+    # OZ_DEPENDENCY is resolved on first use since it requires loading project dependencies
+    if name == "OZ_DEPENDENCY":
+        return _get_oz_dependency()
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
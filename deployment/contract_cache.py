@@ -0,0 +1,74 @@
+import hashlib
+import os
+from functools import lru_cache
+from pathlib import Path
+from typing import TYPE_CHECKING, Optional
+
+from deployment.constants import DEPLOYMENT_DIR
+
+if TYPE_CHECKING:
+    from ethpm_types import ContractType
+
+PROJECT_DIR = DEPLOYMENT_DIR.parent
+CONTRACT_CACHE_DIR = PROJECT_DIR / ".build" / "contract_types"
+
+# Changes to any of these files invalidate the cache: sources and compiler/dependency settings
+CACHE_KEY_CONFIG_FILES = ("ape-config.yaml",)
+CACHE_KEY_SOURCES_GLOB = "contracts/**/*.sol"
+CACHE_KEY_DEPENDENCY_SOURCES_GLOB = "**/*.sol"
+
+
+def _dependencies_dir() -> Path:
+    """Where ape installs dependency sources, resolved the same way as ape's data folder."""
+    data_folder = Path(os.environ.get("APE_DATA_FOLDER", Path.home() / ".ape"))
+    return data_folder / "packages" / "projects"
+
+
+@lru_cache(maxsize=None)
+def _cache_key() -> str:
+    """Hash of the contract sources, the dependency sources and the compiler configuration."""
+    digest = hashlib.sha256()
+    filepaths = [PROJECT_DIR / filename for filename in CACHE_KEY_CONFIG_FILES]
+    filepaths.extend(sorted(PROJECT_DIR.glob(CACHE_KEY_SOURCES_GLOB)))
+    for filepath in filepaths:
+        if not filepath.exists():
+            continue
+        digest.update(str(filepath.relative_to(PROJECT_DIR)).encode())
+        digest.update(filepath.read_bytes())
+
+    # dependency sources only change when reinstalled, so their metadata is enough;
+    # packages of other projects can only cause extra cache misses
+    dependencies_dir = _dependencies_dir()
+    for filepath in sorted(dependencies_dir.glob(CACHE_KEY_DEPENDENCY_SOURCES_GLOB)):
+        stat = filepath.stat()
+        digest.update(str(filepath.relative_to(dependencies_dir)).encode())
+        digest.update(f"{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+def _cache_filepath(contract_name: str) -> Path:
+    return CONTRACT_CACHE_DIR / _cache_key() / f"{contract_name}.json"
+
+
+def load_cached_contract_type(contract_name: str) -> Optional["ContractType"]:
+    """Returns the cached contract type, if sources and compiler settings didn't change."""
+    filepath = _cache_filepath(contract_name)
+    if not filepath.exists():
+        return None
+
+    from ethpm_types import ContractType
+
+    try:
+        return ContractType.model_validate_json(filepath.read_text())
+    except ValueError:
+        # corrupt or outdated entry; it will be overwritten
+        return None
+
+
+def cache_contract_type(contract_name: str, contract_type: "ContractType") -> None:
+    """Persists the contract type so subsequent runs don't need to load the project."""
+    filepath = _cache_filepath(contract_name)
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    temp_filepath = filepath.with_suffix(".tmp")
+    temp_filepath.write_text(contract_type.model_dump_json(by_alias=True))
+    temp_filepath.replace(filepath)
@@ -0,0 +1,38 @@
+from typing import TYPE_CHECKING, Iterable, Iterator
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+    from ape.types import ContractLog
+
+# blocks per eth_getLogs request, within the range limits of public RPC providers
+DEFAULT_BLOCK_WINDOW = 2000
+
+
+def get_logs(
+    contract: "ContractInstance",
+    event_names: Iterable[str],
+    from_block: int,
+    to_block: int,
+    block_window: int = DEFAULT_BLOCK_WINDOW,
+) -> Iterator["ContractLog"]:
+    """
+    Yields the given events of the contract in the block range, in order. All events of a
+    window of blocks are fetched with a single eth_getLogs and decoded locally.
+    """
+    from ape import networks
+    from eth_utils import keccak
+
+    provider = networks.provider
+    event_abis = [getattr(contract, name).abi for name in event_names]
+    topics = [keccak(text=abi.selector) for abi in event_abis]
+    for start_block in range(from_block, to_block + 1, block_window):
+        stop_block = min(start_block + block_window - 1, to_block)
+        raw_logs = provider.web3.eth.get_logs(
+            {
+                "address": contract.address,
+                "fromBlock": start_block,
+                "toBlock": stop_block,
+                "topics": [topics],
+            }
+        )
+        yield from provider.network.ecosystem.decode_logs(raw_logs, *event_abis)
@@ -0,0 +1,121 @@
+import statistics
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+GWEI = 10**9
+
+DEFAULT_BLOCK_COUNT = 20
+DEFAULT_REWARD_PERCENTILE = 50
+# headroom for the base fee growing by 12.5% in each of the next blocks
+DEFAULT_BASE_FEE_MULTIPLIER = 2
+
+# nodes only accept replacements that raise both fees by at least 10%
+REPLACEMENT_FEE_BUMP = 1.125
+
+# (block_count, newest_block, reward_percentiles) -> eth_feeHistory result
+FeeHistory = Callable[[int, str, List[float]], Dict]
+
+
+class Fees(NamedTuple):
+    """EIP-1559 fees, in wei."""
+
+    max_fee: int
+    max_priority_fee: int
+
+    def as_kwargs(self) -> Dict[str, int]:
+        return self._asdict()
+
+
+def fee_caps_from_config(
+    fee_caps_config: Dict[str, Any], ecosystem: str, network: str
+) -> Optional[Fees]:
+    """
+    Returns the fee caps of the network from a `fee_caps` config section,
+    e.g. {"polygon": {"amoy": {"max_fee": "500 gwei", "max_priority_fee": "100 gwei"}}}.
+    """
+    from ape import convert
+
+    network_caps = (fee_caps_config.get(ecosystem) or {}).get(network)
+    if not network_caps:
+        return None
+    return Fees(
+        max_fee=convert(network_caps["max_fee"], int),
+        max_priority_fee=convert(network_caps["max_priority_fee"], int),
+    )
+
+
+class FeeCapExceeded(Exception):
+    """Raised when a replacement would need fees above the configured caps."""
+
+
+class FeeStrategy:
+    """
+    Suggests EIP-1559 fees from the percentiles of the priority fees paid in recent blocks
+    (eth_feeHistory), within per-network caps, and computes fees to speed up stuck
+    transactions by replacement.
+    """
+
+    def __init__(
+        self,
+        fee_history: FeeHistory,
+        caps: Optional[Fees] = None,
+        block_count: int = DEFAULT_BLOCK_COUNT,
+        reward_percentile: float = DEFAULT_REWARD_PERCENTILE,
+        base_fee_multiplier: float = DEFAULT_BASE_FEE_MULTIPLIER,
+    ):
+        self.fee_history = fee_history
+        self.caps = caps
+        self.block_count = block_count
+        self.reward_percentile = reward_percentile
+        self.base_fee_multiplier = base_fee_multiplier
+
+    @classmethod
+    def from_provider(cls, **kwargs) -> "FeeStrategy":
+        """
+        Returns a strategy for the connected network, capped as per the `fee_caps` section
+        of ape-config.yaml unless `caps` are given.
+        """
+        from ape import config, networks
+
+        network = networks.provider.network
+        caps = kwargs.pop("caps", None)
+        if caps is None:
+            fee_caps_config = config.get_config("fee_caps").model_dump(by_alias=True)
+            caps = fee_caps_from_config(fee_caps_config, network.ecosystem.name, network.name)
+        return cls(fee_history=networks.provider.web3.eth.fee_history, caps=caps, **kwargs)
+
+    def _cap(self, fees: Fees) -> Fees:
+        if self.caps is None:
+            return fees
+        max_fee = min(fees.max_fee, self.caps.max_fee)
+        max_priority_fee = min(fees.max_priority_fee, self.caps.max_priority_fee, max_fee)
+        return Fees(max_fee=max_fee, max_priority_fee=max_priority_fee)
+
+    def suggest_fees(self) -> Fees:
+        history = self.fee_history(self.block_count, "latest", [self.reward_percentile])
+        # the last base fee is the one of the next block
+        next_base_fee = int(history["baseFeePerGas"][-1])
+        rewards = [int(reward[0]) for reward in history.get("reward") or [] if reward]
+        # empty blocks report a reward of zero
+        rewards = [reward for reward in rewards if reward > 0] or [0]
+        max_priority_fee = int(statistics.median(rewards))
+        max_fee = int(next_base_fee * self.base_fee_multiplier) + max_priority_fee
+        return self._cap(Fees(max_fee=max_fee, max_priority_fee=max_priority_fee))
+
+    def replacement_fees(self, fees: Fees) -> Fees:
+        """Fees for a replacement of a stuck transaction that was sent with `fees`."""
+        bumped = Fees(
+            max_fee=int(fees.max_fee * REPLACEMENT_FEE_BUMP) + 1,
+            max_priority_fee=int(fees.max_priority_fee * REPLACEMENT_FEE_BUMP) + 1,
+        )
+        suggested = self.suggest_fees()
+        replacement = self._cap(
+            Fees(
+                max_fee=max(bumped.max_fee, suggested.max_fee),
+                max_priority_fee=max(bumped.max_priority_fee, suggested.max_priority_fee),
+            )
+        )
+        if replacement.max_fee < bumped.max_fee or (
+            replacement.max_priority_fee < bumped.max_priority_fee
+        ):
+            raise FeeCapExceeded(f"Replacing a transaction sent with {fees} exceeds {self.caps}")
+        return replacement
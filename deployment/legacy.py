@@ -1,70 +1,205 @@
+import json
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from urllib.parse import urlencode
+from typing import TYPE_CHECKING, Dict, Iterable, List, NamedTuple, Optional
 
-import requests
 from eth_typing import ChecksumAddress
 from eth_utils import to_checksum_address
 
+from deployment.constants import DEPLOYMENT_DIR
 from deployment.registry import ChainId, RegistryEntry, write_registry
-from deployment.utils import _load_json
+from deployment.utils import (
+    DEFAULT_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUS_CODES,
+    RetryableError,
+    TokenBucket,
+    _get_explorer_rate_limit,
+    _load_json,
+    call_with_retries,
+)
 
+if TYPE_CHECKING:
+    import requests
 
-def get_creation_info(api_key: str, chain_id: int, contract_address: ChecksumAddress) -> tuple:
-    networks = {
-        1: ("", "etherscan.io"),
-        5: ("-goerli", "etherscan.io"),
-        80002: ("-testnet", "polygonscan.com"),
-    }
-
-    params = {
-        "module": "account",
-        "action": "txlist",
-        "address": contract_address,
-        "page": 1,
-        "sort": "asc",
-        "apikey": api_key,
-    }
-
-    network, explorer = networks[chain_id]
-    base_url = f"https://api{network}.{explorer}/api"
-    url = f"{base_url}?{urlencode(params)}"
-    response = requests.get(url)
-    data = response.json()
-
-    if data["status"] == "1" and data["result"]:
-        # If there are transactions, the first one will be the contract creation transaction
-        tx = data["result"][0]
-        tx_hash = tx["hash"]
-        block_number = tx["blockNumber"]
-        deployer = tx["from"]
-    else:
-        raise ValueError(f"Could not find contract creation transaction for {contract_address}")
-
-    return tx_hash, block_number, to_checksum_address(deployer)
+PROJECT_DIR = DEPLOYMENT_DIR.parent
+CREATION_INFO_CACHE_DIR = PROJECT_DIR / ".build" / "creation_info"
 
+# chain ID -> (explorer API URL, ecosystem of the explorer's config in ape-config.yaml)
+EXPLORER_APIS = {
+    1: ("https://api.etherscan.io/api", "ethereum"),
+    5: ("https://api-goerli.etherscan.io/api", "ethereum"),
+    80002: ("https://api-testnet.polygonscan.com/api", "polygon"),
+}
 
-def convert_legacy_registry(
-    legacy_filepath: Path,
-    output_filepath: Path,
-    chain_id: ChainId,
-) -> None:
-    """Converts a legacy nucypher-style contract registry to a new-style registry."""
+# explorers may report rate limiting in the result of a successful response
+RATE_LIMIT_MESSAGE = "rate limit"
 
-    if not legacy_filepath.exists():
-        raise FileNotFoundError(f"Legacy registry not found at {legacy_filepath}")
+
+class CreationInfo(NamedTuple):
+    tx_hash: str
+    block_number: int
+    deployer: ChecksumAddress
+
+
+class CreationInfoNotFound(ValueError):
+    """Raised when the explorer has no creation transaction for a contract."""
+
+
+class CreationInfoFetcher:
+    """
+    Fetches contract creation info from a block explorer, concurrently and within the
+    explorer's rate limit. Results are cached on disk by (chain_id, address).
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        chain_id: int,
+        api_url: Optional[str] = None,
+        rate_limit: Optional[float] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        timeout: float = DEFAULT_TIMEOUT,
+        cache_dir: Optional[Path] = CREATION_INFO_CACHE_DIR,
+        session: Optional["requests.Session"] = None,
+    ):
+        if api_url is None or rate_limit is None:
+            default_api_url, ecosystem = EXPLORER_APIS[chain_id]
+            api_url = api_url or default_api_url
+            rate_limit = rate_limit or _get_explorer_rate_limit(ecosystem)
+        if session is None:
+            import requests
+
+            session = requests.Session()
+
+        self.api_key = api_key
+        self.chain_id = chain_id
+        self.api_url = api_url
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+        self.session = session
+        self._bucket = TokenBucket(rate=rate_limit)
+
+    def _cache_filepath(self, address: ChecksumAddress) -> Optional[Path]:
+        if self.cache_dir is None:
+            return None
+        return self.cache_dir / str(self.chain_id) / f"{address.lower()}.json"
+
+    def _read_cache(self, address: ChecksumAddress) -> Optional[CreationInfo]:
+        filepath = self._cache_filepath(address)
+        if filepath is None or not filepath.exists():
+            return None
+        try:
+            return CreationInfo(**_load_json(filepath))
+        except (ValueError, TypeError):
+            # corrupt entry; it will be overwritten
+            return None
+
+    def _write_cache(self, address: ChecksumAddress, info: CreationInfo) -> None:
+        filepath = self._cache_filepath(address)
+        if filepath is None:
+            return
+        filepath.parent.mkdir(parents=True, exist_ok=True)
+        temp_filepath = filepath.with_suffix(f".{threading.get_ident()}.tmp")
+        temp_filepath.write_text(json.dumps(info._asdict()))
+        temp_filepath.replace(filepath)
+
+    def _request(self, address: ChecksumAddress) -> dict:
+        import requests
+
+        params = {
+            "module": "account",
+            "action": "txlist",
+            "address": address,
+            "page": 1,
+            "sort": "asc",
+            "apikey": self.api_key,
+        }
+
+        def get() -> dict:
+            self._bucket.acquire()
+            try:
+                response = self.session.get(self.api_url, params=params, timeout=self.timeout)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                raise RetryableError(str(e)) from e
+            if response.status_code in RETRY_STATUS_CODES:
+                raise RetryableError(f"{response.status_code} {response.text[:100]}")
+            response.raise_for_status()
+            data = response.json()
+            if RATE_LIMIT_MESSAGE in str(data.get("result", "")).lower():
+                raise RetryableError(f"{response.status_code} {response.text[:100]}")
+            return data
+
+        try:
+            return call_with_retries(get, max_retries=self.max_retries, backoff=self.backoff)
+        except RetryableError as e:
+            raise ConnectionError(
+                f"Could not fetch creation info for {address} after "
+                f"{self.max_retries + 1} attempts: {e}"
+            ) from e
+
+    def fetch(self, address: ChecksumAddress) -> CreationInfo:
+        """Returns the creation info of a contract, from the cache if available."""
+        info = self._read_cache(address)
+        if info is not None:
+            return info
+
+        data = self._request(address)
+        if data["status"] == "1" and data["result"]:
+            # If there are transactions, the first one will be the contract creation transaction
+            tx = data["result"][0]
+        else:
+            raise CreationInfoNotFound(
+                f"Could not find contract creation transaction for {address}"
+            )
+        info = CreationInfo(
+            tx_hash=tx["hash"],
+            block_number=int(tx["blockNumber"]),
+            deployer=to_checksum_address(tx["from"]),
+        )
+        self._write_cache(address, info)
+        return info
+
+    def fetch_many(
+        self, addresses: Iterable[ChecksumAddress], max_workers: Optional[int] = None
+    ) -> Dict[ChecksumAddress, CreationInfo]:
+        """Fetches the creation info of several contracts concurrently."""
+        addresses = list(dict.fromkeys(addresses))
+        if not addresses:
+            return dict()
+        # enough workers to saturate the rate limit while waiting on responses
+        max_workers = max_workers or max(1, int(self._bucket.capacity) * 2)
+        with ThreadPoolExecutor(max_workers=min(max_workers, len(addresses))) as executor:
+            return dict(zip(addresses, executor.map(self.fetch, addresses)))
+
+
+def get_creation_info(api_key: str, chain_id: int, contract_address: ChecksumAddress) -> tuple:
+    fetcher = CreationInfoFetcher(api_key=api_key, chain_id=chain_id)
+    return tuple(fetcher.fetch(contract_address))
+
+
+def _get_api_key() -> str:
     api_key = os.environ.get("ETHERSCAN_API_KEY")
     if not api_key:
         raise ValueError("Please set the ETHERSCAN_API_KEY environment variable.")
+    return api_key
 
-    legacy_registry_entries = _load_json(filepath=legacy_filepath)
-    new_registry_entries = list()
-    for entry in legacy_registry_entries:
-        name, address, abi = entry[0], entry[2], entry[3]
-        tx_hash, block_number, deployer = get_creation_info(
-            api_key=api_key, chain_id=chain_id, contract_address=address
-        )
-        new_registry_entry = RegistryEntry(
+
+def _build_registry_entries(
+    contracts: List[tuple], chain_id: ChainId, fetcher: CreationInfoFetcher
+) -> List[RegistryEntry]:
+    """Creates registry entries from (name, address, abi) tuples."""
+    creation_info = fetcher.fetch_many(address for _, address, _ in contracts)
+    entries = list()
+    for name, address, abi in contracts:
+        tx_hash, block_number, deployer = creation_info[address]
+        entry = RegistryEntry(
             chain_id=chain_id,
             name=name,
             address=address,
@@ -73,45 +208,51 @@ def convert_legacy_registry(
             block_number=block_number,
             deployer=deployer,
         )
-        new_registry_entries.append(new_registry_entry)
+        entries.append(entry)
+    return entries
+
+
+def convert_legacy_registry(
+    legacy_filepath: Path,
+    output_filepath: Path,
+    chain_id: ChainId,
+    fetcher: Optional[CreationInfoFetcher] = None,
+) -> None:
+    """Converts a legacy nucypher-style contract registry to a new-style registry."""
+
+    if not legacy_filepath.exists():
+        raise FileNotFoundError(f"Legacy registry not found at {legacy_filepath}")
+    fetcher = fetcher or CreationInfoFetcher(api_key=_get_api_key(), chain_id=chain_id)
+
+    legacy_registry_entries = _load_json(filepath=legacy_filepath)
+    contracts = [(entry[0], entry[2], entry[3]) for entry in legacy_registry_entries]
+    new_registry_entries = _build_registry_entries(
+        contracts=contracts, chain_id=chain_id, fetcher=fetcher
+    )
     write_registry(entries=new_registry_entries, filepath=output_filepath)
     print(f"Converted legacy registry to {output_filepath}")
 
 
-def convert_legacy_npm_artifacts(directory: Path, chain_id: ChainId, output_filepath: Path) -> None:
+def convert_legacy_npm_artifacts(
+    directory: Path,
+    chain_id: ChainId,
+    output_filepath: Path,
+    fetcher: Optional[CreationInfoFetcher] = None,
+) -> None:
     if output_filepath.exists():
         raise FileExistsError(f"Registry already exists at {output_filepath}")
 
     if not directory.exists():
         raise FileNotFoundError(f"Directory not found at {directory}")
 
-    api_key = os.environ.get("ETHERSCAN_API_KEY")
-    if not api_key:
-        raise ValueError("Please set the ETHERSCAN_API_KEY environment variable.")
+    fetcher = fetcher or CreationInfoFetcher(api_key=_get_api_key(), chain_id=chain_id)
 
-    entries = list()
+    contracts = list()
     for filepath in directory.glob("*.json"):
         data = _load_json(filepath=filepath)
-
         name = filepath.name.replace(".json", "")
-        abi = data["abi"]
-        address = data["address"]
-
-        tx_hash, block_number, deployer = get_creation_info(
-            api_key=api_key, chain_id=chain_id, contract_address=address
-        )
-
-        entry = RegistryEntry(
-            chain_id=chain_id,
-            name=name,
-            address=address,
-            abi=abi,
-            tx_hash=tx_hash,
-            block_number=block_number,
-            deployer=deployer,
-        )
-
-        entries.append(entry)
+        contracts.append((name, data["address"], data["abi"]))
 
+    entries = _build_registry_entries(contracts=contracts, chain_id=chain_id, fetcher=fetcher)
     write_registry(entries=entries, filepath=output_filepath)
     print(f"Converted legacy registry to {output_filepath}")
@@ -0,0 +1,253 @@
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+from deployment.constants import RitualState
+from deployment.multicall import Call, Multicall
+from deployment.ritual_monitor import RitualMonitor
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+
+DEFAULT_PORT = 9102
+DEFAULT_SCRAPE_INTERVAL = 60  # seconds
+
+# states that can't change anymore; rituals in these states are not queried again
+FINAL_RITUAL_STATES = (RitualState.DKG_TIMEOUT, RitualState.DKG_INVALID, RitualState.EXPIRED)
+
+# as defined in the SigningCoordinator contract
+SIGNING_COHORT_STATES = ("NON_INITIATED", "AWAITING_SIGNATURES", "TIMEOUT", "ACTIVE", "EXPIRED")
+FINAL_SIGNING_COHORT_STATES = ("TIMEOUT", "EXPIRED")
+
+# number of the most recent rituals to report per-node transcript latency for
+LATENCY_RITUALS = 10
+
+
+class Gauge:
+    """A gauge in the Prometheus text exposition format."""
+
+    def __init__(self, name: str, documentation: str):
+        self.name = name
+        self.documentation = documentation
+        self._samples: Dict[Tuple[Tuple[str, str], ...], float] = dict()
+
+    def set(self, value: float, **labels) -> None:
+        self._samples[tuple(sorted((k, str(v)) for k, v in labels.items()))] = value
+
+    def clear(self) -> None:
+        self._samples.clear()
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} gauge"]
+        for labels, value in sorted(self._samples.items()):
+            if labels:
+                label_values = ",".join(f'{k}="{v}"' for k, v in labels)
+                lines.append(f"{self.name}{{{label_values}}} {value}")
+            else:
+                lines.append(f"{self.name} {value}")
+        return "\n".join(lines)
+
+
+class MetricsCollector:
+    """
+    Collects coordination metrics for the contracts of a registry. All contract reads of a
+    scrape are batched through Multicall: one round for counters and balances, one round for
+    the states of rituals and cohorts that can still change. Transcript latencies come from
+    a RitualMonitor, which only fetches new logs.
+    """
+
+    def __init__(
+        self,
+        contracts: Dict[str, "ContractInstance"],
+        multicall: Multicall,
+        ritual_monitor: Optional[RitualMonitor] = None,
+    ):
+        self.contracts = contracts
+        self.multicall = multicall
+        self.ritual_monitor = ritual_monitor
+        self.coordinator = contracts.get("Coordinator")
+        self.signing_coordinator = contracts.get("SigningCoordinator")
+        self.reimbursement_pool = contracts.get("ReimbursementPool")
+        self.subscriptions = {
+            name: contract
+            for name, contract in contracts.items()
+            if any(method.name == "paidFees" for method in contract.contract_type.view_methods)
+        }
+
+        self.rituals = Gauge("taco_rituals", "Number of rituals by state")
+        self.signing_cohorts = Gauge("taco_signing_cohorts", "Number of signing cohorts by state")
+        self.active_signing_cohorts = Gauge(
+            "taco_signing_cohorts_active", "Number of active signing cohorts"
+        )
+        self.pool_balance = Gauge(
+            "taco_reimbursement_pool_balance_wei", "ReimbursementPool balance"
+        )
+        self.pool_accrued = Gauge(
+            "taco_reimbursement_pool_accrued_wei", "Refunds accrued in the pool and not claimed yet"
+        )
+        self.pool_refunds = Gauge(
+            "taco_reimbursement_pool_refunds_wei_per_block",
+            "Decrease of the unreserved ReimbursementPool balance per block since the previous "
+            "scrape",
+        )
+        self.paid_fees = Gauge("taco_subscription_paid_fees", "Fees paid to a subscription")
+        self.transcript_latency = Gauge(
+            "taco_ritual_transcript_latency_seconds",
+            "Time from StartRitual to TranscriptPosted per node, for recent rituals",
+        )
+        self.block_number = Gauge("taco_metrics_block_number", "Block of the last scrape")
+        self.gauges = [
+            self.rituals,
+            self.signing_cohorts,
+            self.active_signing_cohorts,
+            self.pool_balance,
+            self.pool_accrued,
+            self.pool_refunds,
+            self.paid_fees,
+            self.transcript_latency,
+            self.block_number,
+        ]
+
+        self._ritual_states: Dict[int, RitualState] = dict()
+        self._cohort_states: Dict[int, str] = dict()
+        self._previous_pool_balance: Optional[Tuple[int, int]] = None
+
+    def _collect_counters(self) -> Dict[str, int]:
+        calls = {"block_number": self.multicall.block_number()}
+        if self.coordinator:
+            calls["rituals"] = Call(self.coordinator, "numberOfRituals")
+        if self.signing_coordinator:
+            calls["cohorts"] = Call(self.signing_coordinator, "numberOfSigningCohorts")
+        if self.reimbursement_pool:
+            calls["pool_balance"] = self.multicall.eth_balance(self.reimbursement_pool.address)
+            # pools deployed before refunds could be accrued only push refunds
+            if hasattr(self.reimbursement_pool, "totalAccrued"):
+                calls["pool_accrued"] = Call(self.reimbursement_pool, "totalAccrued")
+        for name, subscription in self.subscriptions.items():
+            calls[f"paid_fees:{name}"] = Call(subscription, "paidFees")
+        return dict(zip(calls, self.multicall.call(list(calls.values()))))
+
+    def _collect_states(self, number_of_rituals: int, number_of_cohorts: int) -> None:
+        ritual_ids = [
+            i
+            for i in range(number_of_rituals)
+            if self._ritual_states.get(i) not in FINAL_RITUAL_STATES
+        ]
+        cohort_ids = [
+            i
+            for i in range(number_of_cohorts)
+            if self._cohort_states.get(i) not in FINAL_SIGNING_COHORT_STATES
+        ]
+        calls: List[Call] = [Call(self.coordinator, "getRitualState", (i,)) for i in ritual_ids]
+        calls.extend(
+            Call(self.signing_coordinator, "getSigningCohortState", (i,)) for i in cohort_ids
+        )
+        if not calls:
+            return
+        results = self.multicall.call(calls)
+        for ritual_id, state in zip(ritual_ids, results[: len(ritual_ids)]):
+            if state is not None:
+                self._ritual_states[ritual_id] = RitualState(state)
+        for cohort_id, state in zip(cohort_ids, results[len(ritual_ids) :]):
+            if state is not None:
+                self._cohort_states[cohort_id] = SIGNING_COHORT_STATES[state]
+
+    def _update_transcript_latency(self) -> None:
+        self.transcript_latency.clear()
+        if not self.ritual_monitor:
+            return
+        self.ritual_monitor.poll()
+        for ritual_id in sorted(self.ritual_monitor.rituals)[-LATENCY_RITUALS:]:
+            ritual = self.ritual_monitor.rituals[ritual_id]
+            for node, lag in ritual.transcript_lags.items():
+                self.transcript_latency.set(lag, ritual_id=ritual_id, node=node)
+
+    def collect(self) -> None:
+        counters = self._collect_counters()
+        block_number = counters["block_number"]
+        self.block_number.set(block_number)
+
+        self._collect_states(
+            number_of_rituals=counters.get("rituals") or 0,
+            number_of_cohorts=counters.get("cohorts") or 0,
+        )
+        if self.coordinator:
+            self.rituals.clear()
+            for state in RitualState:
+                count = sum(1 for s in self._ritual_states.values() if s == state)
+                self.rituals.set(count, state=state.name)
+        if self.signing_coordinator:
+            self.signing_cohorts.clear()
+            for state in SIGNING_COHORT_STATES:
+                count = sum(1 for s in self._cohort_states.values() if s == state)
+                self.signing_cohorts.set(count, state=state)
+            self.active_signing_cohorts.set(
+                sum(1 for s in self._cohort_states.values() if s == "ACTIVE")
+            )
+
+        if self.reimbursement_pool:
+            self.pool_balance.set(counters["pool_balance"])
+            accrued = counters.get("pool_accrued") or 0
+            self.pool_accrued.set(accrued)
+            # accrued refunds are already spent, whether claimed or not
+            balance = counters["pool_balance"] - accrued
+            if self._previous_pool_balance is not None:
+                previous_block, previous_balance = self._previous_pool_balance
+                blocks = block_number - previous_block
+                if blocks > 0:
+                    # deposits make the balance grow; refunds are only estimated otherwise
+                    spent = max(previous_balance - balance, 0)
+                    self.pool_refunds.set(spent / blocks)
+            self._previous_pool_balance = (block_number, balance)
+
+        for name in self.subscriptions:
+            paid_fees = counters[f"paid_fees:{name}"]
+            if paid_fees is not None:
+                self.paid_fees.set(paid_fees, contract=name)
+
+        self._update_transcript_latency()
+
+    def render(self) -> str:
+        return "\n".join(gauge.render() for gauge in self.gauges) + "\n"
+
+
+def serve_metrics(
+    collector: MetricsCollector,
+    port: int = DEFAULT_PORT,
+    interval: float = DEFAULT_SCRAPE_INTERVAL,
+) -> None:
+    """
+    Serves the metrics at /metrics. Metrics are collected every `interval` seconds in the
+    calling thread, so scrapes never trigger RPC calls themselves.
+    """
+    exposition = {"text": ""}
+
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path != "/metrics":
+                self.send_error(404)
+                return
+            body = exposition["text"].encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(("", port), MetricsHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    print(f"Serving metrics on port {port}")
+    try:
+        while True:
+            try:
+                collector.collect()
+                exposition["text"] = collector.render()
+            except Exception as e:
+                print(f"(!) Failed to collect metrics: {e}")
+            time.sleep(interval)
+    finally:
+        server.shutdown()
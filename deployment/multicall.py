@@ -0,0 +1,130 @@
+from typing import TYPE_CHECKING, Any, List, NamedTuple, Optional
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+    from ethpm_types import MethodABI
+
+# Multicall3 is deployed at the same address on all supported chains
+MULTICALL3_ADDRESS = "0xcA11bde05977b3631167028862bE2a173976CA11"
+
+DEFAULT_BATCH_SIZE = 500
+
+# The subset of the Multicall3 ABI used by the deployment tooling
+MULTICALL3_ABI = [
+    {
+        "type": "function",
+        "name": "aggregate3",
+        "stateMutability": "payable",
+        "inputs": [
+            {
+                "name": "calls",
+                "type": "tuple[]",
+                "internalType": "struct Multicall3.Call3[]",
+                "components": [
+                    {"name": "target", "type": "address", "internalType": "address"},
+                    {"name": "allowFailure", "type": "bool", "internalType": "bool"},
+                    {"name": "callData", "type": "bytes", "internalType": "bytes"},
+                ],
+            }
+        ],
+        "outputs": [
+            {
+                "name": "returnData",
+                "type": "tuple[]",
+                "internalType": "struct Multicall3.Result[]",
+                "components": [
+                    {"name": "success", "type": "bool", "internalType": "bool"},
+                    {"name": "returnData", "type": "bytes", "internalType": "bytes"},
+                ],
+            }
+        ],
+    },
+    {
+        "type": "function",
+        "name": "getBlockNumber",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "blockNumber", "type": "uint256", "internalType": "uint256"}],
+    },
+    {
+        "type": "function",
+        "name": "getCurrentBlockTimestamp",
+        "stateMutability": "view",
+        "inputs": [],
+        "outputs": [{"name": "timestamp", "type": "uint256", "internalType": "uint256"}],
+    },
+    {
+        "type": "function",
+        "name": "getEthBalance",
+        "stateMutability": "view",
+        "inputs": [{"name": "addr", "type": "address", "internalType": "address"}],
+        "outputs": [{"name": "balance", "type": "uint256", "internalType": "uint256"}],
+    },
+]
+
+
+class Call(NamedTuple):
+    """A view call to batch; failed calls return None."""
+
+    contract: "ContractInstance"
+    method: str
+    args: tuple = ()
+
+
+def _method_abi(call: Call) -> "MethodABI":
+    abis = getattr(call.contract, call.method).abis
+    for abi in abis:
+        if len(abi.inputs) == len(call.args):
+            return abi
+    raise ValueError(f"No overload of {call.method} takes {len(call.args)} argument(s)")
+
+
+class Multicall:
+    """Batches view calls through a Multicall3 contract: one eth_call per batch."""
+
+    def __init__(self, multicall: "ContractInstance", batch_size: int = DEFAULT_BATCH_SIZE):
+        self.multicall = multicall
+        self.batch_size = batch_size
+
+    @classmethod
+    def from_provider(cls, address: Optional[str] = None, **kwargs) -> "Multicall":
+        from ape.contracts import ContractContainer
+        from ethpm_types import ContractType
+
+        contract_type = ContractType(contractName="Multicall3", abi=MULTICALL3_ABI)
+        multicall = ContractContainer(contract_type).at(address or MULTICALL3_ADDRESS)
+        return cls(multicall=multicall, **kwargs)
+
+    def call(self, calls: List[Call]) -> List[Any]:
+        """Returns the decoded result of each call, in order."""
+        from ape import networks
+
+        ecosystem = networks.provider.network.ecosystem
+        abis = [_method_abi(call) for call in calls]
+        results = list()
+        for start in range(0, len(calls), self.batch_size):
+            batch = list(zip(calls[start : start + self.batch_size], abis[start:]))
+            encoded_calls = [
+                (
+                    call.contract.address,
+                    True,  # allow failure
+                    ecosystem.get_method_selector(abi) + ecosystem.encode_calldata(abi, *call.args),
+                )
+                for call, abi in batch
+            ]
+            for (call, abi), result in zip(batch, self.multicall.aggregate3.call(encoded_calls)):
+                if not result.success:
+                    results.append(None)
+                    continue
+                decoded = ecosystem.decode_returndata(abi, result.returnData)
+                results.append(decoded[0] if len(decoded) == 1 else decoded)
+        return results
+
+    def eth_balance(self, address: str) -> Call:
+        return Call(self.multicall, "getEthBalance", (address,))
+
+    def block_number(self) -> Call:
+        return Call(self.multicall, "getBlockNumber")
+
+    def block_timestamp(self) -> Call:
+        return Call(self.multicall, "getCurrentBlockTimestamp")
@@ -1,5 +1,4 @@
-from ape import networks
-
-
 def is_local_network():
+    from ape import networks
+
     return networks.network.name in ["local"]
@@ -47,3 +47,9 @@ encryptors_option = click.option(
     required=True,
     type=ChecksumAddress,
 )
+
+fee_strategy_option = click.option(
+    "--fee-strategy",
+    help="Suggest fees from recent blocks and replace transactions that get stuck.",
+    is_flag=True,
+)
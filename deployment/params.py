@@ -1,11 +1,14 @@
 import typing
 from abc import ABC, abstractmethod
 from collections import OrderedDict, namedtuple
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import suppress
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, List
 
 from ape import chain, networks, project
-from ape.api import AccountAPI, ImpersonatedAccount, ReceiptAPI
+from ape.api import AccountAPI, ImpersonatedAccount, ReceiptAPI, TransactionAPI
 from ape.cli.choices import select_account
 from ape.contracts.base import ContractContainer, ContractInstance, ContractTransactionHandler
 from ape.utils import EMPTY_BYTES32, ZERO_ADDRESS
@@ -13,11 +16,21 @@ from ape_test import TestAccount
 from eth_typing import ChecksumAddress
 from eth_utils import to_checksum_address
 from ethpm_types import MethodABI
-from web3.auto import w3
+from web3.exceptions import TimeExhausted, TransactionNotFound
 
+from deployment import constants as deployment_constants
 from deployment.confirm import _confirm_resolution, _continue
-from deployment.constants import EIP1967_ADMIN_SLOT, OZ_DEPENDENCY
+from deployment.constants import EIP1967_ADMIN_SLOT
+from deployment.fees import Fees, FeeStrategy
+from deployment.networks import is_local_network
 from deployment.registry import registry_from_ape_deployments
+from deployment.storage_layout import (
+    get_storage_layout,
+    get_storage_layout_baseline,
+    storage_layout_filepath,
+    validate_storage_compatibility,
+    write_storage_layout,
+)
 from deployment.utils import (
     _load_yaml,
     check_plugins,
@@ -30,6 +43,18 @@ CONTRACT_CONSTRUCTOR_PARAMETER_KEY = "constructor"
 CONTRACT_PROXY_PARAMETER_KEY = "proxy"
 
 
+@lru_cache(maxsize=None)
+def _get_web3():
+    # A provider-less instance is enough for ABI checks; web3.auto would build a default provider
+    from web3 import Web3
+
+    return Web3()
+
+
+def _is_encodable(abi_type: str, value: Any) -> bool:
+    return _get_web3().is_encodable(abi_type, value)
+
+
 class VariableContext:
     def __init__(
         self,
@@ -251,7 +276,7 @@ def _validate_method_args(
     for abi in abis_matching_args_length:
         named_args = {}
         for arg, abi_input in zip(args, abi.inputs):
-            if not w3.is_encodable(abi_input.type, arg):
+            if not _is_encodable(abi_input.type, arg):
                 break
             named_args[abi_input.name] = arg
         else:
@@ -286,7 +311,7 @@ def _validate_constructor_abi_inputs(
             )
 
         # validate value type
-        if not w3.is_encodable(abi_input.type, value):
+        if not _is_encodable(abi_input.type, value):
             raise ConstructorParameters.Invalid(
                 f"Constructor param name '{name}' at position {position} has a value '{value}' "
                 f"whose type does not match expected ABI type '{abi_input.type}'"
@@ -366,7 +391,7 @@ class ConstructorParameters:
 
 def validate_proxy_info(contracts_proxy_info) -> None:
     """Validates the proxy information for all contracts."""
-    contract_container = OZ_DEPENDENCY.TransparentUpgradeableProxy
+    contract_container = deployment_constants.OZ_DEPENDENCY.TransparentUpgradeableProxy
     for contract, proxy_info in contracts_proxy_info.items():
         resolved_parameters = _resolve_params(proxy_info.constructor_params)
         _validate_constructor_abi_inputs(
@@ -477,12 +502,40 @@ class ProxyParameters:
         return default_parameters
 
 
+class TransactionResult(typing.NamedTuple):
+    """Outcome of a single call sent by `Transactor.transact_many`."""
+
+    method: ContractTransactionHandler
+    args: tuple
+    receipt: typing.Optional[ReceiptAPI] = None
+    error: typing.Optional[Exception] = None
+
+    @property
+    def failed(self) -> bool:
+        return self.error is not None or self.receipt is None or self.receipt.failed
+
+
 class Transactor:
     """
     Represents an ape account plus validated/annotated transaction execution.
+
+    Fees are fixed when `max_fee`/`max_priority_fee` are set, and left to ape otherwise.
+    Alternatively, fees are suggested by an explicitly provided `FeeStrategy` and transactions
+    that are not mined within `STUCK_TIMEOUT` seconds are replaced with higher fees.
     """
 
-    def __init__(self, account: typing.Optional[AccountAPI] = None, autosign: bool = False):
+    MAX_RECEIPT_WORKERS = 10
+    STUCK_TIMEOUT = 120  # seconds
+    MAX_REPLACEMENTS = 3
+
+    def __init__(
+        self,
+        account: typing.Optional[AccountAPI] = None,
+        autosign: bool = False,
+        max_fee: typing.Optional[typing.Union[int, str]] = None,
+        max_priority_fee: typing.Optional[typing.Union[int, str]] = None,
+        fee_strategy: typing.Optional[FeeStrategy] = None,
+    ):
         if account is None:
             self._account = select_account()
         else:
@@ -493,16 +546,32 @@ class Transactor:
         if not isinstance(self._account, (TestAccount, ImpersonatedAccount)):
             self._account.set_autosign(autosign)
 
+        # EIP-1559 fees, e.g. "120 gwei"
+        self._fee_kwargs = dict()
+        if max_fee is not None:
+            self._fee_kwargs["max_fee"] = max_fee
+        if max_priority_fee is not None:
+            self._fee_kwargs["max_priority_fee"] = max_priority_fee
+        if self._fee_kwargs and fee_strategy is not None:
+            raise ValueError("Fixed fees and a fee strategy can't be used together")
+        self._fee_strategy = fee_strategy
+
     def get_account(self) -> AccountAPI:
         """Returns the transactor account."""
         return self._account
 
+    def _get_fee_strategy(self) -> typing.Optional[FeeStrategy]:
+        if isinstance(self._account, ImpersonatedAccount):
+            return None
+        return self._fee_strategy
+
+    @staticmethod
+    def _describe_call(method: ContractTransactionHandler) -> str:
+        return f"{method.contract.contract_type.name}[{method.contract.address[:10]}].{method}"
+
     def transact(self, method: ContractTransactionHandler, *args) -> ReceiptAPI:
         named_args = _validate_method_args(method_abis=method.abis, args=args)
-        base_message = (
-            f"\nTransacting {method.contract.contract_type.name}"
-            f"[{method.contract.address[:10]}].{method}"
-        )
+        base_message = f"\nTransacting {self._describe_call(method)}"
         if named_args:
             pretty_args = "\n\t".join(f"{k}={v}" for k, v in named_args.items())
             message = f"{base_message} with arguments:\n\t{pretty_args}"
@@ -512,14 +581,149 @@ class Transactor:
         if not self._autosign:
             _continue()
 
-        result = method(
-            *args,
-            sender=self._account,
-            # FIXME: Manual gas fees - #199
-            # max_priority_fee="3 gwei",
-            # max_fee="120 gwei"
+        fee_strategy = self._get_fee_strategy()
+        if fee_strategy is None:
+            return method(*args, sender=self._account, **self._fee_kwargs)
+
+        # sent like a batch of one so that it's sped up if it gets stuck
+        (result,) = self._send(calls=[(method, args)], fee_strategy=fee_strategy)
+        if result.error is not None:
+            raise result.error
+        result.receipt.raise_for_status()
+        return result.receipt
+
+    def transact_many(
+        self, calls: List[typing.Tuple[ContractTransactionHandler, tuple]]
+    ) -> List[TransactionResult]:
+        """
+        Sends independent transactions back-to-back after a single confirmation, assigning
+        sequential nonces locally, then waits for their receipts concurrently.
+
+        Failures are reported per call, in call order, instead of being raised: a call that
+        can't be sent (e.g. it fails gas estimation) doesn't consume a nonce, so the calls
+        after it are still sent.
+        """
+        messages = list()
+        for method, args in calls:
+            named_args = _validate_method_args(method_abis=method.abis, args=args)
+            pretty_args = ", ".join(f"{k}={v}" for k, v in named_args.items())
+            messages.append(f"{self._describe_call(method)}({pretty_args})")
+        print(f"\nTransacting {len(calls)} calls:\n\t" + "\n\t".join(messages))
+        if not self._autosign:
+            _continue()
+
+        if isinstance(self._account, ImpersonatedAccount):
+            # impersonated accounts can't sign; transactions are sent one by one
+            return [self._transact_one(method, args) for method, args in calls]
+
+        results = self._send(calls=calls, fee_strategy=self._get_fee_strategy())
+        for message, result in zip(messages, results):
+            if result.receipt is None:
+                print(f"(!) Failed to transact {message}: {result.error}")
+            elif result.failed:
+                print(f"(!) Transaction {result.receipt.txn_hash} reverted: {message}")
+        return results
+
+    def transact_all(
+        self, calls: List[typing.Tuple[ContractTransactionHandler, tuple]]
+    ) -> List[ReceiptAPI]:
+        """Like `transact_many`, but raises if any of the calls failed."""
+        results = self.transact_many(calls)
+        failed = [result for result in results if result.failed]
+        if failed:
+            raise RuntimeError(f"{len(failed)} of {len(calls)} transactions failed")
+        return [result.receipt for result in results]
+
+    def _transact_one(self, method: ContractTransactionHandler, args: tuple) -> TransactionResult:
+        try:
+            receipt = method(*args, sender=self._account, **self._fee_kwargs)
+        except Exception as e:
+            return TransactionResult(method=method, args=args, error=e)
+        return TransactionResult(method=method, args=args, receipt=receipt)
+
+    def _sign_and_send(self, txn: TransactionAPI) -> str:
+        signed_txn = self._account.sign_transaction(txn)
+        if signed_txn is None:
+            raise ValueError("Transaction was not signed")
+        txn_hash = networks.provider.web3.eth.send_raw_transaction(
+            signed_txn.serialize_transaction()
         )
-        return result
+        return txn_hash.hex()
+
+    def _send(
+        self,
+        calls: List[typing.Tuple[ContractTransactionHandler, tuple]],
+        fee_strategy: typing.Optional[FeeStrategy],
+    ) -> List[TransactionResult]:
+        web3 = networks.provider.web3
+        nonce = web3.eth.get_transaction_count(self._account.address, "pending")
+        fee_kwargs = fee_strategy.suggest_fees().as_kwargs() if fee_strategy else self._fee_kwargs
+        results, txns = list(), dict()
+        for i, (method, args) in enumerate(calls):
+            try:
+                txn = method.as_transaction(*args, sender=self._account, nonce=nonce, **fee_kwargs)
+                txn_hash = self._sign_and_send(txn)
+            except Exception as e:
+                results.append(TransactionResult(method=method, args=args, error=e))
+                continue
+            nonce += 1
+            txns[i] = (txn, txn_hash)
+            results.append(TransactionResult(method=method, args=args))
+
+        if not txns:
+            return results
+        max_workers = min(len(txns), self.MAX_RECEIPT_WORKERS)
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            futures = {
+                i: executor.submit(self._wait_for_receipt, txn, txn_hash, fee_strategy)
+                for i, (txn, txn_hash) in txns.items()
+            }
+            for i, future in futures.items():
+                try:
+                    results[i] = results[i]._replace(receipt=future.result())
+                except Exception as e:
+                    results[i] = results[i]._replace(error=e)
+        return results
+
+    def _wait_for_receipt(
+        self, txn: TransactionAPI, txn_hash: str, fee_strategy: typing.Optional[FeeStrategy]
+    ) -> ReceiptAPI:
+        """
+        Waits for the transaction to be mined. With a fee strategy, a transaction that is
+        stuck is replaced by the same transaction with higher fees, up to MAX_REPLACEMENTS
+        times; any of the sent versions may end up being mined.
+        """
+        web3 = networks.provider.web3
+        acceptance_timeout = networks.provider.network.transaction_acceptance_timeout
+        txn_hashes = [txn_hash]
+        for replacement in range(self.MAX_REPLACEMENTS + 1 if fee_strategy else 1):
+            timeout = acceptance_timeout
+            if fee_strategy and replacement < self.MAX_REPLACEMENTS:
+                timeout = self.STUCK_TIMEOUT
+            try:
+                web3.eth.wait_for_transaction_receipt(txn_hashes[-1], timeout=timeout)
+                return networks.provider.get_receipt(txn_hashes[-1])
+            except TimeExhausted:
+                pass
+            for previous_txn_hash in txn_hashes[:-1]:
+                with suppress(TransactionNotFound):
+                    web3.eth.get_transaction_receipt(previous_txn_hash)
+                    return networks.provider.get_receipt(previous_txn_hash)
+            if not fee_strategy or replacement == self.MAX_REPLACEMENTS:
+                break
+
+            fees = fee_strategy.replacement_fees(
+                Fees(max_fee=txn.max_fee, max_priority_fee=txn.max_priority_fee)
+            )
+            txn = txn.model_copy(update=fees.as_kwargs())
+            txn.signature = None
+            print(f"(i) Transaction {txn_hashes[-1]} is stuck; replacing it with {fees}")
+            try:
+                txn_hashes.append(self._sign_and_send(txn))
+            except Exception as e:
+                # e.g. "nonce too low" when the previous version has just been mined
+                print(f"(!) Replacement of {txn_hashes[-1]} was not accepted: {e}")
+        raise TimeExhausted(f"Transaction(s) {', '.join(txn_hashes)} not mined")
 
 
 class Deployer(Transactor):
@@ -537,8 +741,22 @@ class Deployer(Transactor):
         verify: bool,
         account: typing.Optional[AccountAPI] = None,
         autosign: bool = False,
+        max_fee: typing.Optional[typing.Union[int, str]] = None,
+        max_priority_fee: typing.Optional[typing.Union[int, str]] = None,
+        fee_strategy: typing.Optional[FeeStrategy] = None,
     ):
-        super().__init__(account, autosign)
+        # fees can also be set in the params file, e.g. deployment.max_fee: "120 gwei",
+        # or suggested by the fee strategy with deployment.fee_strategy: true
+        deployment_config = config.get("deployment", {})
+        if fee_strategy is None and deployment_config.get("fee_strategy"):
+            fee_strategy = FeeStrategy.from_provider()
+        super().__init__(
+            account,
+            autosign,
+            max_fee=max_fee or deployment_config.get("max_fee"),
+            max_priority_fee=max_priority_fee or deployment_config.get("max_priority_fee"),
+            fee_strategy=fee_strategy,
+        )
 
         check_plugins()
         self.path = path
@@ -604,14 +822,40 @@ class Deployer(Transactor):
         deployment_params = [container, *resolved_params.values()]
         kwargs = self._get_kwargs()
 
+        fee_strategy = self._get_fee_strategy()
+        if fee_strategy is not None:
+            return self._deploy_with_fee_strategy(container, resolved_params, fee_strategy)
+
         deployer_account = self.get_account()
-        return deployer_account.deploy(
-            *deployment_params,
-            # FIXME: Manual gas fees - #199
-            #    max_priority_fee="3 gwei",
-            #    max_fee="120 gwei",
-            **kwargs,
+        return deployer_account.deploy(*deployment_params, **self._fee_kwargs, **kwargs)
+
+    def _deploy_with_fee_strategy(
+        self, container: ContractContainer, resolved_params: OrderedDict, fee_strategy: FeeStrategy
+    ) -> ContractInstance:
+        """
+        Deploys the contract with suggested fees, replacing the deployment with higher fees
+        if it gets stuck. All versions share the nonce, so any of them deploys the contract
+        at the same address.
+        """
+        web3 = networks.provider.web3
+        nonce = web3.eth.get_transaction_count(self._account.address, "pending")
+        txn = container(
+            *resolved_params.values(),
+            sender=self._account,
+            nonce=nonce,
+            **fee_strategy.suggest_fees().as_kwargs(),
         )
+        txn = self._account.prepare_transaction(networks.provider.prepare_transaction(txn))
+        receipt = self._wait_for_receipt(txn, self._sign_and_send(txn), fee_strategy)
+        receipt.raise_for_status()
+
+        instance = chain.contracts.instance_from_receipt(receipt, container.contract_type)
+        chain.contracts.cache_deployment(instance)
+        print(f"Contract '{container.contract_type.name}' deployed to: {instance.address}")
+        if self.verify:
+            project.deployments.track(instance)
+            networks.provider.network.publish_contract(instance.address)
+        return instance
 
     def _deploy_proxy(
         self,
@@ -619,7 +863,7 @@ class Deployer(Transactor):
         contract_type_container: ContractContainer,
         resolved_proxy_params: OrderedDict,
     ) -> ContractInstance:
-        proxy_container = OZ_DEPENDENCY.TransparentUpgradeableProxy
+        proxy_container = deployment_constants.OZ_DEPENDENCY.TransparentUpgradeableProxy
         print(
             f"\nDeploying {proxy_container.contract_type.name} "
             f"contract to proxy {target_contract_name}."
@@ -651,14 +895,49 @@ class Deployer(Transactor):
             )
 
         admin_address = to_checksum_address(admin_slot[-20:])
-        proxy_admin = OZ_DEPENDENCY.ProxyAdmin.at(admin_address)
+        proxy_admin = deployment_constants.OZ_DEPENDENCY.ProxyAdmin.at(admin_address)
         # TODO: Check that owner of proxy admin is deployer
 
+        storage_layout = self._check_storage_layout(implementation, proxy_address)
         self.transact(proxy_admin.upgradeAndCall, proxy_address, implementation.address, data)
+        if not is_local_network():
+            # record the new layout as the baseline for the next upgrade
+            write_storage_layout(
+                layout=storage_layout,
+                filepath=storage_layout_filepath(chain.chain_id, proxy_address),
+            )
 
         wrapped_instance = getattr(project, implementation.contract_type.name).at(proxy_address)
         return wrapped_instance
 
+    def _check_storage_layout(self, implementation: ContractInstance, proxy_address):
+        """
+        Checks that the storage layout of the new implementation is compatible with
+        the one currently behind the proxy, before the upgrade is sent.
+        """
+        contract_name = implementation.contract_type.name
+        print(f"\nChecking storage layout compatibility of {contract_name}...")
+        storage_layout = get_storage_layout(contract_name)
+        baseline = get_storage_layout_baseline(
+            contract_name=contract_name,
+            chain_id=chain.chain_id,
+            proxy_address=proxy_address,
+            baseline=self.config["deployment"].get("storage_layout_baseline"),
+        )
+        if baseline is None:
+            print(
+                f"(!) No storage layout baseline found for {proxy_address}; "
+                "set 'storage_layout_baseline' in the deployment config to check it."
+            )
+            if not is_local_network():
+                # upgrading unchecked must be confirmed explicitly, even with autosign
+                _continue()
+            return storage_layout
+
+        validate_storage_compatibility(old=baseline, new=storage_layout)
+        print(f"(i) Storage layout of {contract_name} is compatible.")
+        return storage_layout
+
     def finalize(self, deployments: List[ContractInstance]) -> None:
         """
         Publishes the deployments to the registry and optionally to block explorers.
@@ -670,6 +949,15 @@ class Deployer(Transactor):
         if self.verify:
             verify_contracts(contracts=deployments)
 
+    def _describe_fees(self) -> str:
+        fee_strategy = self._get_fee_strategy()
+        if fee_strategy is not None:
+            caps = f"capped at {fee_strategy.caps}" if fee_strategy.caps else "uncapped"
+            return f"suggested by fee strategy, {caps}"
+        if self._fee_kwargs:
+            return f"fixed at {self._fee_kwargs}"
+        return "provider defaults"
+
     def _print_deployment_info(self):
         print(
             f"Account: {self.get_account().address}",
@@ -680,5 +968,6 @@ class Deployer(Transactor):
             f"Network: {networks.provider.network.name}",
             f"Chain ID: {networks.provider.network.chain_id}",
             f"Gas Price: {networks.provider.gas_price}",
+            f"Fees: {self._describe_fees()}",
             sep="\n",
         )
@@ -0,0 +1,160 @@
+import threading
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple
+
+from deployment.constants import MAINNET, PORTER_SAMPLING_ENDPOINTS
+from deployment.utils import (
+    DEFAULT_BACKOFF,
+    DEFAULT_MAX_RETRIES,
+    DEFAULT_TIMEOUT,
+    RETRY_STATUS_CODES,
+    call_with_retries,
+)
+
+# requests is imported on first use to keep the package import cheap
+if TYPE_CHECKING:
+    import requests
+
+DEFAULT_CACHE_TTL = 60  # seconds
+POOL_SIZE = 10
+
+# (url, params, timeout) -> decoded JSON response
+Transport = Callable[[str, Dict, float], Dict]
+
+
+class PorterError(Exception):
+    """Raised when Porter can't be reached or keeps failing."""
+
+
+class RetryablePorterError(PorterError):
+    """Raised by transports for failures that are worth retrying."""
+
+
+class RequestsTransport:
+    """Default transport, sending requests over a pooled keep-alive session."""
+
+    def __init__(self, session: Optional["requests.Session"] = None):
+        import requests
+
+        if session is None:
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=POOL_SIZE, pool_maxsize=POOL_SIZE
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+        self.session = session
+
+    def __call__(self, url: str, params: Dict, timeout: float) -> Dict:
+        import requests
+
+        try:
+            response = self.session.get(url, params=params, timeout=timeout)
+        except (requests.ConnectionError, requests.Timeout) as e:
+            raise RetryablePorterError(str(e)) from e
+        if response.status_code in RETRY_STATUS_CODES:
+            raise RetryablePorterError(f"{response.status_code} {response.reason}")
+        response.raise_for_status()
+        return response.json()
+
+
+class PorterClient:
+    """
+    Client for sampling nodes from the Porter instance of a TACo domain.
+
+    Failed requests are retried with exponential backoff. On testnets, where sampling
+    is not seeded, results are cached for `cache_ttl` seconds so that forming several
+    cohorts doesn't query Porter each time.
+    """
+
+    def __init__(
+        self,
+        domain: str,
+        endpoint: Optional[str] = None,
+        transport: Optional[Transport] = None,
+        timeout: float = DEFAULT_TIMEOUT,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        backoff: float = DEFAULT_BACKOFF,
+        cache_ttl: float = DEFAULT_CACHE_TTL,
+    ):
+        endpoint = endpoint or PORTER_SAMPLING_ENDPOINTS.get(domain)
+        if not endpoint:
+            raise ValueError(f"Porter endpoint not found for domain '{domain}'")
+        self.domain = domain
+        self.endpoint = endpoint
+        self.transport = transport or RequestsTransport()
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.cache_ttl = cache_ttl
+        self._cache: Dict[Tuple, Tuple[float, List[str]]] = dict()
+        self._lock = threading.Lock()
+
+    def _request(self, params: Dict) -> Dict:
+        try:
+            return call_with_retries(
+                lambda: self.transport(self.endpoint, params, self.timeout),
+                max_retries=self.max_retries,
+                backoff=self.backoff,
+                retry_on=(RetryablePorterError,),
+            )
+        except RetryablePorterError as e:
+            raise PorterError(
+                f"Porter request to {self.endpoint} failed after "
+                f"{self.max_retries + 1} attempts: {e}"
+            ) from e
+
+    def _fetch_ursulas(self, params: Dict) -> List[str]:
+        data = self._request(params)
+        ursulas = data["result"]["ursulas"]
+        if self.domain != MAINNET:
+            # /get_ursulas is used for sampling (instead of /bucket_sampling)
+            #  so the json returned is slightly different
+            ursulas = [u["checksum_address"] for u in ursulas]
+        return sorted(ursulas, key=lambda x: x.lower())
+
+    def get_ursulas(
+        self,
+        quantity: int,
+        random_seed: Optional[int] = None,
+        duration: Optional[int] = None,
+        min_version: Optional[str] = None,
+        exclude_ursulas: Optional[List[str]] = None,
+    ) -> List[str]:
+        """Samples `quantity` staking providers, sorted by address."""
+        from eth_utils import to_checksum_address
+
+        params = {"quantity": quantity}
+        if duration:
+            params["duration"] = duration
+        if random_seed:
+            if self.domain != MAINNET:
+                raise ValueError("'random_seed' is only a valid parameter for mainnet")
+            params["random_seed"] = random_seed
+        if min_version:
+            params["min_version"] = min_version
+        if exclude_ursulas:
+            nodes = [to_checksum_address(node) for node in exclude_ursulas]
+            params["exclude_ursulas"] = ",".join(nodes)
+
+        if self.domain == MAINNET or not self.cache_ttl:
+            return self._fetch_ursulas(params)
+
+        key = tuple(sorted(params.items()))
+        now = time.monotonic()
+        with self._lock:
+            cached = self._cache.get(key)
+        if cached and now - cached[0] < self.cache_ttl:
+            return list(cached[1])
+
+        ursulas = self._fetch_ursulas(params)
+        with self._lock:
+            self._cache[key] = (now, ursulas)
+        return list(ursulas)
+
+
+@lru_cache(maxsize=None)
+def get_porter_client(domain: str) -> PorterClient:
+    """Returns a client shared by all callers for the domain."""
+    return PorterClient(domain=domain)
@@ -1,18 +1,29 @@
 import json
-import shutil
+import os
+import stat
+import tempfile
 from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
 from enum import Enum
 from pathlib import Path
-from typing import Dict, List, NamedTuple, Optional
+from typing import TYPE_CHECKING, Any, Dict, Iterator, List, NamedTuple, Optional, Tuple
 
-from ape import networks, project
-from ape.contracts import ContractInstance
 from eth_typing import ChecksumAddress
-from eth_utils import to_checksum_address
-from web3.types import ABI
 
 from deployment.utils import _load_json, get_contract_container, registry_filepath_from_domain
 
+try:
+    import fcntl
+except ImportError:  # not available on Windows
+    fcntl = None
+
+# ape and web3 are imported on first use so that reading registries stays cheap
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+    from web3.types import ABI
+else:
+    ABI = List[Dict[str, Any]]
+
 ChainId = int
 ContractName = str
 
@@ -36,8 +47,10 @@ class RegistryEntry(NamedTuple):
     deployer: str
 
 
-def _get_abi(contract_instance: ContractInstance) -> ABI:
+def _get_abi(contract_instance: "ContractInstance") -> ABI:
     """Returns the ABI of a contract instance."""
+    from ape import networks
+
     contract_abi = list()
 
     # check if proxy contract, use underlying implementation contract ABI
@@ -53,12 +66,14 @@ def _get_abi(contract_instance: ContractInstance) -> ABI:
 
 
 def _get_name(
-    contract_instance: ContractInstance, registry_names: Dict[ContractName, ContractName]
+    contract_instance: "ContractInstance", registry_names: Dict[ContractName, ContractName]
 ) -> ContractName:
     """
     Returns the optionally remapped registry name of a contract instance.
     If the contract instance is not remapped, the real contract name is returned.
     """
+    from ape import networks
+
     # check if proxy contract, use underlying implementation contract ABI
     proxy_info = networks.provider.network.ecosystem.get_proxy_info(contract_instance.address)
     # proxy_info = chain_fixture.contracts.get_proxy_info(contract_instance.address)
@@ -75,8 +90,10 @@ def _get_name(
 
 
 def _get_entry(
-    contract_instance: ContractInstance, registry_names: Dict[ContractName, ContractName]
+    contract_instance: "ContractInstance", registry_names: Dict[ContractName, ContractName]
 ) -> RegistryEntry:
+    from eth_utils import to_checksum_address
+
     contract_abi = _get_abi(contract_instance)
     contract_name = _get_name(contract_instance=contract_instance, registry_names=registry_names)
     receipt = contract_instance.creation_metadata.receipt
@@ -93,7 +110,7 @@ def _get_entry(
 
 
 def _get_entries(
-    contract_instances: List[ContractInstance], registry_names: Dict[ContractName, ContractName]
+    contract_instances: List["ContractInstance"], registry_names: Dict[ContractName, ContractName]
 ) -> List[RegistryEntry]:
     """Returns a list of contract entries from a list of contract instances."""
     entries = list()
@@ -103,13 +120,16 @@ def _get_entries(
     return entries
 
 
-def read_registry(filepath: Path) -> List[RegistryEntry]:
+def iter_registry(filepath: Path) -> Iterator[RegistryEntry]:
+    """
+    Yields the entries of a nucypher-style contract registry.
+    The file is parsed as a whole; only the entries are created lazily.
+    """
     with open(filepath, "r") as file:
         data = json.load(file)
-    registry_entries = list()
     for chain_id, entries in data.items():
         for contract_name, artifacts in entries.items():
-            registry_entry = RegistryEntry(
+            yield RegistryEntry(
                 chain_id=int(chain_id),
                 name=contract_name,
                 address=artifacts["address"],
@@ -118,8 +138,79 @@ def read_registry(filepath: Path) -> List[RegistryEntry]:
                 block_number=artifacts["block_number"],
                 deployer=artifacts["deployer"],
             )
-            registry_entries.append(registry_entry)
-    return registry_entries
+
+
+def read_registry(filepath: Path) -> List[RegistryEntry]:
+    return list(iter_registry(filepath))
+
+
+def _canonical_registry_abi(abi: ABI) -> ABI:
+    """Returns the ABI sorted in the standard registry order."""
+    return sorted(abi, key=lambda d: (d["type"], d.get("name", "")))
+
+
+def _entry_data(entry: RegistryEntry) -> dict:
+    return {
+        "address": entry.address,
+        "abi": _canonical_registry_abi(entry.abi),
+        "tx_hash": entry.tx_hash,
+        "block_number": int(entry.block_number),
+        "deployer": entry.deployer,
+    }
+
+
+def _registry_data(entries: List[RegistryEntry]) -> Dict[str, Dict[ContractName, dict]]:
+    # Sort registry entries to enforce common order
+    # See https://github.com/nucypher/nucypher-contracts/issues/192
+    data = defaultdict(dict)
+    for entry in sorted(entries, key=lambda entry: (str(entry.chain_id), entry.name)):
+        data[str(entry.chain_id)][entry.name] = _entry_data(entry)
+    return data
+
+
+@contextmanager
+def _registry_lock(filepath: Path) -> Iterator[None]:
+    """
+    Serializes read-modify-write cycles on registries of the same directory,
+    e.g. concurrent CI and heartbeat workflow runs.
+    """
+    if fcntl is None:
+        yield
+        return
+    directory_fd = os.open(filepath.parent, os.O_RDONLY)
+    try:
+        fcntl.flock(directory_fd, fcntl.LOCK_EX)
+        yield
+    finally:
+        fcntl.flock(directory_fd, fcntl.LOCK_UN)
+        os.close(directory_fd)
+
+
+def _registry_file_mode(filepath: Path) -> int:
+    """Mode of the existing registry file, or the default mode for new files."""
+    if filepath.exists():
+        return stat.S_IMODE(filepath.stat().st_mode)
+    umask = os.umask(0)
+    os.umask(umask)
+    return 0o666 & ~umask
+
+
+def _write_registry_data(data: dict, filepath: Path) -> None:
+    """Atomically replaces the registry file so readers never see partial content."""
+    mode = _registry_file_mode(filepath)
+    with tempfile.NamedTemporaryFile(
+        "w", dir=filepath.parent, prefix=f".{filepath.name}.", suffix=".tmp", delete=False
+    ) as file:
+        try:
+            json.dump(data, file, **STANDARD_REGISTRY_JSON_FORMAT)
+            file.flush()
+            os.fsync(file.fileno())
+            # temporary files are only readable by their owner
+            os.chmod(file.name, mode)
+        except Exception:
+            os.unlink(file.name)
+            raise
+    os.replace(file.name, filepath)
 
 
 def write_registry(entries: List[RegistryEntry], filepath: Path, silent: bool = False) -> Path:
@@ -129,51 +220,56 @@ def write_registry(entries: List[RegistryEntry], filepath: Path, silent: bool =
         print("No entries provided.")
         return filepath
 
-    # Sort registry entries to enforce common order
-    # See https://github.com/nucypher/nucypher-contracts/issues/192
-    entries.sort(key=lambda entry: (str(entry.chain_id), entry.name))
-
-    data = defaultdict(dict)
-    for entry in entries:
-        entry_abi = list(entry.abi)
-        entry_abi.sort(key=lambda d: (d["type"], d.get("name", "")))
-
-        data[str(entry.chain_id)][entry.name] = {
-            "address": entry.address,
-            "abi": entry_abi,
-            "tx_hash": entry.tx_hash,
-            "block_number": int(entry.block_number),
-            "deployer": entry.deployer,
-        }
+    data = _registry_data(entries)
 
     # Create the parent directory if it does not exist
     filepath.parent.mkdir(parents=True, exist_ok=True)
 
-    # If the file already exists, attempt to merge the data, if not create a new file
-    if filepath.exists():
-        if not silent:
-            print(f"Updating existing registry at {filepath}.")
-        existing_data = _load_json(filepath)
-
-        if any(chain_id in existing_data for chain_id in data):
-            filepath = filepath.with_suffix(".unmerged.json")
+    with _registry_lock(filepath):
+        # If the file already exists, attempt to merge the data, if not create a new file
+        if filepath.exists():
             if not silent:
-                print(
-                    "Cannot merge registries with overlapping chain IDs.\n"
-                    f"Writing to {filepath} to avoid overwriting existing data."
-                )
-        else:
-            existing_data.update(data)
-            data = existing_data
-    elif not silent:
-        print(f"Creating new registry at {filepath}.")
+                print(f"Updating existing registry at {filepath}.")
+            existing_data = _load_json(filepath)
+
+            if any(chain_id in existing_data for chain_id in data):
+                filepath = filepath.with_suffix(".unmerged.json")
+                if not silent:
+                    print(
+                        "Cannot merge registries with overlapping chain IDs.\n"
+                        f"Writing to {filepath} to avoid overwriting existing data."
+                    )
+            else:
+                # existing chains are already canonical and are kept untouched
+                existing_data.update(data)
+                data = existing_data
+        elif not silent:
+            print(f"Creating new registry at {filepath}.")
 
-    with open(filepath, "w") as file:
-        json.dump(data, file, **STANDARD_REGISTRY_JSON_FORMAT)
+        _write_registry_data(data, filepath)
 
     return filepath
 
 
+def update_registry(
+    entries: List[RegistryEntry], filepath: Path, replace_chains: bool = False
+) -> Path:
+    """
+    Incrementally adds or replaces entries in a registry, creating it if needed. Only the
+    given entries are canonicalized; with `replace_chains`, all previous entries of their
+    chains are dropped. Entries of other chains are kept untouched.
+    """
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with _registry_lock(filepath):
+        data = _load_json(filepath) if filepath.exists() else dict()
+        for chain_id, chain_entries in _registry_data(entries).items():
+            chain_data = dict() if replace_chains else data.get(chain_id, dict())
+            chain_data.update(chain_entries)
+            data[chain_id] = dict(sorted(chain_data.items()))
+        _write_registry_data(dict(sorted(data.items())), filepath)
+    return filepath
+
+
 class ConflictResolution(Enum):
     USE_1 = 1
     USE_2 = 2
@@ -210,81 +306,231 @@ def _select_conflict_resolution(
 
 
 def registry_from_ape_deployments(
-    deployments: List[ContractInstance],
+    deployments: List["ContractInstance"],
     output_filepath: Path,
     registry_names: Optional[Dict[ContractName, ContractName]] = None,
 ) -> Path:
-    """Creates a nucypher-style contract registry from ape deployments API."""
+    """
+    Creates a nucypher-style contract registry from ape deployments API, or adds the
+    deployments to an existing one, replacing the entries of the same contracts.
+    """
     registry_names = registry_names or dict()
     entries = _get_entries(contract_instances=deployments, registry_names=registry_names)
-    output_filepath = write_registry(entries=entries, filepath=output_filepath)
+    output_filepath = update_registry(entries=entries, filepath=output_filepath)
     print(f"(i) Registry written to {output_filepath}!")
     return output_filepath
 
 
+class MergeRule(Enum):
+    """Declarative rule used to resolve conflicting entries when merging registries."""
+
+    NEWER = "newer"  # entry with the highest block number; registry 2 on ties
+    REGISTRY_1 = "registry-1"
+    REGISTRY_2 = "registry-2"
+    ABORT = "abort"  # conflicts are errors
+    INTERACTIVE = "interactive"
+
+
+class DiffStatus(Enum):
+    ADDED = "added"  # only in registry 2
+    KEPT = "kept"  # only in registry 1
+    IDENTICAL = "identical"
+    CONFLICT = "conflict"
+    DEPRECATED = "deprecated"
+
+
+class RegistryDiffEntry(NamedTuple):
+    """Machine-readable outcome of merging the entries for a (chain_id, name) key."""
+
+    chain_id: ChainId
+    name: ContractName
+    status: DiffStatus
+    address_1: Optional[ChecksumAddress]
+    address_2: Optional[ChecksumAddress]
+    block_number_1: Optional[int]
+    block_number_2: Optional[int]
+    selected: Optional[int]  # registry (1 or 2) providing the merged entry; None if dropped
+
+    def to_dict(self) -> dict:
+        data = self._asdict()
+        data["status"] = self.status.value
+        return data
+
+
+class RegistryMergeConflict(Exception):
+    """Raised when conflicting registry entries can't be resolved by the merge rule."""
+
+
+class RegistryMergeResult(NamedTuple):
+    entries: List[RegistryEntry]
+    diff: List[RegistryDiffEntry]
+
+    @property
+    def conflicts(self) -> List[RegistryDiffEntry]:
+        return [d for d in self.diff if d.status == DiffStatus.CONFLICT]
+
+    @property
+    def unresolved(self) -> List[RegistryDiffEntry]:
+        return [d for d in self.conflicts if d.selected is None]
+
+
+def _entry_key(entry: RegistryEntry) -> Tuple[ChainId, ContractName]:
+    return entry.chain_id, entry.name
+
+
+def _same_entry(entry_1: RegistryEntry, entry_2: RegistryEntry) -> bool:
+    """Entries are the same if they only differ in ABI ordering."""
+    if entry_1._replace(abi=None) != entry_2._replace(abi=None):
+        return False
+    return _canonical_abi(entry_1.abi) == _canonical_abi(entry_2.abi)
+
+
+def _canonical_abi(abi: ABI) -> ABI:
+    return sorted(abi, key=lambda d: (d["type"], d.get("name", ""), json.dumps(d, sort_keys=True)))
+
+
+def _resolve_conflict(
+    entry_1: RegistryEntry, entry_2: RegistryEntry, rule: MergeRule, select_interactively
+) -> Optional[ConflictResolution]:
+    if rule == MergeRule.REGISTRY_1:
+        return ConflictResolution.USE_1
+    if rule == MergeRule.REGISTRY_2:
+        return ConflictResolution.USE_2
+    if rule == MergeRule.NEWER:
+        newer_1 = int(entry_1.block_number) > int(entry_2.block_number)
+        return ConflictResolution.USE_1 if newer_1 else ConflictResolution.USE_2
+    if rule == MergeRule.INTERACTIVE and select_interactively:
+        return select_interactively(entry_1, entry_2)
+    return None
+
+
+def merge_registry_entries(
+    entries_1: Iterator[RegistryEntry],
+    entries_2: Iterator[RegistryEntry],
+    rule: MergeRule = MergeRule.ABORT,
+    deprecated_contracts: Optional[List[ContractName]] = None,
+    select_interactively=None,
+) -> RegistryMergeResult:
+    """
+    Merges two sets of registry entries keyed by (chain_id, name). Conflicts are resolved
+    by the rule; unresolved conflicts are reported in the diff and excluded from the
+    merged entries.
+    """
+    deprecated_contracts = set(deprecated_contracts or [])
+    pending_1: Dict[Tuple[ChainId, ContractName], RegistryEntry] = OrderedDict()
+    for entry in entries_1:
+        pending_1[_entry_key(entry)] = entry
+
+    merged, diff = list(), list()
+
+    def record(status, entry_1, entry_2, selected):
+        entry = entry_1 or entry_2
+        diff.append(
+            RegistryDiffEntry(
+                chain_id=entry.chain_id,
+                name=entry.name,
+                status=status,
+                address_1=entry_1.address if entry_1 else None,
+                address_2=entry_2.address if entry_2 else None,
+                block_number_1=int(entry_1.block_number) if entry_1 else None,
+                block_number_2=int(entry_2.block_number) if entry_2 else None,
+                selected=selected,
+            )
+        )
+        if selected is not None:
+            merged.append(entry_1 if selected == 1 else entry_2)
+
+    for entry_2 in entries_2:
+        entry_1 = pending_1.pop(_entry_key(entry_2), None)
+        if entry_2.name in deprecated_contracts:
+            record(DiffStatus.DEPRECATED, entry_1, entry_2, selected=None)
+        elif entry_1 is None:
+            record(DiffStatus.ADDED, None, entry_2, selected=2)
+        elif _same_entry(entry_1, entry_2):
+            record(DiffStatus.IDENTICAL, entry_1, entry_2, selected=1)
+        else:
+            resolution = _resolve_conflict(entry_1, entry_2, rule, select_interactively)
+            selected = resolution.value if resolution else None
+            record(DiffStatus.CONFLICT, entry_1, entry_2, selected=selected)
+
+    for entry_1 in pending_1.values():
+        if entry_1.name in deprecated_contracts:
+            record(DiffStatus.DEPRECATED, entry_1, None, selected=None)
+        else:
+            record(DiffStatus.KEPT, entry_1, None, selected=1)
+
+    return RegistryMergeResult(entries=merged, diff=diff)
+
+
+def write_registry_diff(diff: List[RegistryDiffEntry], filepath: Path) -> Path:
+    """Writes the merge diff as JSON."""
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, "w") as file:
+        json.dump([d.to_dict() for d in diff], file, **STANDARD_REGISTRY_JSON_FORMAT)
+    return filepath
+
+
 def merge_registries(
     registry_1_filepath: Path,
     registry_2_filepath: Path,
     output_filepath: Path,
     deprecated_contracts: Optional[List[ContractName]] = None,
     force_conflict_resolution: ConflictResolution = None,
+    rule: MergeRule = MergeRule.INTERACTIVE,
+    check: bool = False,
+    diff_filepath: Optional[Path] = None,
 ) -> Path:
-    """Merges two nucypher-style contract registries created from ape deployments API."""
-    # If no deprecated contracts are specified, use an empty list
-    deprecated_contracts = deprecated_contracts or []
-
-    # Read the registries, excluding deprecated contracts
-    reg1 = defaultdict(OrderedDict)
-    reg2 = defaultdict(OrderedDict)
+    """
+    Merges two nucypher-style contract registries created from ape deployments API.
+    In check mode the merge is only validated, and nothing is written but the diff.
+    """
+    if force_conflict_resolution is not None:
+        rule = {
+            ConflictResolution.USE_1: MergeRule.REGISTRY_1,
+            ConflictResolution.USE_2: MergeRule.REGISTRY_2,
+        }[force_conflict_resolution]
+    if check and rule == MergeRule.INTERACTIVE:
+        rule = MergeRule.ABORT  # check mode never prompts
+
+    def select_interactively(entry_1, entry_2):
+        return _select_conflict_resolution(
+            registry_1_entry=entry_1,
+            registry_2_entry=entry_2,
+            registry_1_filepath=registry_1_filepath,
+            registry_2_filepath=registry_2_filepath,
+        )
 
-    for e in read_registry(registry_1_filepath):
-        if e.name in deprecated_contracts:
-            continue
-        reg1[e.chain_id][e.name] = e
+    result = merge_registry_entries(
+        entries_1=iter_registry(registry_1_filepath),
+        entries_2=iter_registry(registry_2_filepath),
+        rule=rule,
+        deprecated_contracts=deprecated_contracts,
+        select_interactively=select_interactively,
+    )
+    if diff_filepath:
+        write_registry_diff(diff=result.diff, filepath=diff_filepath)
 
-    for e in read_registry(registry_2_filepath):
-        if e.name in deprecated_contracts:
-            continue
-        reg2[e.chain_id][e.name] = e
-
-    merged: List[RegistryEntry] = list()
-
-    # Iterate over all chains and unique contract names across both registries
-    all_chains = set(reg1) | set(reg2)
-    common_chains = set(reg1) & set(reg2)
-    for chain in all_chains:
-        reg1_chain_entries, reg2_chain_entries = reg1.get(chain, {}), reg2.get(chain, {})
-        if chain in common_chains:
-            # check for conflicting contracts
-            all_contracts = set(reg1_chain_entries) | set(reg2_chain_entries)
-            for name in all_contracts:
-                entry_1, entry_2 = reg1_chain_entries.get(name), reg2_chain_entries.get(name)
-                if entry_1 and entry_2:
-                    # entries for the same name (same chain)
-                    resolution = force_conflict_resolution or _select_conflict_resolution(
-                        registry_1_entry=entry_1,
-                        registry_2_entry=entry_2,
-                        registry_1_filepath=registry_1_filepath,
-                        registry_2_filepath=registry_2_filepath,
-                    )
-                    selected_entry = entry_1 if resolution == ConflictResolution.USE_1 else entry_2
-                else:
-                    selected_entry = entry_1 or entry_2
+    if result.unresolved:
+        details = "\n\t".join(
+            f"{d.name} on chain {d.chain_id}: {d.address_1} vs {d.address_2}"
+            for d in result.unresolved
+        )
+        raise RegistryMergeConflict(f"Unresolved registry conflicts:\n\t{details}")
 
-                # commit the selected entry
-                merged.append(selected_entry)
-        else:
-            # not a common chain so just move on right along
-            selected_entries = reg1_chain_entries or reg2_chain_entries
-            merged.extend(list(selected_entries.values()))
+    if check:
+        print(
+            f"Registries can be merged: {len(result.entries)} entries, "
+            f"{len(result.conflicts)} conflict(s) resolved by rule '{rule.value}'."
+        )
+        return output_filepath
 
     # Write the merged registry to the specified output file path
-    write_registry(entries=merged, filepath=output_filepath)
+    write_registry(entries=result.entries, filepath=output_filepath)
     print(f"Merged registry output to {output_filepath}")
     return output_filepath
 
 
-def contracts_from_registry(filepath: Path, chain_id: ChainId) -> Dict[str, ContractInstance]:
+def contracts_from_registry(filepath: Path, chain_id: ChainId) -> Dict[str, "ContractInstance"]:
     """Returns a dictionary of contract instances from a nucypher-style contract registry."""
     registry_entries = read_registry(filepath=filepath)
     deployments = dict()
@@ -307,18 +553,18 @@ def normalize_registry(filepath: Path):
         raise
 
     try:
-        temp_filepath = filepath.with_suffix(".temp.json")
-        write_registry(entries=registry_entries, filepath=temp_filepath, silent=True)
-        shutil.copy(temp_filepath, filepath)
-        temp_filepath.unlink()
+        with _registry_lock(filepath):
+            _write_registry_data(_registry_data(registry_entries), filepath)
         print(f"Successfully normalized registry at {filepath}.")
     except Exception:
         print(f"Error when normalizing registry at {filepath}.")
         raise
 
 
-def get_contract(domain: str, contract_name: str) -> ContractInstance:
+def get_contract(domain: str, contract_name: str) -> "ContractInstance":
     """Returns the contract instance for the contract name and domain."""
+    from ape import project
+
     registry_filepath = registry_filepath_from_domain(domain=domain)
     chain_id = project.chain_manager.chain_id
     deployments = contracts_from_registry(filepath=registry_filepath, chain_id=chain_id)
@@ -0,0 +1,89 @@
+from typing import TYPE_CHECKING, List, NamedTuple, Optional
+
+from deployment.events import DEFAULT_BLOCK_WINDOW, get_logs
+from deployment.multicall import Call, Multicall
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+
+
+class AccruedReimbursement(NamedTuple):
+    """Refunds accrued by an operator in the ReimbursementPool and not claimed yet."""
+
+    operator: str
+    staking_provider: Optional[str]
+    amount: int
+
+
+def get_accrual_receivers(
+    reimbursement_pool: "ContractInstance",
+    from_block: int,
+    to_block: int,
+    block_window: int = DEFAULT_BLOCK_WINDOW,
+) -> List[str]:
+    """
+    Returns every receiver with a refund accrued in the block range, in order of first accrual.
+    """
+    logs = get_logs(
+        contract=reimbursement_pool,
+        event_names=["RefundAccrued"],
+        from_block=from_block,
+        to_block=to_block,
+        block_window=block_window,
+    )
+    receivers = dict()
+    for log in logs:
+        receivers.setdefault(log.receiver, None)
+    return list(receivers)
+
+
+def get_accrued_reimbursements(
+    reimbursement_pool: "ContractInstance",
+    from_block: int,
+    to_block: Optional[int] = None,
+    application: Optional["ContractInstance"] = None,
+    multicall: Optional[Multicall] = None,
+    block_window: int = DEFAULT_BLOCK_WINDOW,
+) -> List[AccruedReimbursement]:
+    """
+    Returns the outstanding accruals of all operators that accrued refunds since `from_block`,
+    largest first. Balances (and staking providers, if the application is given) are read
+    in a single Multicall round when a Multicall instance is given.
+    """
+    from ape import chain
+
+    if to_block is None:
+        to_block = chain.blocks.head.number
+    operators = get_accrual_receivers(reimbursement_pool, from_block, to_block, block_window)
+
+    calls = [Call(reimbursement_pool, "accrued", (operator,)) for operator in operators]
+    if application is not None:
+        calls.extend(
+            Call(application, "operatorToStakingProvider", (operator,)) for operator in operators
+        )
+    if multicall is not None:
+        results = multicall.call(calls)
+    else:
+        results = [getattr(call.contract, call.method)(*call.args) for call in calls]
+
+    amounts = results[: len(operators)]
+    providers = results[len(operators) :] or [None] * len(operators)
+    accruals = [
+        AccruedReimbursement(operator=operator, staking_provider=provider, amount=amount)
+        for operator, provider, amount in zip(operators, providers, amounts)
+        if amount
+    ]
+    return sorted(accruals, key=lambda accrual: accrual.amount, reverse=True)
+
+
+def format_accrued_reimbursements(accruals: List[AccruedReimbursement]) -> str:
+    """Renders the accruals as a table, with the total in ETH."""
+    lines = [f"{'Operator':<44}{'Staking provider':<44}{'Accrued (ETH)':>16}"]
+    for accrual in accruals:
+        lines.append(
+            f"{accrual.operator:<44}{accrual.staking_provider or '-':<44}"
+            f"{accrual.amount / 10**18:>16.6f}"
+        )
+    total = sum(accrual.amount for accrual in accruals)
+    lines.append(f"{'Total':<88}{total / 10**18:>16.6f}")
+    return "\n".join(lines)
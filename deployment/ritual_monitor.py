@@ -0,0 +1,225 @@
+import time
+from typing import TYPE_CHECKING, Callable, Dict, Iterable, List, Optional, Set
+
+from deployment.constants import RitualState
+from deployment.events import DEFAULT_BLOCK_WINDOW, get_logs
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+
+MONITORED_EVENTS = (
+    "StartRitual",
+    "TranscriptPosted",
+    "StartAggregationRound",
+    "AggregationPosted",
+    "EndRitual",
+)
+
+DEFAULT_POLL_INTERVAL = 15  # seconds
+DEFAULT_CONFIRMATIONS = 2
+# fraction of the DKG timeout after which rituals with missing submissions are at risk
+DEFAULT_TIMEOUT_RISK_THRESHOLD = 0.5
+
+END_STATES = (
+    RitualState.DKG_TIMEOUT,
+    RitualState.DKG_INVALID,
+    RitualState.ACTIVE,
+)
+
+
+class RitualProgress:
+    """Per-ritual state, maintained incrementally from Coordinator events."""
+
+    def __init__(
+        self, ritual_id: int, participants: List[str], start_block: int, start_timestamp: int
+    ):
+        self.ritual_id = ritual_id
+        self.participants = list(participants)
+        self.start_block = start_block
+        self.start_timestamp = start_timestamp
+        self.state = RitualState.DKG_AWAITING_TRANSCRIPTS
+        # node -> seconds elapsed since StartRitual
+        self.transcript_lags: Dict[str, int] = dict()
+        self.aggregation_lags: Dict[str, int] = dict()
+        self.end_timestamp: Optional[int] = None
+
+    @property
+    def missing_transcripts(self) -> List[str]:
+        return [p for p in self.participants if p not in self.transcript_lags]
+
+    @property
+    def missing_aggregations(self) -> List[str]:
+        return [p for p in self.participants if p not in self.aggregation_lags]
+
+    @property
+    def missing(self) -> List[str]:
+        if self.state == RitualState.DKG_AWAITING_TRANSCRIPTS:
+            return self.missing_transcripts
+        if self.state == RitualState.DKG_AWAITING_AGGREGATIONS:
+            return self.missing_aggregations
+        return []
+
+    def timeout_risk(self, now: int, dkg_timeout: int, threshold: float) -> bool:
+        """True if the ritual is still missing submissions late in its DKG timeout."""
+        if self.state in END_STATES:
+            return False
+        return now - self.start_timestamp >= dkg_timeout * threshold
+
+
+# (ritual, previous state) -> None
+TransitionCallback = Callable[[RitualProgress, RitualState], None]
+
+
+class RitualMonitor:
+    """
+    Follows rituals by polling Coordinator logs in block windows. Ritual state is kept
+    incrementally from StartRitual, TranscriptPosted, StartAggregationRound,
+    AggregationPosted and EndRitual events, so participants are never re-read.
+    """
+
+    def __init__(
+        self,
+        coordinator: "ContractInstance",
+        from_block: int,
+        ritual_ids: Optional[Iterable[int]] = None,
+        block_window: int = DEFAULT_BLOCK_WINDOW,
+        confirmations: int = DEFAULT_CONFIRMATIONS,
+        timeout_risk_threshold: float = DEFAULT_TIMEOUT_RISK_THRESHOLD,
+        on_transition: Optional[TransitionCallback] = None,
+    ):
+        self.coordinator = coordinator
+        self.next_block = from_block
+        self.ritual_ids: Optional[Set[int]] = set(ritual_ids) if ritual_ids else None
+        self.block_window = block_window
+        self.confirmations = confirmations
+        self.timeout_risk_threshold = timeout_risk_threshold
+        self.on_transition = on_transition or print_transition
+        self.rituals: Dict[int, RitualProgress] = dict()
+        self.dkg_timeout = coordinator.dkgTimeout()
+        self._timestamps: Dict[int, int] = dict()
+        self._at_risk: Set[int] = set()
+
+    def _block_timestamp(self, block_number: int) -> int:
+        from ape import networks
+
+        if block_number not in self._timestamps:
+            block = networks.provider.web3.eth.get_block(block_number)
+            self._timestamps[block_number] = block["timestamp"]
+        return self._timestamps[block_number]
+
+    def _transition(self, ritual: RitualProgress, state: RitualState) -> None:
+        previous_state, ritual.state = ritual.state, state
+        self.on_transition(ritual, previous_state)
+
+    def apply(self, event_name: str, args: dict, block_number: int, timestamp: int) -> None:
+        """Updates the state of the ritual the event belongs to."""
+        ritual_id = args["ritualId"]
+        if self.ritual_ids is not None and ritual_id not in self.ritual_ids:
+            return
+
+        if event_name == "StartRitual":
+            ritual = RitualProgress(
+                ritual_id=ritual_id,
+                participants=args["participants"],
+                start_block=block_number,
+                start_timestamp=timestamp,
+            )
+            self.rituals[ritual_id] = ritual
+            self.on_transition(ritual, RitualState.NON_INITIATED)
+            return
+
+        ritual = self.rituals.get(ritual_id)
+        if ritual is None:
+            # started before the first monitored block
+            return
+
+        if event_name == "TranscriptPosted":
+            ritual.transcript_lags[args["node"]] = timestamp - ritual.start_timestamp
+        elif event_name == "StartAggregationRound":
+            self._transition(ritual, RitualState.DKG_AWAITING_AGGREGATIONS)
+        elif event_name == "AggregationPosted":
+            # also emitted for incoming participants of a handover, which aren't tracked
+            if ritual.state == RitualState.DKG_AWAITING_AGGREGATIONS:
+                ritual.aggregation_lags[args["node"]] = timestamp - ritual.start_timestamp
+        elif event_name == "EndRitual":
+            ritual.end_timestamp = timestamp
+            state = RitualState.ACTIVE if args["successful"] else RitualState.DKG_INVALID
+            self._transition(ritual, state)
+
+    def _check_timeouts(self, now: int) -> None:
+        for ritual in self.rituals.values():
+            if ritual.state in END_STATES:
+                continue
+            if now - ritual.start_timestamp > self.dkg_timeout:
+                # timeouts are not signaled by an event
+                self._transition(ritual, RitualState.DKG_TIMEOUT)
+            elif ritual.ritual_id not in self._at_risk and ritual.timeout_risk(
+                now=now, dkg_timeout=self.dkg_timeout, threshold=self.timeout_risk_threshold
+            ):
+                self._at_risk.add(ritual.ritual_id)
+                print_timeout_risk(ritual, now=now, dkg_timeout=self.dkg_timeout)
+
+    def poll(self) -> int:
+        """Processes all confirmed blocks since the last poll; returns the next block."""
+        from ape import chain
+
+        head = chain.blocks.head.number - self.confirmations
+        if self.next_block <= head:
+            logs = get_logs(
+                contract=self.coordinator,
+                event_names=MONITORED_EVENTS,
+                from_block=self.next_block,
+                to_block=head,
+                block_window=self.block_window,
+            )
+            for log in logs:
+                # events of earlier blocks are processed
+                self.next_block = log.block_number
+                self.apply(
+                    event_name=log.event_name,
+                    args=log.event_arguments,
+                    block_number=log.block_number,
+                    timestamp=self._block_timestamp(log.block_number),
+                )
+            self.next_block = head + 1
+        if self.next_block > 0:
+            self._check_timeouts(now=self._block_timestamp(self.next_block - 1))
+        return self.next_block
+
+    def run(self, poll_interval: float = DEFAULT_POLL_INTERVAL) -> None:
+        """Polls until all the monitored rituals, if given, have ended."""
+        while True:
+            self.poll()
+            if self.ritual_ids is not None and all(
+                self.rituals.get(ritual_id) and self.rituals[ritual_id].state in END_STATES
+                for ritual_id in self.ritual_ids
+            ):
+                return
+            time.sleep(poll_interval)
+
+
+def print_transition(ritual: RitualProgress, previous_state: RitualState) -> None:
+    print(
+        f"Ritual #{ritual.ritual_id}: {RitualState(previous_state).name} -> "
+        f"{RitualState(ritual.state).name} (block {ritual.start_block}, "
+        f"{len(ritual.participants)} participants)"
+    )
+    if ritual.state == RitualState.DKG_AWAITING_AGGREGATIONS:
+        lags = sorted(ritual.transcript_lags.items(), key=lambda item: item[1])
+        print("\tTranscript lag per node:")
+        for node, lag in lags:
+            print(f"\t\t{node}: {lag}s")
+    elif ritual.state in END_STATES and ritual.state != RitualState.ACTIVE:
+        missing = ritual.missing_transcripts or ritual.missing_aggregations
+        if missing:
+            print("\t(!) Missing submissions from:\n\t\t" + "\n\t\t".join(missing))
+
+
+def print_timeout_risk(ritual: RitualProgress, now: int, dkg_timeout: int) -> None:
+    remaining = ritual.start_timestamp + dkg_timeout - now
+    print(
+        f"(!) Ritual #{ritual.ritual_id} at risk of timing out in {remaining}s; "
+        f"{RitualState(ritual.state).name} is missing {len(ritual.missing)} submission(s):"
+    )
+    for node in ritual.missing:
+        print(f"\t{node}")
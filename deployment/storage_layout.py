@@ -0,0 +1,466 @@
+import hashlib
+import json
+import re
+import subprocess
+import tempfile
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+import solcx
+from ape import Project, compilers, project
+
+from deployment.constants import STORAGE_LAYOUTS_DIR
+from deployment.utils import _load_json, get_contract_container
+
+STORAGE_LAYOUT_OUTPUT_SELECTION = {"*": {"*": ["storageLayout"]}}
+STORAGE_LAYOUT_CACHE_DIR = Path(".build") / "storage_layouts"
+
+SLOT_SIZE = 32
+
+
+class IncompatibleStorageLayout(Exception):
+    """Raised when an upgrade would corrupt the storage of a proxy."""
+
+
+class StorageVariable(NamedTuple):
+    """Represents a single (possibly packed) variable as laid out in storage."""
+
+    label: str
+    slot: int
+    offset: int
+    type: str
+    size: int
+
+    @property
+    def end_slot(self) -> int:
+        """First slot after the variable."""
+        return self.slot + max(1, -(-(self.offset + self.size) // SLOT_SIZE))
+
+    @property
+    def byte_range(self) -> Tuple[int, int]:
+        """Absolute [start, end) byte positions occupied by the variable."""
+        start = self.slot * SLOT_SIZE + self.offset
+        return start, start + self.size
+
+
+class StorageLayout(NamedTuple):
+    """Storage layout of a contract, including the layout of every struct it stores."""
+
+    contract: str
+    variables: List[StorageVariable]
+    structs: Dict[str, List[StorageVariable]]
+    array_structs: Tuple[str, ...] = ()  # structs stored as array elements, i.e. with a fixed size
+
+    def to_dict(self) -> dict:
+        return {
+            "contract": self.contract,
+            "variables": [v._asdict() for v in self.variables],
+            "structs": {
+                name: [m._asdict() for m in members] for name, members in self.structs.items()
+            },
+            "array_structs": list(self.array_structs),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "StorageLayout":
+        return cls(
+            contract=data["contract"],
+            variables=[StorageVariable(**v) for v in data["variables"]],
+            structs={
+                name: [StorageVariable(**m) for m in members]
+                for name, members in data["structs"].items()
+            },
+            array_structs=tuple(data.get("array_structs", ())),
+        )
+
+
+class StorageIncompatibility(NamedTuple):
+    """A single storage change that is unsafe for a proxy upgrade."""
+
+    scope: str
+    slot: int
+    offset: int
+    reason: str
+
+    def __str__(self) -> str:
+        return f"{self.scope} slot {self.slot} offset {self.offset}: {self.reason}"
+
+
+#
+# Compilation
+#
+
+
+def _get_source_path(contract_name: str, project_manager=project) -> Path:
+    """Returns the path of the source file declaring the contract in the given project."""
+    if project_manager is project:
+        source_id = get_contract_container(contract_name).contract_type.source_id
+        for base_path in (project.path, project.contracts_folder):
+            source_path = base_path / source_id
+            if source_path.exists():
+                return source_path
+        raise FileNotFoundError(f"Source file not found ({source_id})")
+
+    # sources may have moved since, so they are looked up in the other project itself
+    declaration = re.compile(rf"^\s*(abstract\s+)?contract\s+{contract_name}\b", re.MULTILINE)
+    for source_path in sorted(Path(project_manager.contracts_folder).rglob("*.sol")):
+        if declaration.search(source_path.read_text()):
+            return source_path
+    raise FileNotFoundError(f"No source file declares '{contract_name}'")
+
+
+def _cache_key(version, input_json: dict, base_path: Path) -> str:
+    """Hash of the compiler version, compiler settings and source contents."""
+    digest = hashlib.sha256(str(version).encode())
+    digest.update(json.dumps(input_json["settings"], sort_keys=True).encode())
+    for source_id, source in sorted(input_json["sources"].items()):
+        content = source.get("content")
+        if content is None:
+            content = (base_path / source["urls"][0]).read_text()
+        digest.update(source_id.encode())
+        digest.update(content.encode())
+    return digest.hexdigest()
+
+
+def _compile(version, input_json: dict, base_path: Path) -> dict:
+    """Compiles with solc, reusing previous output for identical sources and settings."""
+    cache_filepath = (
+        project.path
+        / STORAGE_LAYOUT_CACHE_DIR
+        / (_cache_key(version, input_json, base_path) + ".json")
+    )
+    if cache_filepath.exists():
+        return _load_json(cache_filepath)
+
+    output = solcx.compile_standard(input_json, solc_version=version, base_path=base_path)
+    cache_filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(cache_filepath, "w") as file:
+        json.dump(output, file)
+    return output
+
+
+def compile_storage_layout(contract_name: str, project_manager=project) -> dict:
+    """Compiles the contract with solc and returns its raw 'storageLayout' output."""
+    source_path = _get_source_path(contract_name, project_manager)
+    input_jsons = compilers.solidity.get_standard_input_json([source_path], project=project_manager)
+    for version, input_json in input_jsons.items():
+        input_json["settings"]["outputSelection"] = STORAGE_LAYOUT_OUTPUT_SELECTION
+        output = _compile(version, input_json, base_path=project_manager.path)
+        for source_contracts in output.get("contracts", {}).values():
+            if contract_name in source_contracts:
+                return source_contracts[contract_name]["storageLayout"]
+    raise ValueError(f"No storage layout produced for '{contract_name}'.")
+
+
+#
+# Parsing
+#
+
+
+def _to_variable(entry: dict, types: dict) -> StorageVariable:
+    type_info = types[entry["type"]]
+    return StorageVariable(
+        label=entry["label"],
+        slot=int(entry["slot"]),
+        offset=int(entry["offset"]),
+        type=type_info["label"],
+        size=int(type_info["numberOfBytes"]),
+    )
+
+
+def parse_storage_layout(contract_name: str, raw_layout: dict) -> StorageLayout:
+    """Converts solc's 'storageLayout' output into a StorageLayout."""
+    types = raw_layout.get("types") or dict()
+    variables = [_to_variable(entry, types) for entry in raw_layout["storage"]]
+    structs, array_structs = dict(), set()
+    for type_info in types.values():
+        members = type_info.get("members")
+        if members is not None:
+            structs[type_info["label"]] = [_to_variable(member, types) for member in members]
+        base_info = types.get(type_info.get("base", ""), {})
+        if "members" in base_info:
+            array_structs.add(base_info["label"])
+    return StorageLayout(
+        contract=contract_name,
+        variables=variables,
+        structs=structs,
+        array_structs=tuple(sorted(array_structs)),
+    )
+
+
+def get_storage_layout(contract_name: str) -> StorageLayout:
+    """Returns the storage layout of a project contract."""
+    raw_layout = compile_storage_layout(contract_name)
+    return parse_storage_layout(contract_name=contract_name, raw_layout=raw_layout)
+
+
+@contextmanager
+def _git_worktree(ref: str) -> Iterator[Path]:
+    """Checks out the given git ref in a temporary worktree."""
+    with tempfile.TemporaryDirectory() as tmp:
+        worktree = Path(tmp) / "worktree"
+        subprocess.run(
+            ["git", "worktree", "add", "--detach", str(worktree), ref],
+            cwd=project.path,
+            check=True,
+            capture_output=True,
+        )
+        try:
+            yield worktree
+        finally:
+            subprocess.run(
+                ["git", "worktree", "remove", "--force", str(worktree)],
+                cwd=project.path,
+                check=False,
+                capture_output=True,
+            )
+
+
+def get_storage_layout_at_ref(contract_name: str, ref: str) -> StorageLayout:
+    """Returns the storage layout of a contract as it was at the given git ref."""
+    with _git_worktree(ref) as worktree:
+        raw_layout = compile_storage_layout(contract_name, project_manager=Project(worktree))
+    return parse_storage_layout(contract_name=contract_name, raw_layout=raw_layout)
+
+
+def read_storage_layout(filepath: Path) -> StorageLayout:
+    return StorageLayout.from_dict(_load_json(filepath))
+
+
+def write_storage_layout(layout: StorageLayout, filepath: Path) -> Path:
+    filepath.parent.mkdir(parents=True, exist_ok=True)
+    with open(filepath, "w") as file:
+        json.dump(layout.to_dict(), file, indent=4)
+    return filepath
+
+
+#
+# Reporting
+#
+
+
+def slot_usage(variables: List[StorageVariable]) -> Dict[int, int]:
+    """Returns the number of used bytes per slot, relative to the first slot."""
+    usage = defaultdict(int)
+    for variable in variables:
+        if variable.size <= SLOT_SIZE:
+            usage[variable.slot] += variable.size
+            continue
+        # variables bigger than one slot (e.g. static arrays, structs) fill whole slots
+        for slot in range(variable.slot, variable.end_slot):
+            usage[slot] += SLOT_SIZE
+    return dict(sorted(usage.items()))
+
+
+def _format_variables(variables: List[StorageVariable], indent: str) -> List[str]:
+    usage = slot_usage(variables)
+    lines = list()
+    for variable in variables:
+        lines.append(
+            f"{indent}[{variable.slot:>3}:{variable.offset:>2}] "
+            f"{variable.label} ({variable.type}, {variable.size} bytes)"
+        )
+    used = sum(min(u, SLOT_SIZE) for u in usage.values())
+    lines.append(f"{indent}> {len(usage)} slot(s), {used}/{len(usage) * SLOT_SIZE} bytes used")
+    return lines
+
+
+def format_storage_layout(layout: StorageLayout) -> str:
+    """Returns a human-readable description of the layout, including slot packing."""
+    lines = [f"{layout.contract}"]
+    lines.extend(_format_variables(layout.variables, indent="\t"))
+    for struct_name, members in sorted(layout.structs.items()):
+        lines.append(f"\n{struct_name}")
+        lines.extend(_format_variables(members, indent="\t"))
+    return "\n".join(lines)
+
+
+def _diff_variables(
+    scope: str, old: List[StorageVariable], new: List[StorageVariable]
+) -> List[str]:
+    differences = list()
+    old_by_position = {(v.slot, v.offset): v for v in old}
+    new_by_position = {(v.slot, v.offset): v for v in new}
+    for position in sorted(set(old_by_position) | set(new_by_position)):
+        old_variable = old_by_position.get(position)
+        new_variable = new_by_position.get(position)
+        location = f"{scope} slot {position[0]} offset {position[1]}"
+        if old_variable is None:
+            differences.append(f"+ {location}: {new_variable.label} ({new_variable.type})")
+        elif new_variable is None:
+            differences.append(f"- {location}: {old_variable.label} ({old_variable.type})")
+        elif old_variable != new_variable:
+            differences.append(
+                f"~ {location}: {old_variable.label} ({old_variable.type}) -> "
+                f"{new_variable.label} ({new_variable.type})"
+            )
+    return differences
+
+
+def diff_storage_layouts(old: StorageLayout, new: StorageLayout) -> List[str]:
+    """Returns a line per added (+), removed (-) or changed (~) storage position."""
+    differences = _diff_variables(new.contract, old.variables, new.variables)
+    for struct_name in sorted(set(old.structs) | set(new.structs)):
+        differences.extend(
+            _diff_variables(
+                struct_name, old.structs.get(struct_name, []), new.structs.get(struct_name, [])
+            )
+        )
+    return differences
+
+
+#
+# Compatibility
+#
+
+
+def _canonical_type(type_label: str) -> str:
+    """Contracts are stored as addresses and enums as uint8, so they are interchangeable."""
+    type_label = re.sub(r"contract [\w.]+", "address", type_label)
+    return re.sub(r"enum [\w.]+", "uint8", type_label)
+
+
+def _is_gap(variable: StorageVariable) -> bool:
+    return "gap" in variable.label.lower() and variable.type.startswith("uint256[")
+
+
+def _check_variables(
+    scope: str, old: List[StorageVariable], new: List[StorageVariable]
+) -> List[StorageIncompatibility]:
+    issues = list()
+    new_by_position = {(v.slot, v.offset): v for v in new}
+    new_by_label = {v.label: v for v in new}
+
+    # existing variables must keep their position and type; renaming is fine (e.g. stubs)
+    for old_variable in old:
+        if _is_gap(old_variable):
+            new_gap = new_by_label.get(old_variable.label)
+            if new_gap and new_gap.end_slot != old_variable.end_slot:
+                issues.append(
+                    StorageIncompatibility(
+                        scope,
+                        old_variable.slot,
+                        old_variable.offset,
+                        f"gap '{old_variable.label}' must end at slot {old_variable.end_slot}, "
+                        f"now ends at slot {new_gap.end_slot}",
+                    )
+                )
+            continue
+
+        new_variable = new_by_position.get((old_variable.slot, old_variable.offset))
+        moved = new_by_label.get(old_variable.label)
+        if moved and (moved.slot, moved.offset) != (old_variable.slot, old_variable.offset):
+            # also catches swapped variables of the same type
+            reason = f"'{old_variable.label}' moved to slot {moved.slot} offset {moved.offset}"
+            issues.append(
+                StorageIncompatibility(scope, old_variable.slot, old_variable.offset, reason)
+            )
+        elif new_variable is None:
+            reason = f"'{old_variable.label}' ({old_variable.type}) removed"
+            issues.append(
+                StorageIncompatibility(scope, old_variable.slot, old_variable.offset, reason)
+            )
+        elif _canonical_type(old_variable.type) != _canonical_type(new_variable.type):
+            issues.append(
+                StorageIncompatibility(
+                    scope,
+                    old_variable.slot,
+                    old_variable.offset,
+                    f"'{old_variable.label}' type changed from {old_variable.type} "
+                    f"to {new_variable.type}",
+                )
+            )
+
+    # new variables can only use storage that was free or reserved by a gap
+    old_positions = {(v.slot, v.offset) for v in old}
+    old_ranges = [v.byte_range for v in old if not _is_gap(v)]
+    for new_variable in new:
+        if (new_variable.slot, new_variable.offset) in old_positions:
+            continue
+        start, end = new_variable.byte_range
+        if any(start < old_end and old_start < end for old_start, old_end in old_ranges):
+            issues.append(
+                StorageIncompatibility(
+                    scope,
+                    new_variable.slot,
+                    new_variable.offset,
+                    f"'{new_variable.label}' ({new_variable.type}) overlaps existing storage",
+                )
+            )
+    return issues
+
+
+def _struct_slots(members: List[StorageVariable]) -> int:
+    return max((m.end_slot for m in members), default=0)
+
+
+def check_storage_compatibility(
+    old: StorageLayout, new: StorageLayout
+) -> List[StorageIncompatibility]:
+    """
+    Returns the changes from the old to the new layout that would corrupt existing
+    storage when upgrading a proxy: removals, reorderings, type changes, insertions,
+    resized gaps and resized structs that are stored in arrays.
+    """
+    issues = _check_variables(new.contract, old.variables, new.variables)
+    for struct_name, old_members in sorted(old.structs.items()):
+        new_members = new.structs.get(struct_name)
+        if new_members is None:
+            continue  # no longer referenced by the new layout
+        issues.extend(_check_variables(struct_name, old_members, new_members))
+        resized = _struct_slots(old_members) != _struct_slots(new_members)
+        if resized and struct_name in old.array_structs:
+            issues.append(
+                StorageIncompatibility(
+                    struct_name,
+                    0,
+                    0,
+                    f"size changed from {_struct_slots(old_members)} to "
+                    f"{_struct_slots(new_members)} slots, but it is stored in arrays",
+                )
+            )
+    return issues
+
+
+def validate_storage_compatibility(old: StorageLayout, new: StorageLayout) -> None:
+    """Raises IncompatibleStorageLayout if upgrading from old to new is unsafe."""
+    issues = check_storage_compatibility(old=old, new=new)
+    if issues:
+        details = "\n\t".join(str(issue) for issue in issues)
+        raise IncompatibleStorageLayout(
+            f"Storage layout of {new.contract} is incompatible with the deployed one:\n\t{details}"
+        )
+
+
+#
+# Baselines
+#
+
+
+def storage_layout_filepath(chain_id: int, proxy_address: str) -> Path:
+    """Location of the recorded storage layout for the implementation behind a proxy."""
+    return STORAGE_LAYOUTS_DIR / str(chain_id) / f"{proxy_address}.json"
+
+
+def get_storage_layout_baseline(
+    contract_name: str,
+    chain_id: int,
+    proxy_address: str,
+    baseline: Optional[str] = None,
+) -> Optional[StorageLayout]:
+    """
+    Returns the storage layout currently behind the proxy. The baseline can be a path to
+    a dumped layout or a git ref; otherwise the layout recorded at the last upgrade is used.
+    """
+    if baseline:
+        baseline_path = Path(baseline)
+        if baseline_path.exists():
+            return read_storage_layout(baseline_path)
+        return get_storage_layout_at_ref(contract_name=contract_name, ref=baseline)
+
+    recorded_filepath = storage_layout_filepath(chain_id=chain_id, proxy_address=proxy_address)
+    if recorded_filepath.exists():
+        return read_storage_layout(recorded_filepath)
+    return None
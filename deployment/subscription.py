@@ -0,0 +1,64 @@
+from typing import TYPE_CHECKING, NamedTuple
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+
+# as defined in the StandardSubscription contract
+INCREASE_BASE = 10000
+FEE_RATE_PRECISION = 10**27
+
+
+def _compound(factor: int, exponent: int) -> int:
+    """Fixed-point exponentiation by squaring, rounding down like StandardSubscription."""
+    result = FEE_RATE_PRECISION
+    while exponent > 0:
+        if exponent & 1:
+            result = result * factor // FEE_RATE_PRECISION
+        exponent >>= 1
+        if exponent > 0:
+            factor = factor * factor // FEE_RATE_PRECISION
+    return result
+
+
+class StandardSubscriptionFees(NamedTuple):
+    """
+    Fee schedule of a StandardSubscription. Mirrors the contract arithmetic exactly, so fees
+    can be quoted for any period without RPC calls once the parameters are known.
+    """
+
+    initial_base_fee_rate: int
+    base_fee_rate_increase: int
+    encryptor_fee_rate: int
+    max_nodes: int
+    subscription_period_duration: int
+
+    @classmethod
+    def from_contract(cls, subscription: "ContractInstance") -> "StandardSubscriptionFees":
+        """Reads the (immutable) fee parameters of a deployed subscription."""
+        return cls(
+            initial_base_fee_rate=subscription.initialBaseFeeRate(),
+            base_fee_rate_increase=subscription.baseFeeRateIncrease(),
+            encryptor_fee_rate=subscription.encryptorFeeRate(),
+            max_nodes=subscription.maxNodes(),
+            subscription_period_duration=subscription.subscriptionPeriodDuration(),
+        )
+
+    @property
+    def base_fee_growth_factor(self) -> int:
+        return (INCREASE_BASE + self.base_fee_rate_increase) * FEE_RATE_PRECISION // INCREASE_BASE
+
+    def base_fees(self, period_number: int) -> int:
+        growth = _compound(self.base_fee_growth_factor, period_number)
+        initial_base_fees = (
+            self.initial_base_fee_rate * self.subscription_period_duration * self.max_nodes
+        )
+        return initial_base_fees * growth // FEE_RATE_PRECISION
+
+    def encryptor_fees(self, encryptor_slots: int, duration: int) -> int:
+        return self.encryptor_fee_rate * duration * encryptor_slots
+
+    def subscription_fees(self, period_number: int, encryptor_slots: int) -> int:
+        """Fees of paying for the period with the initial encryptor slots."""
+        return self.base_fees(period_number) + self.encryptor_fees(
+            encryptor_slots, self.subscription_period_duration
+        )
@@ -1,23 +1,38 @@
 import json
 import os
 import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
-from typing import Dict, List, Optional, Tuple
+from typing import TYPE_CHECKING, Callable, Dict, List, Optional, Tuple, Type, TypeVar
 
-import requests
-import yaml
-from ape import networks, project
-from ape.contracts import ContractContainer, ContractInstance
-from ape.exceptions import NetworkError
-from ape_etherscan.utils import API_KEY_ENV_KEY_MAP
-from eth_utils import to_checksum_address
-
-from deployment.constants import ARTIFACTS_DIR, MAINNET, PORTER_SAMPLING_ENDPOINTS
+from deployment.constants import ARTIFACTS_DIR, DEPLOYMENT_DIR
+from deployment.contract_cache import cache_contract_type, load_cached_contract_type
 from deployment.networks import is_local_network
 
+# ape, web3, requests and yaml are imported on first use to keep the package import cheap
+if TYPE_CHECKING:
+    from ape.contracts import ContractContainer, ContractInstance
+
+# addresses already verified on block explorers, per chain ID
+VERIFIED_CONTRACTS_FILEPATH = DEPLOYMENT_DIR.parent / ".build" / "verified_contracts.json"
+
+DEFAULT_EXPLORER_RATE_LIMIT = 5  # requests per second
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF = 1.0  # seconds, doubled on each retry
+DEFAULT_TIMEOUT = 30  # seconds
+
+# HTTP responses that are worth retrying
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+T = TypeVar("T")
+
 
 def _load_yaml(filepath: Path) -> dict:
     """Loads a YAML file."""
+    import yaml
+
     with open(filepath, "r") as file:
         return yaml.safe_load(file)
 
@@ -43,6 +58,8 @@ def validate_config(config: Dict) -> Path:
     Checks that the deployment has not already been published for
     the chain_id specified in the params file.
     """
+    from ape import networks
+
     print("Validating parameters YAML...")
 
     deployment = config.get("deployment")
@@ -88,9 +105,11 @@ def check_etherscan_plugin() -> None:
         # unnecessary for local deployment
         return
     try:
-        import ape_etherscan  # noqa: F401
+        from ape_etherscan.utils import API_KEY_ENV_KEY_MAP
     except ImportError:
         raise ImportError("Please install the ape-etherscan plugin to use this script.")
+    from ape import networks
+
     ecosystem_name = networks.provider.network.ecosystem.name
     explorer_envvar = API_KEY_ENV_KEY_MAP.get(ecosystem_name)
     api_key = os.environ.get(explorer_envvar)
@@ -100,6 +119,8 @@ def check_etherscan_plugin() -> None:
 
 def check_infura_plugin() -> None:
     """Checks that the ape-infura plugin is installed."""
+    from ape import networks
+
     if is_local_network():
         return  # unnecessary for local deployment
     if networks.provider.name != "infura":
@@ -120,11 +141,144 @@ def check_infura_plugin() -> None:
         )
 
 
-def verify_contracts(contracts: List[ContractInstance]) -> None:
-    explorer = networks.provider.network.explorer
+class TokenBucket:
+    """Thread-safe token bucket allowing `rate` acquisitions per second on average."""
+
+    def __init__(self, rate: float, capacity: Optional[float] = None):
+        if rate <= 0:
+            raise ValueError("Rate must be positive")
+        self.rate = rate
+        self.capacity = capacity or rate
+        self._tokens = self.capacity
+        self._last_refill = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self) -> None:
+        """Blocks until a token is available."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(
+                    self.capacity, self._tokens + (now - self._last_refill) * self.rate
+                )
+                self._last_refill = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                wait = (1 - self._tokens) / self.rate
+            time.sleep(wait)
+
+
+class RetryableError(Exception):
+    """Raised by requests for failures that are worth retrying."""
+
+
+def call_with_retries(
+    request: Callable[[], T],
+    max_retries: int = DEFAULT_MAX_RETRIES,
+    backoff: float = DEFAULT_BACKOFF,
+    retry_on: Tuple[Type[Exception], ...] = (RetryableError,),
+) -> T:
+    """
+    Calls `request`, retrying failures in `retry_on` with exponential backoff.
+    The last failure is raised once `max_retries` retries are exhausted.
+    """
+    for attempt in range(max_retries + 1):
+        try:
+            return request()
+        except retry_on:
+            if attempt == max_retries:
+                raise
+        time.sleep(backoff * 2**attempt)
+
+
+def _get_explorer_rate_limit(ecosystem: Optional[str] = None) -> float:
+    """Returns the explorer rate limit of the ecosystem, by default the connected one."""
+    from ape import config
+
+    if ecosystem is None:
+        from ape import networks
+
+        ecosystem = networks.provider.network.ecosystem.name
+    explorer_config = getattr(config.get_config("etherscan"), ecosystem, None)
+    return getattr(explorer_config, "rate_limit", DEFAULT_EXPLORER_RATE_LIMIT)
+
+
+def _read_verified_contracts() -> Dict[str, Dict[str, str]]:
+    if not VERIFIED_CONTRACTS_FILEPATH.exists():
+        return dict()
+    return _load_json(VERIFIED_CONTRACTS_FILEPATH)
+
+
+def _record_verified_contracts(chain_id: int, contracts: Dict[str, str]) -> None:
+    verified_contracts = _read_verified_contracts()
+    verified_contracts.setdefault(str(chain_id), dict()).update(contracts)
+    VERIFIED_CONTRACTS_FILEPATH.parent.mkdir(parents=True, exist_ok=True)
+    temp_filepath = VERIFIED_CONTRACTS_FILEPATH.with_suffix(".tmp")
+    temp_filepath.write_text(json.dumps(verified_contracts, indent=4))
+    temp_filepath.replace(VERIFIED_CONTRACTS_FILEPATH)
+
+
+def _publish_contract(address: str) -> None:
+    """
+    Publishes the contract source on the block explorer and waits for the result.
+    Contracts that are already verified are reported as such by the explorer and pass.
+    """
+    from ape import networks
+
+    networks.provider.network.explorer.publish_contract(address)
+
+
+def verify_contracts(contracts: List["ContractInstance"], force: bool = False) -> None:
+    """
+    Verifies contracts on the block explorer. Sources are submitted and their statuses polled
+    concurrently, with submissions paced within the explorer rate limit. Verified addresses are
+    recorded so that repeat runs skip them, unless `force` is set.
+    """
+    from ape import networks
+    from ape_etherscan.exceptions import ContractVerificationError
+
+    chain_id = networks.provider.chain_id
+    verified_contracts = dict() if force else _read_verified_contracts().get(str(chain_id), dict())
+    instances = dict()
     for instance in contracts:
-        print(f"(i) Verifying {instance.contract_type.name}...")
-        explorer.publish_contract(instance.address)
+        name = instance.contract_type.name
+        if instance.address in verified_contracts:
+            print(f"(i) {name} at {instance.address} is already verified; skipping")
+            continue
+        instances[instance.address] = name
+
+    if not instances:
+        return
+
+    bucket = TokenBucket(rate=_get_explorer_rate_limit())
+
+    def verify(address: str) -> None:
+        bucket.acquire()
+        print(f"(i) Verifying {instances[address]}...")
+        _publish_contract(address)
+
+    failures = dict()
+    verified = dict()
+    with ThreadPoolExecutor(max_workers=int(bucket.capacity)) as executor:
+        futures = {address: executor.submit(verify, address) for address in instances}
+        for address, future in futures.items():
+            try:
+                future.result()
+            except Exception as e:
+                failures[address] = e
+                continue
+            print(f"(i) Verified {instances[address]} at {address}")
+            verified[address] = instances[address]
+
+    if verified:
+        _record_verified_contracts(chain_id=chain_id, contracts=verified)
+
+    if failures:
+        details = "\n\t".join(
+            f"{instances[address]} at {address}: {e}" for address, e in failures.items()
+        )
+        raise ContractVerificationError(f"Verification failed for:\n\t{details}")
 
 
 def check_plugins() -> None:
@@ -133,7 +287,9 @@ def check_plugins() -> None:
     check_infura_plugin()
 
 
-def _get_dependency_contract_container(contract: str) -> ContractContainer:
+def _get_dependency_contract_container(contract: str) -> "ContractContainer":
+    from ape import project
+
     for dependency_name, dependency_versions in project.dependencies.items():
         if len(dependency_versions) > 1:
             raise ValueError(f"Ambiguous {dependency_name} dependency for {contract}")
@@ -146,13 +302,23 @@ def _get_dependency_contract_container(contract: str) -> ContractContainer:
     raise ValueError(f"No contract found with name '{contract}'.")
 
 
-def get_contract_container(contract: str) -> ContractContainer:
+def get_contract_container(contract: str) -> "ContractContainer":
+    from ape.contracts import ContractContainer
+
+    # avoids loading the project when sources and compiler settings are unchanged
+    contract_type = load_cached_contract_type(contract)
+    if contract_type is not None:
+        return ContractContainer(contract_type)
+
+    from ape import project
+
     try:
         contract_container = getattr(project, contract)
     except AttributeError:
         # not in root project; check dependencies
         contract_container = _get_dependency_contract_container(contract)
 
+    cache_contract_type(contract, contract_container.contract_type)
     return contract_container
 
 
@@ -166,6 +332,9 @@ def registry_filepath_from_domain(domain: str) -> Path:
 
 def get_chain_name(chain_id: int) -> str:
     """Returns the name of the chain given its chain ID."""
+    from ape import networks
+    from ape.exceptions import NetworkError
+
     for ecosystem_name, ecosystem in networks.ecosystems.items():
         for network_name, network in ecosystem.networks.items():
             try:
@@ -184,37 +353,15 @@ def sample_nodes(
     min_version: Optional[str] = None,
     excluded_nodes: Optional[List[str]] = None,
 ):
-    porter_endpoint = PORTER_SAMPLING_ENDPOINTS.get(domain)
-    if not porter_endpoint:
-        raise ValueError(f"Porter endpoint not found for domain '{domain}'")
-
-    params = {
-        "quantity": num_nodes,
-    }
-    if duration:
-        params["duration"] = duration
-    if random_seed:
-        if domain != MAINNET:
-            raise ValueError("'random_seed' is only a valid parameter for mainnet")
-        params["random_seed"] = random_seed
-    if min_version:
-        params["min_version"] = min_version
-    if excluded_nodes:
-        nodes = [to_checksum_address(node) for node in excluded_nodes]
-        params["exclude_ursulas"] = ",".join(nodes)
-
-    response = requests.get(porter_endpoint, params=params)
-    response.raise_for_status()
-
-    data = response.json()
-    ursulas = data["result"]["ursulas"]
-    if domain != MAINNET:
-        # /get_ursulas is used for sampling (instead of /bucket_sampling)
-        #  so the json returned is slightly different
-        ursulas = [u["checksum_address"] for u in ursulas]
-
-    result = sorted(ursulas, key=lambda x: x.lower())
-    return result
+    from deployment.porter import get_porter_client
+
+    return get_porter_client(domain).get_ursulas(
+        quantity=num_nodes,
+        random_seed=random_seed,
+        duration=duration,
+        min_version=min_version,
+        exclude_ursulas=excluded_nodes,
+    )
 
 
 def _generate_heartbeat_cohorts(addresses: List[str]) -> Tuple[Tuple[str, ...], ...]:
@@ -247,8 +394,10 @@ def _generate_heartbeat_cohorts(addresses: List[str]) -> Tuple[Tuple[str, ...],
 
 
 def get_heartbeat_cohorts(
-    taco_application: ContractContainer, excluded_nodes: Optional[List[str]] = []
+    taco_application: "ContractContainer", excluded_nodes: Optional[List[str]] = []
 ) -> Tuple[Tuple[str, ...], ...]:
+    from eth_utils import to_checksum_address
+
     active_stakes_data = taco_application.getActiveStakingProviders(
         0,  # start index
         1000,  # max number of staking providers
@@ -0,0 +1,73 @@
+from typing import TYPE_CHECKING, List, Optional, Tuple
+
+from deployment.events import DEFAULT_BLOCK_WINDOW, get_logs
+
+if TYPE_CHECKING:
+    from ape.contracts import ContractInstance
+
+QUEUE_EVENTS = ("UpdateQueued", "UpdatesFlushed")
+
+
+class QueueMismatch(Exception):
+    """The collected updates don't reproduce the queue hash of the PolygonRoot."""
+
+
+def updates_hash(previous_hash: bytes, updates: List[bytes]) -> bytes:
+    """Extends the hash chain over queued updates, as PolygonRoot does."""
+    from eth_utils import keccak
+
+    for update in updates:
+        previous_hash = keccak(bytes(previous_hash) + keccak(bytes(update)))
+    return previous_hash
+
+
+def get_flush_batches(
+    updates: List[bytes], max_batch_size: int
+) -> List[Tuple[List[bytes], List[bytes]]]:
+    """
+    Splits queued updates into arguments of consecutive `PolygonRoot.flush` calls: each batch
+    of at most `max_batch_size` updates and the hashes of the updates that remain queued after it.
+    """
+    from eth_utils import keccak
+
+    hashes = [keccak(bytes(update)) for update in updates]
+    return [
+        (updates[start : start + max_batch_size], hashes[start + max_batch_size :])
+        for start in range(0, len(updates), max_batch_size)
+    ]
+
+
+def get_queued_updates(
+    polygon_root: "ContractInstance",
+    from_block: int,
+    to_block: Optional[int] = None,
+    block_window: int = DEFAULT_BLOCK_WINDOW,
+) -> List[bytes]:
+    """
+    Returns the updates queued in the PolygonRoot and not flushed yet, in order.
+    `from_block` must not be later than the first unflushed update.
+    """
+    from ape import chain
+
+    if to_block is None:
+        to_block = chain.blocks.head.number
+    logs = get_logs(
+        contract=polygon_root,
+        event_names=QUEUE_EVENTS,
+        from_block=from_block,
+        to_block=to_block,
+        block_window=block_window,
+    )
+    updates = []
+    for log in logs:
+        if log.event_name == "UpdatesFlushed":
+            updates.clear()
+        else:
+            updates.append(bytes(log.update))
+
+    queued_hash = polygon_root.queuedUpdatesHash()
+    if updates_hash(polygon_root.flushedUpdatesHash(), updates) != bytes(queued_hash):
+        raise QueueMismatch(
+            f"Updates since block {from_block} don't match the queue, try an earlier block"
+        )
+    return updates
@@ -11,8 +11,8 @@ from deployment.types import ChecksumAddress
 from deployment.utils import check_plugins
 
 
-def validate_handover_data(coordinator, ritual_id, departing_provider):
-    """Validate the handover data for the ritual."""
+def validate_handover_data(coordinator, ritual_id, departing_provider) -> bytes:
+    """Validate the handover data for the ritual and return the new aggregated transcript."""
     handover_key = coordinator.getHandoverKey(ritual_id, departing_provider)
     handover = coordinator.handovers(handover_key)
     assert (
@@ -55,6 +55,7 @@ def validate_handover_data(coordinator, ritual_id, departing_provider):
     assert (
         AggregatedTranscript.from_bytes(transcript) is not None
     ), "New aggregate transcript should be valid"
+    return bytes(new_aggregate_transcript)
 
 
 @click.command(cls=ConnectedProviderCommand, name="finalize-handover")
@@ -102,7 +103,9 @@ def cli(
         f"Validating handover data for ritual {ritual_id} "
         f"and departing provider {departing_provider}..."
     )
-    validate_handover_data(coordinator_contract, ritual_id, departing_provider)
+    new_aggregate_transcript = validate_handover_data(
+        coordinator_contract, ritual_id, departing_provider
+    )
     click.echo("Handover data validated successfully.")
 
     # Finalize the handover
@@ -114,6 +117,7 @@ def cli(
         coordinator_contract.finalizeHandover,
         ritual_id,
         departing_provider,
+        new_aggregate_transcript,
     )
 
 
@@ -0,0 +1,64 @@
+#!/usr/bin/python3
+
+import click
+from ape.cli import ConnectedProviderCommand, account_option, network_option
+
+from deployment import registry
+from deployment.constants import SUPPORTED_TACO_DOMAINS
+from deployment.params import Transactor
+from deployment.utils import check_plugins
+from deployment.xchain import DEFAULT_BLOCK_WINDOW, get_flush_batches, get_queued_updates
+
+
+@click.command(cls=ConnectedProviderCommand, name="flush-child-updates")
+@account_option()
+@network_option(required=True)
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option(
+    "--from-block",
+    help="Block from which queued updates are searched; usually the block of the last flush",
+    type=int,
+    required=True,
+)
+@click.option(
+    "--block-window",
+    help="Maximum number of blocks per eth_getLogs request",
+    type=int,
+    default=DEFAULT_BLOCK_WINDOW,
+    show_default=True,
+)
+@click.option(
+    "--auto",
+    help="Automatically sign transactions.",
+    is_flag=True,
+)
+def cli(domain, account, network, from_block, block_window, auto):
+    """Send stake and operator updates queued in the PolygonRoot to the child in batches."""
+
+    # Setup
+    check_plugins()
+    click.echo(f"Connected to {network.name} network.")
+
+    polygon_root = registry.get_contract(domain=domain, contract_name="PolygonRoot")
+    updates = get_queued_updates(
+        polygon_root=polygon_root, from_block=from_block, block_window=block_window
+    )
+    if not updates:
+        click.echo("No queued updates.")
+        return
+
+    batches = get_flush_batches(updates=updates, max_batch_size=polygon_root.maxBatchSize())
+    click.echo(f"Flushing {len(updates)} queued updates in {len(batches)} batches...")
+    transactor = Transactor(account=account, autosign=auto)
+    for batch, remaining_update_hashes in batches:
+        transactor.transact(polygon_root.flush, batch, remaining_update_hashes)
+
+
+if __name__ == "__main__":
+    cli()
@@ -1,8 +1,6 @@
 #!/usr/bin/python3
 import json
 import os
-import time
-from contextlib import suppress
 
 import click
 from ape import Contract, chain
@@ -14,7 +12,9 @@ from deployment.constants import (
     HEARTBEAT_ARTIFACT_FILENAME,
     SUPPORTED_TACO_DOMAINS,
 )
-from deployment.params import Transactor
+from deployment.fees import FeeStrategy
+from deployment.options import fee_strategy_option
+from deployment.params import TransactionResult, Transactor
 from deployment.types import ChecksumAddress, MinInt
 from deployment.utils import check_plugins, get_heartbeat_cohorts, sample_nodes
 
@@ -100,6 +100,7 @@ from deployment.utils import check_plugins, get_heartbeat_cohorts, sample_nodes
     help="Initiate rituals for all nodes in the network.",
     is_flag=True,
 )
+@fee_strategy_option
 def cli(
     domain,
     account,
@@ -115,6 +116,7 @@ def cli(
     min_version,
     auto,
     heartbeat,
+    fee_strategy,
 ):
     """Initiate a ritual for a TACo domain."""
 
@@ -224,36 +226,53 @@ def cli(
             )
         cohorts = [cohort]
 
-    rituals = {}
-    for cohort in cohorts:
-        # TODO: Failure recovery? (not enough funds, outages, etc.)
-        # Initiate the ritual(s)
-        transactor = Transactor(account=account, autosign=auto)
-        try:
-            result = transactor.transact(
-                coordinator_contract.initiateRitual,
+    transactor = Transactor(
+        account=account,
+        autosign=auto,
+        fee_strategy=FeeStrategy.from_provider() if fee_strategy else None,
+    )
+    calls = [
+        (
+            coordinator_contract.initiateRitual,
+            (
                 fee_model_contract.address,
                 cohort,
                 authority,
                 duration,
                 access_controller_contract.address,
-            )
+            ),
+        )
+        for cohort in cohorts
+    ]
+    if len(calls) == 1:
+        try:
+            receipt = transactor.transact(calls[0][0], *calls[0][1])
         except Exception as e:
             raise click.ClickException(f"Failed to initiate ritual.\n{e}")
+        results = [TransactionResult(*calls[0], receipt=receipt)]
+    else:
+        # all rituals are submitted at once and their receipts awaited concurrently
+        results = transactor.transact_many(calls)
 
-        ritual_id = result.events[0].ritualId
+    rituals = {}
+    failed = []
+    for cohort, result in zip(cohorts, results):
+        if result.failed:
+            failed.append(str(result.error or result.receipt.txn_hash))
+            continue
+        ritual_id = result.receipt.events[0].ritualId
         rituals[ritual_id] = cohort
-        time.sleep(1)  # chill for a sec
 
     # Save the ritual data
     if heartbeat:
-        # remove the file if it exists
-        with suppress(OSError):
-            os.remove(HEARTBEAT_ARTIFACT_FILENAME)
-        json.dumps(rituals, indent=4)
         with open(HEARTBEAT_ARTIFACT_FILENAME, "w") as f:
             f.write(json.dumps(rituals, indent=4))
 
+    if failed:
+        raise click.ClickException(
+            f"Failed to initiate {len(failed)} ritual(s):\n\t" + "\n\t".join(failed)
+        )
+
 
 if __name__ == "__main__":
     cli()
@@ -23,5 +23,9 @@ def main():
         filepath=LYNX_REGISTRY_FILEPATH, chain_id=networks.active_provider.chain_id
     )
     mock_polygon_root = deployments[project.MockPolygonRoot.contract_type.name]
-    for _, operator in LYNX_NODES.items():
-        transactor.transact(mock_polygon_root.confirmOperatorAddress, operator)
+    transactor.transact_all(
+        [
+            (mock_polygon_root.confirmOperatorAddress, (operator,))
+            for operator in LYNX_NODES.values()
+        ]
+    )
@@ -14,6 +14,10 @@ LYNX_REGISTRY = ARTIFACTS_DIR / "lynx.json"
 def main():
     """
     This script upgrades Coordinator on Lynx/Amoy.
+
+    TACoChildApplication must be upgraded first: Coordinator reports activated rituals
+    to it with `addRitualParticipants`, so DKG can't complete against an older
+    child application.
     """
 
     deployer = Deployer.from_yaml(filepath=CONSTRUCTOR_PARAMS_FILEPATH, verify=VERIFY)
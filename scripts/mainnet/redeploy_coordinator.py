@@ -12,7 +12,9 @@ CONSTRUCTOR_PARAMS_FILEPATH = CONSTRUCTOR_PARAMS_DIR / "mainnet" / "redeploy-coo
 def main():
     deployer = Deployer.from_yaml(filepath=CONSTRUCTOR_PARAMS_FILEPATH, verify=VERIFY)
 
-    # NuCo Multisig owns contract so it must do the proxy upgrade
+    # NuCo Multisig owns contract so it must do the proxy upgrade;
+    # TACoChildApplication must be upgraded first, since Coordinator reports activated
+    # rituals to it with `addRitualParticipants`
     coordinator_implementation = deployer.deploy(project.Coordinator)
 
     # TODO Careful with contract registry since address should be the proxy address,
@@ -13,6 +13,7 @@ from deployment.options import (
     subscription_contract_option,
 )
 from deployment.params import Transactor
+from deployment.subscription import StandardSubscriptionFees
 from deployment.utils import check_plugins
 
 
@@ -145,5 +146,27 @@ def remove_encryptors(account, network, domain, ritual_id, encryptors):
     transactor.transact(access_controller.authorize, ritual_id, encryptors)
 
 
+@cli.command(cls=ConnectedProviderCommand)
+@network_option(required=True)
+@subscription_contract_option
+@encryptor_slots_option
+@click.option(
+    "--periods",
+    default=12,
+    show_default=True,
+    help="Number of subscription billing periods to quote.",
+)
+def quote_fees(network, subscription_contract, encryptor_slots, periods):
+    """Quote the subscription fees of the next billing periods."""
+    click.echo(f"Connected to {network.name} network.")
+    subscription_contract = Contract(address=subscription_contract)
+    # fee parameters are immutable; all periods are quoted from a single read
+    fees = StandardSubscriptionFees.from_contract(subscription_contract)
+    current_period = subscription_contract.getCurrentPeriodNumber()
+    for period in range(current_period, current_period + periods):
+        total_fees = fees.subscription_fees(period_number=period, encryptor_slots=encryptor_slots)
+        click.echo(f"Period #{period}: {total_fees}")
+
+
 if __name__ == "__main__":
     cli()
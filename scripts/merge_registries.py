@@ -2,7 +2,7 @@
 from pathlib import Path
 
 import click
-from deployment.registry import merge_registries
+from deployment.registry import MergeRule, merge_registries
 
 
 @click.command()
@@ -23,7 +23,7 @@ from deployment.registry import merge_registries
     "-o",
     help="Filepath of output registry file",
     type=click.Path(dir_okay=False, exists=False, path_type=Path),
-    required=True,
+    required=False,
 )
 @click.option(
     "--deprecated-contract",
@@ -33,11 +33,36 @@ from deployment.registry import merge_registries
     required=False,
     multiple=True,
 )
-def cli(registry_1, registry_2, output_registry, deprecated_contracts):
+@click.option(
+    "--rule",
+    help="How to resolve conflicting entries for the same contract and chain",
+    type=click.Choice([rule.value for rule in MergeRule]),
+    default=MergeRule.INTERACTIVE.value,
+    show_default=True,
+)
+@click.option(
+    "--check",
+    help="Only validate that the registries can be merged; nothing is written but the diff",
+    is_flag=True,
+    default=False,
+)
+@click.option(
+    "--diff",
+    "diff_filepath",
+    help="Filepath to write the machine-readable (JSON) merge diff to",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+)
+def cli(registry_1, registry_2, output_registry, deprecated_contracts, rule, check, diff_filepath):
     """Merge two registry entries into one."""
+    if not check and not output_registry:
+        raise click.BadOptionUsage("--output-registry", "Output registry required unless --check")
     merge_registries(
         registry_1_filepath=registry_1,
         registry_2_filepath=registry_2,
         output_filepath=output_registry,
         deprecated_contracts=deprecated_contracts,
+        rule=MergeRule(rule),
+        check=check,
+        diff_filepath=diff_filepath,
     )
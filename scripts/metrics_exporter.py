@@ -0,0 +1,70 @@
+import click
+from ape import chain, networks
+from ape.cli import ConnectedProviderCommand, network_option
+
+from deployment.constants import SUPPORTED_TACO_DOMAINS
+from deployment.metrics import (
+    DEFAULT_PORT,
+    DEFAULT_SCRAPE_INTERVAL,
+    MetricsCollector,
+    serve_metrics,
+)
+from deployment.multicall import MULTICALL3_ADDRESS, Multicall
+from deployment.registry import contracts_from_registry
+from deployment.ritual_monitor import RitualMonitor
+from deployment.utils import registry_filepath_from_domain
+
+
+@click.command(cls=ConnectedProviderCommand)
+@network_option(required=True)
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option("--port", "-p", type=int, default=DEFAULT_PORT, show_default=True)
+@click.option(
+    "--interval",
+    help="Seconds between metric collections",
+    type=float,
+    default=DEFAULT_SCRAPE_INTERVAL,
+    show_default=True,
+)
+@click.option(
+    "--from-block",
+    help="Block to start following ritual events from; defaults to the current block",
+    type=int,
+    required=False,
+)
+@click.option(
+    "--multicall-address",
+    help="Address of the Multicall3 contract",
+    default=MULTICALL3_ADDRESS,
+    show_default=True,
+)
+def cli(network, domain, port, interval, from_block, multicall_address):
+    """Expose coordination metrics in the Prometheus text format."""
+    registry_filepath = registry_filepath_from_domain(domain=domain)
+    contracts = contracts_from_registry(
+        registry_filepath, chain_id=networks.active_provider.chain_id
+    )
+
+    ritual_monitor = None
+    if "Coordinator" in contracts:
+        ritual_monitor = RitualMonitor(
+            coordinator=contracts["Coordinator"],
+            from_block=chain.blocks.head.number if from_block is None else from_block,
+            on_transition=lambda ritual, previous_state: None,
+        )
+    collector = MetricsCollector(
+        contracts=contracts,
+        multicall=Multicall.from_provider(address=multicall_address),
+        ritual_monitor=ritual_monitor,
+    )
+    serve_metrics(collector=collector, port=port, interval=interval)
+
+
+if __name__ == "__main__":
+    cli()
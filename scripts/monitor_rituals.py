@@ -0,0 +1,71 @@
+import click
+from ape import chain, networks
+from ape.cli import ConnectedProviderCommand, network_option
+
+from deployment.constants import SUPPORTED_TACO_DOMAINS
+from deployment.registry import contracts_from_registry
+from deployment.ritual_monitor import DEFAULT_BLOCK_WINDOW, DEFAULT_POLL_INTERVAL, RitualMonitor
+from deployment.utils import registry_filepath_from_domain
+
+
+@click.command(cls=ConnectedProviderCommand)
+@network_option(required=True)
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option(
+    "--ritual-id",
+    "-r",
+    "ritual_ids",
+    help="Ritual ID to monitor; all rituals are monitored if not specified",
+    type=int,
+    multiple=True,
+)
+@click.option(
+    "--from-block",
+    help="Block to start monitoring from; defaults to the current block",
+    type=int,
+    required=False,
+)
+@click.option(
+    "--block-window",
+    help="Maximum number of blocks per eth_getLogs request",
+    type=int,
+    default=DEFAULT_BLOCK_WINDOW,
+    show_default=True,
+)
+@click.option(
+    "--poll-interval",
+    help="Seconds between polls",
+    type=float,
+    default=DEFAULT_POLL_INTERVAL,
+    show_default=True,
+)
+def cli(network, domain, ritual_ids, from_block, block_window, poll_interval):
+    """Monitor ritual lifecycles from Coordinator events."""
+    registry_filepath = registry_filepath_from_domain(domain=domain)
+    contracts = contracts_from_registry(
+        registry_filepath, chain_id=networks.active_provider.chain_id
+    )
+    if from_block is None:
+        from_block = chain.blocks.head.number
+
+    monitor = RitualMonitor(
+        coordinator=contracts["Coordinator"],
+        from_block=from_block,
+        ritual_ids=ritual_ids,
+        block_window=block_window,
+    )
+    print(f"Monitoring rituals on {network.name} from block {from_block}...")
+    try:
+        monitor.run(poll_interval=poll_interval)
+    except KeyboardInterrupt:
+        print(f"\nStopped at block {monitor.next_block}.")
+
+
+if __name__ == "__main__":
+    cli()
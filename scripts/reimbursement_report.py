@@ -0,0 +1,60 @@
+import click
+from ape import networks
+from ape.cli import ConnectedProviderCommand, network_option
+
+from deployment.constants import SUPPORTED_TACO_DOMAINS
+from deployment.multicall import Multicall
+from deployment.registry import contracts_from_registry
+from deployment.reimbursements import (
+    DEFAULT_BLOCK_WINDOW,
+    format_accrued_reimbursements,
+    get_accrued_reimbursements,
+)
+from deployment.utils import registry_filepath_from_domain
+
+
+@click.command(cls=ConnectedProviderCommand)
+@network_option(required=True)
+@click.option(
+    "--domain",
+    "-d",
+    help="TACo domain",
+    type=click.Choice(SUPPORTED_TACO_DOMAINS),
+    required=True,
+)
+@click.option(
+    "--from-block",
+    help="Block from which accruals are searched; usually the block accrual mode was enabled",
+    type=int,
+    required=True,
+)
+@click.option(
+    "--block-window",
+    help="Maximum number of blocks per eth_getLogs request",
+    type=int,
+    default=DEFAULT_BLOCK_WINDOW,
+    show_default=True,
+)
+def cli(network, domain, from_block, block_window):
+    """Report refunds accrued per operator in the ReimbursementPool and not claimed yet."""
+    registry_filepath = registry_filepath_from_domain(domain=domain)
+    contracts = contracts_from_registry(
+        registry_filepath, chain_id=networks.active_provider.chain_id
+    )
+    reimbursement_pool = contracts["ReimbursementPool"]
+    accruals = get_accrued_reimbursements(
+        reimbursement_pool=reimbursement_pool,
+        from_block=from_block,
+        application=contracts.get("TACoChildApplication"),
+        multicall=Multicall.from_provider(),
+        block_window=block_window,
+    )
+    print(f"Outstanding ReimbursementPool accruals on {network.name}:")
+    print(format_accrued_reimbursements(accruals))
+    pool_balance = networks.provider.get_balance(reimbursement_pool.address)
+    print(f"\nPool balance: {pool_balance / 10**18:.6f} ETH")
+    print(f"Reserved for accruals: {reimbursement_pool.totalAccrued() / 10**18:.6f} ETH")
+
+
+if __name__ == "__main__":
+    cli()
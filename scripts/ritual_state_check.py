@@ -2,7 +2,7 @@ import time
 from datetime import datetime
 
 import click
-from ape import networks, project
+from ape import networks
 from ape.cli import ConnectedProviderCommand, network_option
 
 from deployment.constants import SUPPORTED_TACO_DOMAINS, RitualState
@@ -79,10 +79,9 @@ def cli(network, domain, ritual_id, realtime):
         registry_filepath, chain_id=networks.active_provider.chain_id
     )
 
-    taco_child_application = project.TACoChildApplication.at(
-        contracts["TACoChildApplication"].address
-    )
-    coordinator = project.Coordinator.at(contracts["Coordinator"].address)
+    # registry instances come from the cached contract types, no project loading needed
+    taco_child_application = contracts["TACoChildApplication"]
+    coordinator = contracts["Coordinator"]
     try:
         ritual = coordinator.rituals(ritual_id)
     except Exception:
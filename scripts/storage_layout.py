@@ -0,0 +1,83 @@
+#!/usr/bin/python3
+from pathlib import Path
+
+import click
+
+from deployment.storage_layout import (
+    check_storage_compatibility,
+    diff_storage_layouts,
+    format_storage_layout,
+    get_storage_layout,
+    get_storage_layout_at_ref,
+    read_storage_layout,
+    write_storage_layout,
+)
+
+
+@click.command()
+@click.option(
+    "--contract-name",
+    "-c",
+    help="Name of the contract to inspect",
+    type=str,
+    default="Coordinator",
+    show_default=True,
+)
+@click.option(
+    "--output",
+    "-o",
+    help="Filepath to dump the storage layout to",
+    type=click.Path(dir_okay=False, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--compare",
+    help="Filepath of a previously dumped storage layout to diff against",
+    type=click.Path(dir_okay=False, exists=True, path_type=Path),
+    required=False,
+)
+@click.option(
+    "--git-ref",
+    help="Git ref (e.g. a release tag) of the previous implementation to diff against",
+    type=str,
+    required=False,
+)
+def cli(contract_name, output, compare, git_ref):
+    """Audit the storage layout of a contract and optionally diff it across upgrades."""
+    if compare and git_ref:
+        raise click.BadOptionUsage("--git-ref", "Use either --compare or --git-ref")
+
+    layout = get_storage_layout(contract_name)
+    print(format_storage_layout(layout))
+
+    if output:
+        write_storage_layout(layout=layout, filepath=output)
+        print(f"\n(i) Storage layout written to {output}")
+
+    if compare:
+        previous_layout, baseline = read_storage_layout(compare), compare
+    elif git_ref:
+        previous_layout, baseline = get_storage_layout_at_ref(contract_name, git_ref), git_ref
+    else:
+        return
+
+    differences = diff_storage_layouts(old=previous_layout, new=layout)
+    if not differences:
+        print(f"\n(i) No storage layout differences with {baseline}")
+        return
+    print(f"\nStorage layout differences with {baseline}:")
+    for difference in differences:
+        print(f"\t{difference}")
+
+    issues = check_storage_compatibility(old=previous_layout, new=layout)
+    if not issues:
+        print("\n(i) Storage layout is upgrade-compatible")
+        return
+    print("\n(!) Storage layout is NOT upgrade-compatible:")
+    for issue in issues:
+        print(f"\t{issue}")
+    raise click.Abort()
+
+
+if __name__ == "__main__":
+    cli()
@@ -23,25 +23,39 @@ def configure_sepolia_root(transactor: Transactor) -> int:
         threshold_staking_contract = deployments[project.TestnetThresholdStaking.contract_type.name]
 
         min_stake_size = taco_application_contract.minimumAuthorization()
-        for staking_provider, operator in TAPIR_NODES.items():
-            # staking
-            transactor.transact(
-                threshold_staking_contract.setRoles,
-                staking_provider,
-                transactor.get_account().address,
-                staking_provider,
-                staking_provider,
-            )
-
-            transactor.transact(
-                threshold_staking_contract.authorizationIncreased,
-                staking_provider,
-                0,
-                min_stake_size,
-            )
-
-            # bonding
-            transactor.transact(taco_application_contract.bondOperator, staking_provider, operator)
+        # staking; each step depends on the previous one,
+        # but is independent across staking providers
+        staking_providers = list(TAPIR_NODES.items())
+        transactor.transact_all(
+            [
+                (
+                    threshold_staking_contract.setRoles,
+                    (
+                        staking_provider,
+                        transactor.get_account().address,
+                        staking_provider,
+                        staking_provider,
+                    ),
+                )
+                for staking_provider, _ in staking_providers
+            ],
+        )
+        transactor.transact_all(
+            [
+                (
+                    threshold_staking_contract.authorizationIncreased,
+                    (staking_provider, 0, min_stake_size),
+                )
+                for staking_provider, _ in staking_providers
+            ],
+        )
+        # bonding
+        transactor.transact_all(
+            [
+                (taco_application_contract.bondOperator, (staking_provider, operator))
+                for staking_provider, operator in staking_providers
+            ],
+        )
 
     return min_stake_size
 
@@ -57,16 +71,20 @@ def configure_amoy_root(transactor: Transactor, stake_size: int):
 
         mock_taco_application_contract = deployments[project.MockPolygonChild.contract_type.name]
 
-        for staking_provider, operator in TAPIR_NODES.items():
-            # staking
-            transactor.transact(
-                mock_taco_application_contract.updateAuthorization, staking_provider, stake_size
-            )
-
-            # bonding
-            transactor.transact(
-                mock_taco_application_contract.updateOperator, staking_provider, operator
-            )
+        # staking
+        transactor.transact_all(
+            [
+                (mock_taco_application_contract.updateAuthorization, (staking_provider, stake_size))
+                for staking_provider in TAPIR_NODES
+            ],
+        )
+        # bonding
+        transactor.transact_all(
+            [
+                (mock_taco_application_contract.updateOperator, (staking_provider, operator))
+                for staking_provider, operator in TAPIR_NODES.items()
+            ],
+        )
 
 
 def main():
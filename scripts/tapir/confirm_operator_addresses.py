@@ -21,5 +21,9 @@ def main():
         filepath=REGISTRY_FILEPATH, chain_id=networks.active_provider.chain_id
     )
     mock_polygon_root = deployments[project.MockPolygonRoot.contract_type.name]
-    for _, operator in TAPIR_NODES.items():
-        transactor.transact(mock_polygon_root.confirmOperatorAddress, operator)
+    transactor.transact_all(
+        [
+            (mock_polygon_root.confirmOperatorAddress, (operator,))
+            for operator in TAPIR_NODES.values()
+        ]
+    )
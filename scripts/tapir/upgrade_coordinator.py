@@ -14,6 +14,10 @@ TAPIR_REGISTRY_FILEPATH = ARTIFACTS_DIR / "tapir.json"
 def main():
     """
     This script upgrades Coordinator on Tapir/Amoy.
+
+    TACoChildApplication must be upgraded first: Coordinator reports activated rituals
+    to it with `addRitualParticipants`, so DKG can't complete against an older
+    child application.
     """
 
     deployer = Deployer.from_yaml(filepath=CONSTRUCTOR_PARAMS_FILEPATH, verify=VERIFY)
@@ -13,14 +13,21 @@ CONSTRUCTOR_PARAMS_FILEPATH = CONSTRUCTOR_PARAMS_DIR / "tapir" / "upgrade-taco-c
 def main():
     """
     This script upgrades TACoChildApplication contract for Tapir on Polygon Amoy.
+
+    Upgrade it before Coordinator. The upgrade blocks release of participants
+    of the existing blocking rituals with `initializeBlockedProviders`.
     """
 
     deployer = Deployer.from_yaml(filepath=CONSTRUCTOR_PARAMS_FILEPATH, verify=VERIFY)
     instances = contracts_from_registry(filepath=ARTIFACTS_DIR / "tapir.json", chain_id=80002)
 
-    taco_child_application = deployer.upgrade(
-        project.TACoChildApplication,
+    implementation = deployer.deploy(project.TACoChildApplication)
+    # latest reinitializer function used for most recent upgrade - reinitializer(4)
+    encoded_initializer_function = implementation.initializeBlockedProviders.encode_input()
+    taco_child_application = deployer.upgradeTo(
+        implementation,
         instances[project.TACoChildApplication.contract_type.name].address,
+        encoded_initializer_function,
     )
 
     deployments = [
@@ -34,7 +34,12 @@ from deployment.utils import get_contract_container, registry_filepath_from_doma
     help="Registry filepath if the contract is not part of a common domain registry",
     required=False,
 )
-def cli(network, domain, contract_names, registry_filepath):
+@click.option(
+    "--force",
+    help="Verify contracts even if they were already verified in a previous run",
+    is_flag=True,
+)
+def cli(network, domain, contract_names, registry_filepath, force):
     """Verify a deployed contract."""
     if not (bool(registry_filepath) ^ bool(domain)):
         raise click.BadOptionUsage(
@@ -71,7 +76,7 @@ def cli(network, domain, contract_names, registry_filepath):
 
         contract_instances.append(contract_instance)
 
-    verify_contracts(contract_instances)
+    verify_contracts(contract_instances, force=force)
 
 
 if __name__ == "__main__":
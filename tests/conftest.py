@@ -1,5 +1,9 @@
+import json
 import os
+import threading
 from enum import IntEnum
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
 
 import pytest
 from ape import project
@@ -84,3 +88,143 @@ def account1(accounts):
 @pytest.fixture
 def account2(accounts):
     return accounts[2]
+
+
+# Coordinator with a flat rate fee model, for tests that define `nodes`, `initiator`,
+# `deployer` and `fee_manager`
+DKG_TIMEOUT = 1000
+HANDOVER_TIMEOUT = 2000
+FEE_RATE = 42
+ERC20_SUPPLY = 10**24
+
+
+def deploy_application(application_type, deployer, nodes):
+    contract = application_type.deploy(sender=deployer)
+    for n in nodes:
+        contract.updateOperator(n, n, sender=deployer)
+        contract.updateAuthorization(n, 42, sender=deployer)
+    return contract
+
+
+def deploy_coordinator(deployer, application, oz_dependency, max_dkg_size, contract_type=None):
+    admin = deployer
+    contract_type = contract_type or project.Coordinator
+    contract = contract_type.deploy(
+        application.address,
+        DKG_TIMEOUT,
+        HANDOVER_TIMEOUT,
+        sender=deployer,
+    )
+
+    encoded_initializer_function = contract.initialize.encode_input(max_dkg_size, admin)
+    proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
+        contract.address,
+        deployer,
+        encoded_initializer_function,
+        sender=deployer,
+    )
+    proxy_contract = contract_type.at(proxy.address)
+    return proxy_contract
+
+
+def deploy_fee_model(deployer, coordinator, erc20, fee_manager):
+    contract = project.FlatRateFeeModel.deploy(
+        coordinator.address, erc20.address, FEE_RATE, sender=deployer
+    )
+    coordinator.grantRole(coordinator.FEE_MODEL_MANAGER_ROLE(), fee_manager, sender=deployer)
+    coordinator.approveFeeModel(contract.address, sender=fee_manager)
+    return contract
+
+
+# Every call to a proxied application accesses the proxy, its implementation slot and
+# the implementation, each at least as a warm access
+WARM_ACCESS_GAS = 100
+PROXIED_CALL_GAS = 3 * WARM_ACCESS_GAS
+
+
+def check_authorized_stakes_gas(deployer, oz_dependency, providers):
+    """
+    Checks that querying authorizations of the providers from TACoChildApplication in one
+    call saves at least the proxied calls that querying them one by one makes
+    """
+    root_application = project.RootApplicationForTACoChildApplicationMock.deploy(sender=deployer)
+    contract = project.TACoChildApplication.deploy(root_application.address, 1, sender=deployer)
+    proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
+        contract.address, deployer, b"", sender=deployer
+    )
+    application = project.TACoChildApplication.at(proxy.address)
+    root_application.setChildApplication(application.address, sender=deployer)
+    for provider in providers:
+        root_application.updateAuthorization(provider, 42, sender=deployer)
+
+    gas_meter = project.AuthorizedStakesGasMock.deploy(sender=deployer)
+    per_provider_gas = gas_meter.authorizedStakeGas(application.address, providers)
+    batched_gas = gas_meter.authorizedStakesGas(application.address, providers)
+    assert per_provider_gas - batched_gas >= (len(providers) - 1) * PROXIED_CALL_GAS
+
+
+@pytest.fixture()
+def application(deployer, nodes):
+    return deploy_application(project.ChildApplicationForCoordinatorMock, deployer, nodes)
+
+
+@pytest.fixture()
+def erc20(initiator):
+    token = project.TestToken.deploy(ERC20_SUPPLY, sender=initiator)
+    return token
+
+
+@pytest.fixture()
+def coordinator(deployer, application, oz_dependency, nodes):
+    # rituals can include all the nodes
+    return deploy_coordinator(deployer, application, oz_dependency, max_dkg_size=len(nodes))
+
+
+@pytest.fixture()
+def fee_model(deployer, coordinator, erc20, fee_manager):
+    return deploy_fee_model(deployer, coordinator, erc20, fee_manager)
+
+
+@pytest.fixture()
+def global_allow_list(deployer, coordinator):
+    contract = project.GlobalAllowList.deploy(coordinator.address, sender=deployer)
+    return contract
+
+
+class StubRequestHandler(BaseHTTPRequestHandler):
+    def do_GET(self):
+        params = {k: v[0] for k, v in parse_qs(urlparse(self.path).query).items()}
+        self.server.requests.append(params)
+        status, data = self.server.respond(params)
+        body = b"" if data is None else json.dumps(data).encode()
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+class StubServer(ThreadingHTTPServer):
+    """Local HTTP API answering GET requests with the status and JSON of `respond(params)`"""
+
+    def __init__(self):
+        super().__init__(("127.0.0.1", 0), StubRequestHandler)
+        self.requests = list()
+        self.respond = lambda params: (404, None)
+
+    @property
+    def url(self):
+        return f"http://127.0.0.1:{self.server_address[1]}"
+
+
+@pytest.fixture()
+def stub_server():
+    server = StubServer()
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
@@ -23,6 +23,8 @@ import pytest
 from nucypher_core import MessageKit
 from nucypher_core.umbral import SecretKey, Signer, generate_kfrags, reencrypt
 
+PRECOMPUTED_DATA_SIZE = 20 * 32 + 32 + 20 + 5
+
 
 @pytest.fixture()
 def deserializer(project, accounts):
@@ -70,6 +72,10 @@ def test_capsule(deserializer, fragments):
     capsule_bytes = capsule.to_bytes_simple()
     result = deserializer.toCapsule(capsule_bytes)
     assert b"".join(result) == capsule_bytes
+    assert deserializer.toCapsuleCalldata(capsule_bytes) == result
+
+    with ape.reverts():
+        deserializer.toCapsuleCalldata(os.urandom(97))
 
 
 def test_cfrag(deserializer, fragments):
@@ -93,5 +99,38 @@ def test_cfrag(deserializer, fragments):
     result_proof = deserializer.toCorrectnessProofFromCapsuleFrag(cfrag_bytes)
     assert cfrag_bytes == b"".join(result_frag) + b"".join(result_proof)
 
+    # Calldata variants read the same values
+    assert deserializer.toCapsuleFragCalldata(cfrag_bytes) == result_frag
+    assert deserializer.toCorrectnessProofFromCapsuleFragCalldata(cfrag_bytes) == b"".join(
+        result_proof
+    )
+    metadata = os.urandom(40)
+    result = deserializer.toCorrectnessProofFromCapsuleFragCalldata(full_cfrag_bytes + metadata)
+    assert result == proof_bytes + metadata
+    with ape.reverts():
+        deserializer.toCapsuleFragCalldata(os.urandom(358))
+
+
+def test_precomputed_data(deserializer):
+    # Wrong number of bytes to deserialize precomputed data
+    with ape.reverts():
+        deserializer.toPreComputedData(os.urandom(PRECOMPUTED_DATA_SIZE - 1))
+    with ape.reverts():
+        deserializer.toPreComputedDataCalldata(os.urandom(PRECOMPUTED_DATA_SIZE + 1))
+
+    # Words are followed by the address and the lost bytes, each padded to a word
+    data = os.urandom(PRECOMPUTED_DATA_SIZE)
+    expected = data[:672] + b"\x00" * 12 + data[672:692] + data[692:] + b"\x00" * 27
+    assert deserializer.toPreComputedData(data) == expected
+    assert deserializer.toPreComputedDataCalldata(data) == expected
+
+
+def test_calldata_gas(deserializer, fragments):
+    _capsule, cfrag = fragments
+    cfrag_bytes = bytes(cfrag)
+    data = os.urandom(PRECOMPUTED_DATA_SIZE)
 
-# TODO: Missing test for precomputed_data
+    for name, argument in (("toCapsuleFrag", cfrag_bytes), ("toPreComputedData", data)):
+        memory_gas = getattr(deserializer, name).estimate_gas_cost(argument)
+        calldata_gas = getattr(deserializer, f"{name}Calldata").estimate_gas_cost(argument)
+        assert calldata_gas < memory_gas
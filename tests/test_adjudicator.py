@@ -0,0 +1,353 @@
+import os
+from collections import Counter
+from enum import IntEnum
+from hashlib import sha256
+
+import pytest
+from ape.utils import ZERO_ADDRESS
+from coincurve import PrivateKey, PublicKey
+from eth_abi import encode
+from eth_account import Account
+from eth_account.messages import encode_defunct
+from eth_utils import keccak
+from nucypher_core import MessageKit
+from nucypher_core.umbral import SecretKey, Signer, generate_kfrags, reencrypt
+
+EvaluationStatus = IntEnum(
+    "EvaluationStatus", ["EVALUATED", "ALREADY_EVALUATED", "FAILED"], start=0
+)
+
+STAKE = 10**18
+
+SHA256 = 1  # SignatureVerifier.HashAlgorithm
+CURVE_ORDER = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
+# Umbral parameter U, see ReEncryptionValidator
+POINT_U = PublicKey.from_point(
+    0x03C98795773FF1C241FC0B1CCED85E80F8366581DDA5C9452175EBD41385FA1F,
+    0x7880ED56962D7C0AE44D6F14BB53B5FE64B31EA44A41D0316F3A598778F0F936,
+)
+PRECOMPUTED_DATA_SIZE = 20 * 32 + 32 + 20 + 5
+
+
+@pytest.fixture()
+def operators(accounts):
+    return accounts[1:5]
+
+
+@pytest.fixture()
+def staking_providers(accounts):
+    return accounts[5:9]
+
+
+@pytest.fixture()
+def application(project, creator, operators, staking_providers):
+    contract = project.TACoApplicationForAdjudicatorMock.deploy(creator.address, sender=creator)
+    # the third operator is bonded to a staking provider without tokens, the last one is unbonded
+    stakes = [STAKE, STAKE, 0]
+    for operator, staking_provider, stake in zip(operators, staking_providers, stakes):
+        contract.setStakingProviderInfo(staking_provider, stake, operator, sender=creator)
+    return contract
+
+
+@pytest.fixture()
+def adjudicator(project, creator, application):
+    return project.AdjudicatorForBatchMock.deploy(application.address, sender=creator)
+
+
+def evaluation(operator, correctness=True, valid=True, cfrag=b"cfrag"):
+    """Arguments of one evaluation, the mock reads the outcome from the capsule"""
+    capsule = encode(["bool", "bool", "address"], [valid, correctness, operator.address])
+    return (capsule, cfrag, b"", b"", b"", b"", b"", b"")
+
+
+def evaluation_hash(item):
+    capsule, cfrag = item[:2]
+    return sha256(capsule + cfrag).digest()
+
+
+@pytest.fixture(scope="module")
+def fragments():
+    delegating_privkey = SecretKey.random()
+    signer = Signer(SecretKey.random())
+    kfrags = generate_kfrags(
+        delegating_sk=delegating_privkey,
+        signer=signer,
+        receiving_pk=SecretKey.random().public_key(),
+        threshold=2,
+        shares=4,
+        sign_delegating_key=False,
+        sign_receiving_key=False,
+    )
+    capsule = MessageKit(delegating_privkey.public_key(), b"unused").capsule
+    cfrag = reencrypt(capsule, kfrags[0])
+    return capsule, cfrag
+
+
+def random_scalar():
+    return int.from_bytes(os.urandom(32), "big") % (CURVE_ORDER - 1) + 1
+
+
+def multiply(point, scalar):
+    return point.multiply(scalar.to_bytes(32, "big"))
+
+
+def compressed(point):
+    return point.format(compressed=True)
+
+
+def y_coord(point):
+    return point.point()[1].to_bytes(32, "big")
+
+
+def coords(point):
+    return b"".join(value.to_bytes(32, "big") for value in point.point())
+
+
+def sign_hash(key, message_hash):
+    """Signature as r + s, and its recovery value v"""
+    signature = key.sign_recoverable(message_hash, hasher=None)
+    return signature[:64], signature[64:]
+
+
+def challenge_scalar(points, metadata):
+    """Proof challenge h, as computed by ReEncryptionValidator"""
+    data = b"hash_to_curvebn".ljust(32, b"\x00") + bytes(32)
+    data += b"".join(compressed(point) for point in points) + metadata
+    upper = int.from_bytes(keccak(b"\x00" + data), "big")
+    lower = int.from_bytes(keccak(b"\x01" + data), "big")
+    delta = 0x14551231950B75FC4402DA1732FC9BEC0
+    return 1 + (upper * delta % (CURVE_ORDER - 1) + lower) % (CURVE_ORDER - 1)
+
+
+def real_evaluation(capsule, operator, correctness=True):
+    """
+    Arguments of one evaluation, with a CFrag of the capsule re-encrypted under a random key,
+    the operator's signatures and the precomputed data for the correctness proof
+    """
+    capsule_bytes = capsule.to_bytes_simple()
+    point_e, point_v = PublicKey(capsule_bytes[:33]), PublicKey(capsule_bytes[33:66])
+    alice_key, requester_key, stamp_key = PrivateKey(), PrivateKey(), PrivateKey()
+    stamp = compressed(stamp_key.public_key)
+    identity_evidence = Account.sign_message(encode_defunct(primitive=stamp), operator.key)
+
+    # Alice's signature of the KFrag and Bob's signature of the task specification
+    kfrag_validity_message_hash = os.urandom(32)
+    kfrag_signature, kfrag_v = sign_hash(alice_key, kfrag_validity_message_hash)
+    alice_address = keccak(coords(alice_key.public_key))[12:]
+    specification = capsule_bytes + stamp + identity_evidence.signature + alice_address + bytes(32)
+    task_signature, specification_v = sign_hash(requester_key, sha256(specification).digest())
+    metadata, metadata_v = sign_hash(stamp_key, sha256(task_signature).digest())
+
+    # Re-encryption with its proof of correctness: z = t + h * rk
+    rk, t = random_scalar(), random_scalar()
+    e1, v1, u1 = (multiply(point, rk) for point in (point_e, point_v, POINT_U))
+    e2, v2, u2 = (multiply(point, t) for point in (point_e, point_v, POINT_U))
+    h = challenge_scalar((point_e, e1, e2, point_v, v1, v2, POINT_U, u1, u2), metadata)
+    z = (t + h * rk) % CURVE_ORDER
+    if not correctness:
+        z = (z + 1) % CURVE_ORDER
+    cfrag_bytes = b"".join(
+        [
+            compressed(e1),
+            compressed(v1),
+            os.urandom(32),  # KFrag ID
+            compressed(PrivateKey().public_key),  # precursor
+            compressed(e2),
+            compressed(v2),
+            compressed(u1),
+            compressed(u2),
+            z.to_bytes(32, "big"),
+            kfrag_signature,
+            metadata,
+        ]
+    )
+    cfrag_signature, cfrag_v = sign_hash(stamp_key, sha256(cfrag_bytes).digest())
+
+    precomputed_data = b"".join(
+        [
+            y_coord(point_e),
+            coords(multiply(point_e, z)),
+            y_coord(e1),
+            coords(multiply(e1, h)),
+            y_coord(e2),
+            y_coord(point_v),
+            coords(multiply(point_v, z)),
+            y_coord(v1),
+            coords(multiply(v1, h)),
+            y_coord(v2),
+            coords(multiply(POINT_U, z)),
+            y_coord(u1),
+            coords(multiply(u1, h)),
+            y_coord(u2),
+            kfrag_validity_message_hash,
+            alice_address,
+            kfrag_v + cfrag_v + metadata_v + specification_v + stamp[:1],
+        ]
+    )
+    return (
+        capsule_bytes,
+        cfrag_bytes,
+        cfrag_signature,
+        task_signature,
+        coords(requester_key.public_key),
+        coords(stamp_key.public_key),
+        identity_evidence.signature,
+        precomputed_data,
+    )
+
+
+def test_verdicts(adjudicator, creator, operators, staking_providers):
+    bonded_1, bonded_2, without_tokens, unbonded = operators
+    evaluations = [
+        evaluation(bonded_1),
+        evaluation(bonded_1, correctness=False),
+        evaluation(bonded_2, correctness=False),
+        evaluation(bonded_1, correctness=False, cfrag=b"another cfrag"),
+        evaluation(bonded_2, valid=False),
+        evaluation(unbonded),
+        evaluation(without_tokens),
+    ]
+
+    verdicts = adjudicator.evaluateCFrags.call(evaluations, sender=creator)
+    assert [verdict.evaluationHash for verdict in verdicts] == [
+        evaluation_hash(item) for item in evaluations
+    ]
+    assert [verdict.status for verdict in verdicts] == [EvaluationStatus.EVALUATED] * 4 + [
+        EvaluationStatus.FAILED
+    ] * 3
+    assert [verdict.correctness for verdict in verdicts[:4]] == [True, False, False, False]
+    assert [verdict.operator for verdict in verdicts[:4]] == [
+        bonded_1.address,
+        bonded_1.address,
+        bonded_2.address,
+        bonded_1.address,
+    ]
+    assert [verdict.stakingProvider for verdict in verdicts[:4]] == [
+        staking_providers[0].address,
+        staking_providers[0].address,
+        staking_providers[1].address,
+        staking_providers[0].address,
+    ]
+    # failed items don't revert the batch, the reason is reported instead
+    assert [verdict.failure for verdict in verdicts] == [""] * 4 + [
+        "CFrag signature is invalid",
+        "Operator must be associated with a provider",
+        "Provider has no tokens",
+    ]
+
+    tx = adjudicator.evaluateCFrags(evaluations, sender=creator)
+    events = adjudicator.CFragEvaluated.from_receipt(tx)
+    assert [event.evaluationHash for event in events] == [
+        evaluation_hash(item) for item in evaluations[:4]
+    ]
+    assert all(event.investigator == creator.address for event in events)
+    assert [event.correctness for event in events] == [True, False, False, False]
+
+    # incorrect CFrags are counted per staking provider
+    events = adjudicator.IncorrectCFragVerdict.from_receipt(tx)
+    assert Counter(event.stakingProvider for event in events) == {
+        staking_providers[0].address: 2,
+        staking_providers[1].address: 1,
+    }
+    assert [event.operator for event in events] == [
+        bonded_1.address,
+        bonded_2.address,
+        bonded_1.address,
+    ]
+
+    # only evaluated CFrags are recorded
+    assert [adjudicator.evaluatedCFrags(evaluation_hash(item)) for item in evaluations] == [
+        True
+    ] * 4 + [False] * 3
+
+
+def test_already_evaluated(adjudicator, application, creator, operators, staking_providers):
+    bonded, _, _, unbonded = operators
+    first = evaluation(bonded)
+    second = evaluation(bonded, correctness=False)
+    third = evaluation(unbonded)
+
+    # duplicates within the batch are skipped
+    verdicts = adjudicator.evaluateCFrags.call([first, first, third], sender=creator)
+    assert [verdict.status for verdict in verdicts] == [
+        EvaluationStatus.EVALUATED,
+        EvaluationStatus.ALREADY_EVALUATED,
+        EvaluationStatus.FAILED,
+    ]
+    tx = adjudicator.evaluateCFrags([first, first, third], sender=creator)
+    assert [event.evaluationHash for event in adjudicator.CFragEvaluated.from_receipt(tx)] == [
+        evaluation_hash(first)
+    ]
+
+    # as well as CFrags evaluated in previous batches,
+    # while failed CFrags can be submitted again
+    application.setStakingProviderInfo(staking_providers[3], STAKE, unbonded, sender=creator)
+    verdicts = adjudicator.evaluateCFrags.call([second, first, third], sender=creator)
+    assert [verdict.status for verdict in verdicts] == [
+        EvaluationStatus.EVALUATED,
+        EvaluationStatus.ALREADY_EVALUATED,
+        EvaluationStatus.EVALUATED,
+    ]
+    assert [verdict.stakingProvider for verdict in verdicts] == [
+        staking_providers[0].address,
+        ZERO_ADDRESS,
+        staking_providers[3].address,
+    ]
+    tx = adjudicator.evaluateCFrags([second, first, third], sender=creator)
+    assert [event.evaluationHash for event in adjudicator.CFragEvaluated.from_receipt(tx)] == [
+        evaluation_hash(second),
+        evaluation_hash(third),
+    ]
+
+    verdicts = adjudicator.evaluateCFrags.call([first, second, third], sender=creator)
+    assert all(verdict.status == EvaluationStatus.ALREADY_EVALUATED for verdict in verdicts)
+    tx = adjudicator.evaluateCFrags([first, second, third], sender=creator)
+    assert not adjudicator.CFragEvaluated.from_receipt(tx)
+
+
+def test_real_evaluations(project, application, creator, staking_providers, fragments):
+    adjudicator = project.Adjudicator.deploy(application.address, SHA256, 0, 0, 1, sender=creator)
+    capsule, cfrag = fragments
+    # the operator signs the identity evidence with its ethereum key
+    bonded = Account.create()
+    application.setStakingProviderInfo(staking_providers[3], STAKE, bonded.address, sender=creator)
+    correct = real_evaluation(capsule, bonded)
+    incorrect = real_evaluation(capsule, bonded, correctness=False)
+    forged = real_evaluation(capsule, bonded)
+    forged = forged[:2] + (os.urandom(64),) + forged[3:]
+    # a CFrag of another Umbral version, without precomputed data to check it
+    unverifiable = (capsule.to_bytes_simple(), bytes(cfrag)) + correct[2:7]
+    unverifiable += (b"\xff" * PRECOMPUTED_DATA_SIZE,)
+    evaluations = [correct, forged, incorrect, unverifiable]
+
+    verdicts = adjudicator.evaluateCFrags.call(evaluations, sender=creator)
+    assert [verdict.status for verdict in verdicts] == [
+        EvaluationStatus.EVALUATED,
+        EvaluationStatus.FAILED,
+        EvaluationStatus.EVALUATED,
+        EvaluationStatus.FAILED,
+    ]
+    assert [verdict.correctness for verdict in verdicts] == [True, False, False, False]
+    assert [verdict.operator for verdict in verdicts] == [bonded.address, ZERO_ADDRESS] * 2
+    assert [verdict.stakingProvider for verdict in verdicts] == [
+        staking_providers[3].address,
+        ZERO_ADDRESS,
+    ] * 2
+    # the recovery value of the KFrag signature is checked without a reason
+    assert [verdict.failure for verdict in verdicts] == ["", "CFrag signature is invalid", "", ""]
+
+    tx = adjudicator.evaluateCFrags(evaluations, sender=creator)
+    events = adjudicator.CFragEvaluated.from_receipt(tx)
+    assert [event.evaluationHash for event in events] == [
+        evaluation_hash(correct),
+        evaluation_hash(incorrect),
+    ]
+    assert [event.correctness for event in events] == [True, False]
+    events = adjudicator.IncorrectCFragVerdict.from_receipt(tx)
+    assert [event.evaluationHash for event in events] == [evaluation_hash(incorrect)]
+    assert [adjudicator.evaluatedCFrags(evaluation_hash(item)) for item in evaluations] == [
+        True,
+        False,
+        True,
+        False,
+    ]
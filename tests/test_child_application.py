@@ -20,6 +20,8 @@ from ape.utils import ZERO_ADDRESS
 from eth_utils import to_checksum_address, to_int
 from web3 import Web3
 
+from tests.conftest import RitualState
+
 OPERATOR_SLOT = 0
 CONFIRMATION_SLOT = 2
 RELEASED_SLOT = 7
@@ -322,7 +324,7 @@ def test_penalize(accounts, root_application, child_application, coordinator):
     assert tx.events == [child_application.Penalized(stakingProvider=staking_provider)]
 
 
-def test_release(accounts, root_application, child_application, coordinator):
+def test_release(accounts, chain, root_application, child_application, coordinator):
     (
         creator,
         staking_provider,
@@ -383,9 +385,167 @@ def test_release(accounts, root_application, child_application, coordinator):
     assert tx.events == []
 
     coordinator.setRitualParticipant(2, staking_provider_3, sender=creator)
+    coordinator.activateRitual(2, chain.pending_timestamp + 100, sender=creator)
 
     # Active participant
     root_application.callChildRelease(staking_provider_3, sender=staking_provider_3)
     assert child_application.authorizedStake(staking_provider_3) == value
     assert not child_application.stakingProviderInfo(staking_provider_3)[RELEASED_SLOT]
     assert not root_application.releases(staking_provider_3)
+
+
+def test_blocking_rituals(accounts, chain, root_application, child_application, coordinator):
+    creator, *staking_providers = accounts[0:5]
+    staking_provider_1, staking_provider_2, staking_provider_3, staking_provider_4 = (
+        staking_providers
+    )
+    for staking_provider in staking_providers:
+        root_application.updateAuthorization(
+            staking_provider, MIN_AUTHORIZATION, MIN_AUTHORIZATION, 0, sender=creator
+        )
+
+    with ape.reverts("Only Coordinator allowed to add participants"):
+        child_application.addRitualParticipants(1, sender=creator)
+    with ape.reverts("Only Coordinator allowed to replace participants"):
+        child_application.replaceRitualParticipant(
+            1, staking_provider_1, staking_provider_2, sender=creator
+        )
+
+    # Participants of rituals activated before they become blocking are blocked too
+    end_1 = chain.pending_timestamp + 1000
+    coordinator.setRitualParticipant(1, staking_provider_1, sender=creator)
+    coordinator.activateRitual(1, end_1, sender=creator)
+    assert child_application.blockedUntil(staking_provider_1) == 0
+    child_application.setBlockingRitualsAdmin(creator, sender=creator)
+    child_application.setBlockingRituals([1, 2, 3], sender=creator)
+    assert child_application.isBlockingRitual(1)
+    assert child_application.isBlockingRitual(2)
+    assert child_application.blockedUntil(staking_provider_1) == end_1
+
+    # Rituals block release only once they are active
+    end_2 = end_1 + 1000
+    coordinator.setRitualParticipant(2, staking_provider_1, sender=creator)
+    coordinator.setRitualParticipant(2, staking_provider_2, sender=creator)
+    coordinator.setRitualParticipant(2, staking_provider_4, sender=creator)
+    coordinator.setRitualParticipant(3, staking_provider_3, sender=creator)
+    coordinator.setRitualParticipant(4, staking_provider_3, sender=creator)
+    assert child_application.blockedUntil(staking_provider_4) == 0
+    tx = child_application.release(staking_provider_4, sender=staking_provider_4)
+    assert tx.events == [child_application.Released(stakingProvider=staking_provider_4)]
+
+    coordinator.activateRitual(2, end_2, sender=creator)
+    coordinator.activateRitual(4, end_2, sender=creator)
+    assert child_application.blockedUntil(staking_provider_1) == end_2
+    assert child_application.blockedUntil(staking_provider_2) == end_2
+    assert child_application.blockedUntil(staking_provider_3) == 0
+
+    # Handover moves participation to the incoming provider
+    coordinator.replaceRitualParticipant(2, staking_provider_2, staking_provider_3, sender=creator)
+    assert child_application.blockedUntil(staking_provider_2) == 0
+    assert child_application.blockedUntil(staking_provider_3) == end_2
+    # but departing provider stays blocked by other rituals
+    coordinator.replaceRitualParticipant(2, staking_provider_1, staking_provider_2, sender=creator)
+    assert child_application.blockedUntil(staking_provider_1) == end_1
+    assert child_application.blockedUntil(staking_provider_2) == end_2
+
+    child_application.release(staking_provider_1, sender=staking_provider_1)
+    child_application.release(staking_provider_2, sender=staking_provider_2)
+    child_application.release(staking_provider_3, sender=staking_provider_3)
+    assert not child_application.stakingProviderInfo(staking_provider_1)[RELEASED_SLOT]
+    assert not child_application.stakingProviderInfo(staking_provider_2)[RELEASED_SLOT]
+    assert not child_application.stakingProviderInfo(staking_provider_3)[RELEASED_SLOT]
+
+    # Only blocking rituals that failed DKG can be ended
+    with ape.reverts("Not a blocking ritual"):
+        child_application.endBlockingRitual(4, sender=staking_provider_3)
+    with ape.reverts("Ritual DKG has not failed"):
+        child_application.endBlockingRitual(2, sender=staking_provider_3)
+
+    coordinator.setRitualState(3, RitualState.DKG_TIMEOUT, sender=creator)
+    child_application.endBlockingRitual(3, sender=staking_provider_3)
+    assert not child_application.isBlockingRitual(3)
+    assert child_application.blockingRituals(0) == 1
+    assert child_application.blockingRituals(1) == 2
+    with ape.reverts():
+        child_application.blockingRituals(2)
+
+    # Participants are no longer blocked once the ritual is not blocking
+    child_application.setBlockingRituals([1], sender=creator)
+    assert not child_application.isBlockingRitual(2)
+    assert child_application.blockedUntil(staking_provider_1) == end_1
+    assert child_application.blockedUntil(staking_provider_2) == 0
+    assert child_application.blockedUntil(staking_provider_3) == 0
+    tx = child_application.release(staking_provider_2, sender=staking_provider_2)
+    assert tx.events == [child_application.Released(stakingProvider=staking_provider_2)]
+    tx = child_application.release(staking_provider_3, sender=staking_provider_3)
+    assert tx.events == [child_application.Released(stakingProvider=staking_provider_3)]
+
+    # Rituals don't block release once they end
+    child_application.release(staking_provider_1, sender=staking_provider_1)
+    assert not child_application.stakingProviderInfo(staking_provider_1)[RELEASED_SLOT]
+    chain.pending_timestamp = end_1 + 1
+    tx = child_application.release(staking_provider_1, sender=staking_provider_1)
+    assert tx.events == [child_application.Released(stakingProvider=staking_provider_1)]
+
+
+def test_initialize_blocked_providers(
+    accounts, chain, project, creator, root_application, oz_dependency
+):
+    staking_provider_1, staking_provider_2 = accounts[1:3]
+    contract = project.LegacyTACoChildApplicationMock.deploy(
+        root_application.address, MIN_AUTHORIZATION, sender=creator
+    )
+    proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
+        contract.address, creator, b"", sender=creator
+    )
+    child_application = project.LegacyTACoChildApplicationMock.at(proxy.address)
+    root_application.setChildApplication(child_application.address, sender=creator)
+    coordinator = project.CoordinatorForTACoChildApplicationMock.deploy(
+        child_application, sender=creator
+    )
+    child_application.initialize(coordinator.address, creator, sender=creator)
+    for staking_provider in (staking_provider_1, staking_provider_2):
+        root_application.updateAuthorization(
+            staking_provider, MIN_AUTHORIZATION, MIN_AUTHORIZATION, 0, sender=creator
+        )
+
+    # Blocking rituals set before the upgrade
+    end_timestamp = chain.pending_timestamp + 1000
+    child_application.setBlockingRitualsAdmin(creator, sender=creator)
+    child_application.setLegacyBlockingRituals([1, 2], sender=creator)
+    coordinator.setRitualParticipant(1, staking_provider_1, sender=creator)
+    coordinator.activateRitual(1, end_timestamp, sender=creator)
+    coordinator.setRitualParticipant(2, staking_provider_2, sender=creator)
+    assert child_application.blockedUntil(staking_provider_1) == 0
+
+    child_application.initializeBlockedProviders(sender=creator)
+    assert child_application.isBlockingRitual(1)
+    assert child_application.isBlockingRitual(2)
+    assert child_application.blockedUntil(staking_provider_1) == end_timestamp
+    assert child_application.blockedUntil(staking_provider_2) == 0
+    with ape.reverts():
+        child_application.initializeBlockedProviders(sender=creator)
+
+    child_application.release(staking_provider_1, sender=staking_provider_1)
+    assert not child_application.stakingProviderInfo(staking_provider_1)[RELEASED_SLOT]
+    tx = child_application.release(staking_provider_2, sender=staking_provider_2)
+    assert tx.events == [child_application.Released(stakingProvider=staking_provider_2)]
+
+
+def test_authorized_stakes(accounts, root_application, child_application, coordinator):
+    creator, *staking_providers = accounts[0:6]
+    for i, staking_provider in enumerate(staking_providers):
+        value = MIN_AUTHORIZATION * i
+        root_application.updateAuthorization(staking_provider, value, sender=creator)
+
+    expected = [MIN_AUTHORIZATION * i for i in range(len(staking_providers))]
+    assert child_application.authorizedStakes(staking_providers) == expected
+    assert child_application.authorizedStakes([]) == []
+
+    # Released providers have no authorization
+    staking_provider = staking_providers[1]
+    root_application.updateAuthorization(
+        staking_provider, MIN_AUTHORIZATION, MIN_AUTHORIZATION, 0, sender=creator
+    )
+    child_application.release(staking_provider, sender=staking_provider)
+    assert child_application.authorizedStakes(staking_providers)[1] == 0
@@ -0,0 +1,81 @@
+from types import SimpleNamespace
+
+import ape
+import pytest
+from ethpm_types import ContractType
+
+from deployment import contract_cache, utils
+
+CONTRACT_TYPE = ContractType(contractName="Coordinator", abi=[])
+
+
+@pytest.fixture()
+def project_dir(monkeypatch, tmp_path):
+    project_dir = tmp_path / "project"
+    (project_dir / "contracts").mkdir(parents=True)
+    (project_dir / "contracts" / "Coordinator.sol").write_text("contract Coordinator {}\n")
+    (project_dir / "ape-config.yaml").write_text("name: project\n")
+    monkeypatch.setattr(contract_cache, "PROJECT_DIR", project_dir)
+    monkeypatch.setattr(contract_cache, "CONTRACT_CACHE_DIR", project_dir / ".build" / "types")
+    monkeypatch.setenv("APE_DATA_FOLDER", str(tmp_path / "ape"))
+    contract_cache._cache_key.cache_clear()
+    yield project_dir
+    contract_cache._cache_key.cache_clear()
+
+
+def cache_key():
+    contract_cache._cache_key.cache_clear()
+    return contract_cache._cache_key()
+
+
+def test_cache_key(project_dir, tmp_path):
+    key = cache_key()
+    assert cache_key() == key
+
+    # project sources
+    (project_dir / "contracts" / "Coordinator.sol").write_text("contract Coordinator { }\n")
+    assert cache_key() != key
+    key = cache_key()
+
+    # compiler and dependency settings
+    (project_dir / "ape-config.yaml").write_text("name: project\nsolidity:\n  version: 0.8.23\n")
+    assert cache_key() != key
+    key = cache_key()
+
+    # and dependency sources, once installed or reinstalled
+    dependency = tmp_path / "ape" / "packages" / "projects" / "OZ" / "5_0_0" / "Proxy.sol"
+    dependency.parent.mkdir(parents=True)
+    dependency.write_text("contract Proxy {}\n")
+    assert cache_key() != key
+    key = cache_key()
+    dependency.write_text("contract Proxy { }\n")
+    assert cache_key() != key
+
+
+def test_cached_contract_type(project_dir):
+    assert contract_cache.load_cached_contract_type("Coordinator") is None
+    contract_cache.cache_contract_type("Coordinator", CONTRACT_TYPE)
+    assert contract_cache.load_cached_contract_type("Coordinator") == CONTRACT_TYPE
+
+    # entries of other sources are not used
+    (project_dir / "contracts" / "Coordinator.sol").write_text("contract Coordinator { }\n")
+    contract_cache._cache_key.cache_clear()
+    assert contract_cache.load_cached_contract_type("Coordinator") is None
+
+
+class UnloadedProject:
+    def __getattr__(self, name):
+        raise AssertionError(f"Project was loaded to get {name}")
+
+
+def test_cache_hit_does_not_load_project(project_dir, monkeypatch):
+    project = SimpleNamespace(Coordinator=SimpleNamespace(contract_type=CONTRACT_TYPE))
+    monkeypatch.setattr(ape, "project", project)
+
+    # the first lookup loads the project and caches the contract type
+    container = utils.get_contract_container("Coordinator")
+    assert container.contract_type == CONTRACT_TYPE
+
+    monkeypatch.setattr(ape, "project", UnloadedProject())
+    container = utils.get_contract_container("Coordinator")
+    assert container.contract_type == CONTRACT_TYPE
@@ -8,20 +8,24 @@ from hexbytes import HexBytes
 from web3 import Web3
 
 from tests.conftest import (
+    DKG_TIMEOUT,
     G1_SIZE,
     G2_SIZE,
+    HANDOVER_TIMEOUT,
     HandoverState,
     RitualState,
+    check_authorized_stakes_gas,
+    deploy_coordinator,
+    deploy_fee_model,
     gen_public_key,
     generate_transcript,
 )
 
-TIMEOUT = 1000
 MAX_DKG_SIZE = 31
-FEE_RATE = 42
-ERC20_SUPPLY = 10**24
 DURATION = 48 * 60 * 60
-HANDOVER_TIMEOUT = 2000
+TX_BASE_GAS = 21_000
+COLD_SLOAD_GAS = 2_100
+VALUE_TRANSFER_GAS = 9_000  # minimum cost of a call sending ether
 
 
 @pytest.fixture(scope="module")
@@ -50,61 +54,9 @@ def fee_manager(accounts):
     return accounts[fee_manager_index]
 
 
-@pytest.fixture()
-def application(project, deployer, nodes):
-    contract = project.ChildApplicationForCoordinatorMock.deploy(sender=deployer)
-    for n in nodes:
-        contract.updateOperator(n, n, sender=deployer)
-        contract.updateAuthorization(n, 42, sender=deployer)
-    return contract
-
-
-@pytest.fixture()
-def erc20(project, initiator):
-    token = project.TestToken.deploy(ERC20_SUPPLY, sender=initiator)
-    return token
-
-
-@pytest.fixture()
-def coordinator(project, deployer, application, oz_dependency):
-    admin = deployer
-    contract = project.Coordinator.deploy(
-        application.address,
-        TIMEOUT,
-        HANDOVER_TIMEOUT,
-        sender=deployer,
-    )
-
-    encoded_initializer_function = contract.initialize.encode_input(MAX_DKG_SIZE, admin)
-    proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
-        contract.address,
-        deployer,
-        encoded_initializer_function,
-        sender=deployer,
-    )
-    proxy_contract = project.Coordinator.at(proxy.address)
-    return proxy_contract
-
-
-@pytest.fixture()
-def fee_model(project, deployer, coordinator, erc20, fee_manager):
-    contract = project.FlatRateFeeModel.deploy(
-        coordinator.address, erc20.address, FEE_RATE, sender=deployer
-    )
-    coordinator.grantRole(coordinator.FEE_MODEL_MANAGER_ROLE(), fee_manager, sender=deployer)
-    coordinator.approveFeeModel(contract.address, sender=fee_manager)
-    return contract
-
-
-@pytest.fixture()
-def global_allow_list(project, deployer, coordinator):
-    contract = project.GlobalAllowList.deploy(coordinator.address, sender=deployer)
-    return contract
-
-
 def test_initial_parameters(coordinator):
     assert coordinator.maxDkgSize() == MAX_DKG_SIZE
-    assert coordinator.dkgTimeout() == TIMEOUT
+    assert coordinator.dkgTimeout() == DKG_TIMEOUT
     assert coordinator.handoverTimeout() == HANDOVER_TIMEOUT
     assert coordinator.numberOfRituals() == 0
 
@@ -177,7 +129,15 @@ def initiate_ritual(coordinator, fee_model, erc20, authority, nodes, allow_logic
 
 
 def test_initiate_ritual(
-    coordinator, nodes, initiator, erc20, fee_model, deployer, fee_manager, global_allow_list
+    coordinator,
+    nodes,
+    initiator,
+    erc20,
+    fee_model,
+    deployer,
+    fee_manager,
+    global_allow_list,
+    application,
 ):
     authority, tx = initiate_ritual(
         coordinator=coordinator,
@@ -197,6 +157,8 @@ def test_initiate_ritual(
     assert event.participants == [n.address for n in nodes]
 
     assert coordinator.getRitualState(0) == RitualState.DKG_AWAITING_TRANSCRIPTS
+    # Participants are reported to the application only once the ritual is active
+    assert all(application.ritualsCount(node) == 0 for node in nodes)
 
     ritual_struct = coordinator.rituals(ritualID)
     assert ritual_struct[0] == initiator
@@ -227,6 +189,11 @@ def test_initiate_ritual(
         fee_model.withdrawTokens(1, sender=deployer)
 
 
+def test_authorized_stakes_gas(deployer, nodes, oz_dependency):
+    # initiating a ritual queries authorizations of all the nodes
+    check_authorized_stakes_gas(deployer, oz_dependency, nodes)
+
+
 def test_provider_public_key(coordinator, nodes):
     selected_provider = nodes[0]
     public_key = gen_public_key()
@@ -370,6 +337,51 @@ def test_post_transcript_but_not_waiting_for_transcripts(
         coordinator.publishTranscript(0, transcript, sender=nodes[1])
 
 
+def test_publish_transcripts(coordinator, nodes, initiator, erc20, fee_model, global_allow_list):
+    for _ in range(3):
+        initiate_ritual(
+            coordinator=coordinator,
+            fee_model=fee_model,
+            erc20=erc20,
+            authority=initiator,
+            nodes=nodes,
+            allow_logic=global_allow_list,
+        )
+
+    size = len(nodes)
+    threshold = coordinator.getThresholdForRitualSize(size)
+    transcript = generate_transcript(size, threshold)
+
+    with ape.reverts("Invalid batch"):
+        coordinator.publishTranscripts([], [], sender=nodes[0])
+    with ape.reverts("Invalid batch"):
+        coordinator.publishTranscripts([1, 2], [transcript], sender=nodes[0])
+    with ape.reverts("Participant not part of ritual"):
+        coordinator.publishTranscripts([1, 2], [transcript, transcript], sender=initiator)
+
+    coordinator.publishTranscript(0, transcript, sender=nodes[0])
+    batch_tx = coordinator.publishTranscripts([1, 2], [transcript, transcript], sender=nodes[0])
+
+    events = [event for event in batch_tx.events if event.event_name == "TranscriptPosted"]
+    assert events == [
+        coordinator.TranscriptPosted(
+            ritualId=ritual_id, node=nodes[0], transcriptDigest=Web3.keccak(transcript)
+        )
+        for ritual_id in (1, 2)
+    ]
+    for ritual_id in (1, 2):
+        participant = coordinator.getParticipant(ritual_id, nodes[0].address, True)
+        assert participant.transcript == transcript
+
+    with ape.reverts("Node already posted transcript"):
+        coordinator.publishTranscripts([0, 1], [transcript, transcript], sender=nodes[0])
+
+    for node in nodes[1:]:
+        coordinator.publishTranscripts([0, 1, 2], [transcript] * 3, sender=node)
+    for ritual_id in (0, 1, 2):
+        assert coordinator.getRitualState(ritual_id) == RitualState.DKG_AWAITING_AGGREGATIONS
+
+
 def test_get_participants(coordinator, nodes, initiator, erc20, fee_model, global_allow_list):
     initiate_ritual(
         coordinator=coordinator,
@@ -477,8 +489,56 @@ def test_get_participant(nodes, coordinator, initiator, erc20, fee_model, global
             coordinator.getParticipantFromProvider(0, new_account.address)
 
 
+def test_publish_transcripts_gas(
+    project, coordinator, nodes, initiator, deployer, erc20, fee_model, global_allow_list
+):
+    reimbursement_pool = project.ReimbursementPool.deploy(40_000, 10**11, sender=deployer)
+    reimbursement_pool.authorize(coordinator.address, sender=deployer)
+    deployer.transfer(reimbursement_pool.address, 10**18)
+    coordinator.setReimbursementPool(reimbursement_pool.address, sender=deployer)
+
+    batch_size = 3
+    for _ in range(2 * batch_size):
+        initiate_ritual(
+            coordinator=coordinator,
+            fee_model=fee_model,
+            erc20=erc20,
+            authority=initiator,
+            nodes=nodes,
+            allow_logic=global_allow_list,
+        )
+    size = len(nodes)
+    transcript = generate_transcript(size, coordinator.getThresholdForRitualSize(size))
+
+    single_gas = 0
+    for ritual_id in range(batch_size):
+        pool_balance = reimbursement_pool.balance
+        tx = coordinator.publishTranscript(ritual_id, transcript, sender=nodes[0])
+        assert reimbursement_pool.balance < pool_balance
+        single_gas += tx.gas_used
+
+    pool_balance = reimbursement_pool.balance
+    ritual_ids = list(range(batch_size, 2 * batch_size))
+    tx = coordinator.publishTranscripts(ritual_ids, [transcript] * batch_size, sender=nodes[0])
+    assert reimbursement_pool.balance < pool_balance
+    batch_gas = tx.gas_used
+
+    # the transaction itself, operator resolution, authorization check and reimbursement
+    # are paid once per batch instead of once per transcript
+    saving = (batch_size - 1) * (TX_BASE_GAS + VALUE_TRANSFER_GAS)
+    assert single_gas // batch_size - batch_gas // batch_size >= saving // batch_size
+
+
 def test_post_aggregation(
-    coordinator, nodes, initiator, erc20, fee_model, fee_manager, deployer, global_allow_list
+    coordinator,
+    nodes,
+    initiator,
+    erc20,
+    fee_model,
+    fee_manager,
+    deployer,
+    global_allow_list,
+    application,
 ):
     initiate_ritual(
         coordinator=coordinator,
@@ -502,6 +562,7 @@ def test_post_aggregation(
     dkg_public_key = (os.urandom(32), os.urandom(16))
     for i, node in enumerate(nodes):
         assert coordinator.getRitualState(ritualID) == RitualState.DKG_AWAITING_AGGREGATIONS
+        assert application.ritualsCount(node) == 0
         tx = coordinator.postAggregation(
             ritualID, aggregated, dkg_public_key, decryption_request_static_keys[i], sender=node
         )
@@ -521,6 +582,7 @@ def test_post_aggregation(
     assert coordinator.getRitualState(ritualID) == RitualState.ACTIVE
     events = [event for event in tx.events if event.event_name == "EndRitual"]
     assert events == [coordinator.EndRitual(ritualId=ritualID, successful=True)]
+    assert all(application.ritualsCount(node) == 1 for node in nodes)
 
     retrieved_public_key = coordinator.getPublicKeyFromRitualId(ritualID)
     assert retrieved_public_key == dkg_public_key
@@ -538,7 +600,15 @@ def test_post_aggregation(
 
 
 def test_post_aggregation_fails(
-    coordinator, nodes, initiator, erc20, fee_model, fee_manager, deployer, global_allow_list
+    coordinator,
+    nodes,
+    initiator,
+    erc20,
+    fee_model,
+    fee_manager,
+    deployer,
+    global_allow_list,
+    application,
 ):
     initiator_balance_before_payment = erc20.balanceOf(initiator)
 
@@ -577,6 +647,7 @@ def test_post_aggregation_fails(
     assert coordinator.getRitualState(ritualID) == RitualState.DKG_INVALID
     events = [event for event in tx.events if event.event_name == "EndRitual"]
     assert events == [coordinator.EndRitual(ritualId=ritualID, successful=False)]
+    assert all(application.ritualsCount(node) == 0 for node in nodes)
 
     # Fees are still pending
     fee = fee_model.getRitualCost(len(nodes), DURATION)
@@ -604,6 +675,54 @@ def test_post_aggregation_fails(
     fee_model.withdrawTokens(fee_model_balance_after_refund, sender=deployer)
 
 
+def test_post_aggregations(coordinator, nodes, initiator, erc20, fee_model, global_allow_list):
+    ritual_ids = [0, 1]
+    for _ in ritual_ids:
+        initiate_ritual(
+            coordinator=coordinator,
+            fee_model=fee_model,
+            erc20=erc20,
+            authority=initiator,
+            nodes=nodes,
+            allow_logic=global_allow_list,
+        )
+
+    size = len(nodes)
+    threshold = coordinator.getThresholdForRitualSize(size)
+    transcript = generate_transcript(size, threshold)
+    for node in nodes:
+        coordinator.publishTranscripts(ritual_ids, [transcript] * 2, sender=node)
+
+    aggregated = transcript  # has the same size as transcript
+    dkg_public_keys = [(os.urandom(32), os.urandom(16)) for _ in ritual_ids]
+
+    with ape.reverts("Invalid batch"):
+        coordinator.postAggregations(
+            ritual_ids, [aggregated], dkg_public_keys, [os.urandom(42)] * 2, sender=nodes[0]
+        )
+
+    for node in nodes:
+        keys = [os.urandom(42) for _ in ritual_ids]
+        tx = coordinator.postAggregations(
+            ritual_ids, [aggregated] * 2, dkg_public_keys, keys, sender=node
+        )
+        events = [event for event in tx.events if event.event_name == "AggregationPosted"]
+        assert events == [
+            coordinator.AggregationPosted(
+                ritualId=ritual_id, node=node, aggregatedTranscriptDigest=Web3.keccak(aggregated)
+            )
+            for ritual_id in ritual_ids
+        ]
+
+    events = [event for event in tx.events if event.event_name == "EndRitual"]
+    assert events == [
+        coordinator.EndRitual(ritualId=ritual_id, successful=True) for ritual_id in ritual_ids
+    ]
+    for ritual_id, dkg_public_key in zip(ritual_ids, dkg_public_keys):
+        assert coordinator.getRitualState(ritual_id) == RitualState.ACTIVE
+        assert coordinator.getRitualIdFromPublicKey(dkg_public_key) == ritual_id
+
+
 # def test_withdraw_tokens(coordinator, initiator, erc20, treasury, deployer):
 #     # Let's send some tokens to Coordinator by mistake
 #     erc20.transfer(coordinator.address, 42, sender=initiator)
@@ -1139,7 +1258,7 @@ def test_finalize_handover(
     blinded_share = os.urandom(G2_SIZE)
 
     with ape.reverts():
-        coordinator.finalizeHandover(ritualID, departing_node, sender=handover_supervisor)
+        coordinator.finalizeHandover(ritualID, departing_node, b"", sender=handover_supervisor)
 
     coordinator.grantRole(
         coordinator.HANDOVER_SUPERVISOR_ROLE(), handover_supervisor, sender=deployer
@@ -1148,13 +1267,22 @@ def test_finalize_handover(
     threshold, aggregated = activate_ritual(nodes, coordinator, ritualID)
     setup_node(incoming_node, coordinator, application, deployer)
 
+    index = 32 + participant_index * G2_SIZE + threshold * G1_SIZE
+    new_aggregated = bytearray(aggregated)
+    new_aggregated[index : index + G2_SIZE] = blinded_share
+    new_aggregated = bytes(new_aggregated)
+
     with ape.reverts("Not waiting for finalization"):
-        coordinator.finalizeHandover(ritualID, departing_node, sender=handover_supervisor)
+        coordinator.finalizeHandover(
+            ritualID, departing_node, new_aggregated, sender=handover_supervisor
+        )
 
     coordinator.handoverRequest(ritualID, departing_node, incoming_node, sender=handover_supervisor)
 
     with ape.reverts("Not waiting for finalization"):
-        coordinator.finalizeHandover(ritualID, departing_node, sender=handover_supervisor)
+        coordinator.finalizeHandover(
+            ritualID, departing_node, new_aggregated, sender=handover_supervisor
+        )
     decryption_request_static_key = os.urandom(42)
     coordinator.postHandoverTranscript(
         ritualID,
@@ -1165,7 +1293,9 @@ def test_finalize_handover(
     )
 
     with ape.reverts("Not waiting for finalization"):
-        coordinator.finalizeHandover(ritualID, departing_node, sender=handover_supervisor)
+        coordinator.finalizeHandover(
+            ritualID, departing_node, new_aggregated, sender=handover_supervisor
+        )
 
     coordinator.postBlindedShare(ritualID, blinded_share, sender=departing_node)
     assert (
@@ -1173,10 +1303,29 @@ def test_finalize_handover(
         == HandoverState.HANDOVER_AWAITING_FINALIZATION
     )
 
+    with ape.reverts("Invalid transcript size"):
+        coordinator.finalizeHandover(
+            ritualID, departing_node, new_aggregated[:-1], sender=handover_supervisor
+        )
+    with ape.reverts("Wrong blinded share"):
+        coordinator.finalizeHandover(
+            ritualID, departing_node, aggregated, sender=handover_supervisor
+        )
+    tampered = bytearray(new_aggregated)
+    tampered[index - 1] ^= 0xFF
+    with ape.reverts("Aggregated transcript mismatch"):
+        coordinator.finalizeHandover(
+            ritualID, departing_node, bytes(tampered), sender=handover_supervisor
+        )
+
     assert not application.stakingProviderReleased(departing_node)
-    tx = coordinator.finalizeHandover(ritualID, departing_node, sender=handover_supervisor)
+    tx = coordinator.finalizeHandover(
+        ritualID, departing_node, new_aggregated, sender=handover_supervisor
+    )
     assert coordinator.getHandoverState(ritualID, departing_node) == HandoverState.NON_INITIATED
     assert application.stakingProviderReleased(departing_node)
+    assert application.ritualsCount(departing_node) == 0
+    assert application.ritualsCount(incoming_node) == 1
 
     events = [event for event in tx.events if event.event_name == "HandoverFinalized"]
     assert events == [
@@ -1204,17 +1353,151 @@ def test_finalize_handover(
     assert len(p.transcript) == 0
     assert p.decryptionRequestStaticKey == decryption_request_static_key
 
+    assert coordinator.rituals(ritualID).aggregatedTranscript == new_aggregated
+
+    events = [event for event in tx.events if event.event_name == "AggregationPosted"]
+    assert events == [
+        coordinator.AggregationPosted(
+            ritualId=ritualID,
+            node=incoming_node,
+            aggregatedTranscriptDigest=Web3.keccak(new_aggregated),
+        )
+    ]
+
+
+def prepare_handover(
+    coordinator,
+    application,
+    deployer,
+    handover_supervisor,
+    ritualID,
+    departing_node,
+    incoming_node,
+    aggregated,
+):
+    """
+    Goes through the handover of the departing node up to its finalization and returns
+    the aggregated transcript with the blinded share of the incoming node
+    """
+    setup_node(incoming_node, coordinator, application, deployer)
+    coordinator.handoverRequest(ritualID, departing_node, incoming_node, sender=handover_supervisor)
+    coordinator.postHandoverTranscript(
+        ritualID, departing_node, os.urandom(42), os.urandom(42), sender=incoming_node
+    )
+    blinded_share = os.urandom(G2_SIZE)
+    coordinator.postBlindedShare(ritualID, blinded_share, sender=departing_node)
+
+    providers = coordinator.getProviders(ritualID)
+    participant_index = providers.index(departing_node.address)
+    threshold = coordinator.getThresholdForRitualSize(len(providers))
     index = 32 + participant_index * G2_SIZE + threshold * G1_SIZE
-    aggregated = bytearray(aggregated)
-    aggregated[index : index + G2_SIZE] = blinded_share
-    aggregated = bytes(aggregated)
-    assert coordinator.rituals(ritualID).aggregatedTranscript == aggregated
+    new_aggregated = bytearray(aggregated)
+    new_aggregated[index : index + G2_SIZE] = blinded_share
+    return bytes(new_aggregated)
+
 
+def test_finalize_handover_gas(
+    coordinator,
+    nodes,
+    initiator,
+    erc20,
+    fee_model,
+    accounts,
+    deployer,
+    global_allow_list,
+    application,
+):
+    handover_supervisor = accounts[MAX_DKG_SIZE]
+    coordinator.grantRole(
+        coordinator.HANDOVER_SUPERVISOR_ROLE(), handover_supervisor, sender=deployer
+    )
+
+    # the same participant is replaced in a small and in the largest ritual
+    gas_used, transcript_sizes = list(), list()
+    for ritualID, ritual_nodes in enumerate((nodes[:4], nodes)):
+        initiate_ritual(coordinator, fee_model, erc20, initiator, ritual_nodes, global_allow_list)
+        _, aggregated = activate_ritual(ritual_nodes, coordinator, ritualID)
+        new_aggregated = prepare_handover(
+            coordinator,
+            application,
+            deployer,
+            handover_supervisor,
+            ritualID,
+            departing_node=ritual_nodes[0],
+            incoming_node=accounts[MAX_DKG_SIZE + 4 + ritualID],
+            aggregated=aggregated,
+        )
+        tx = coordinator.finalizeHandover(
+            ritualID, ritual_nodes[0], new_aggregated, sender=handover_supervisor
+        )
+        gas_used.append(tx.gas_used)
+        transcript_sizes.append(len(aggregated))
+
+    # the larger transcript only costs more calldata and hashing: reading it from storage
+    # would take at least a cold storage read per word
+    extra_words = (transcript_sizes[1] - transcript_sizes[0]) // 32
+    assert gas_used[1] - gas_used[0] < extra_words * COLD_SLOAD_GAS
+
+
+def test_finalize_handover_without_digest(
+    project,
+    nodes,
+    initiator,
+    erc20,
+    fee_manager,
+    accounts,
+    deployer,
+    oz_dependency,
+    application,
+):
+    coordinator = deploy_coordinator(
+        deployer,
+        application,
+        oz_dependency,
+        MAX_DKG_SIZE,
+        contract_type=project.LegacyDigestCoordinatorMock,
+    )
+    fee_model = deploy_fee_model(deployer, coordinator, erc20, fee_manager)
+    allow_list = project.GlobalAllowList.deploy(coordinator.address, sender=deployer)
+    handover_supervisor = accounts[MAX_DKG_SIZE]
+    coordinator.grantRole(
+        coordinator.HANDOVER_SUPERVISOR_ROLE(), handover_supervisor, sender=deployer
+    )
+
+    ritualID = 0
+    departing_node, incoming_node = nodes[1], accounts[MAX_DKG_SIZE + 4]
+    initiate_ritual(coordinator, fee_model, erc20, initiator, nodes, allow_list)
+    _, aggregated = activate_ritual(nodes, coordinator, ritualID)
+    # the ritual was aggregated before digests were recorded
+    coordinator.deleteAggregatedTranscriptDigest(ritualID, sender=deployer)
+    new_aggregated = prepare_handover(
+        coordinator,
+        application,
+        deployer,
+        handover_supervisor,
+        ritualID,
+        departing_node,
+        incoming_node,
+        aggregated,
+    )
+
+    # the transcript is checked against the stored one instead
+    tampered = bytearray(new_aggregated)
+    tampered[-1] ^= 0xFF
+    with ape.reverts("Aggregated transcript mismatch"):
+        coordinator.finalizeHandover(
+            ritualID, departing_node, bytes(tampered), sender=handover_supervisor
+        )
+
+    tx = coordinator.finalizeHandover(
+        ritualID, departing_node, new_aggregated, sender=handover_supervisor
+    )
+    assert coordinator.rituals(ritualID).aggregatedTranscript == new_aggregated
     events = [event for event in tx.events if event.event_name == "AggregationPosted"]
     assert events == [
         coordinator.AggregationPosted(
             ritualId=ritualID,
             node=incoming_node,
-            aggregatedTranscriptDigest=Web3.keccak(aggregated),
+            aggregatedTranscriptDigest=Web3.keccak(new_aggregated),
         )
     ]
@@ -0,0 +1,54 @@
+import subprocess
+import sys
+from pathlib import Path
+from typing import List, Tuple
+
+import pytest
+
+PROJECT_DIR = Path(__file__).parent.parent
+
+# Budget for the cumulative import time of a single deployment module
+IMPORT_TIME_BUDGET_MICROSECONDS = 500_000
+
+# Modules that must only be imported on first use
+HEAVY_MODULES = ("ape", "ape_etherscan", "requests", "web3", "yaml")
+
+
+def _import_time(module: str) -> Tuple[int, List[str]]:
+    """Returns the cumulative import time of the module and the heavy modules it loaded."""
+    code = (
+        f"import sys, {module}; "
+        f"print(','.join(m for m in {HEAVY_MODULES!r} if m in sys.modules))"
+    )
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_DIR,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    cumulative = None
+    for line in result.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        _, _, columns = line.partition("import time:")
+        fields = [field.strip() for field in columns.split("|")]
+        if len(fields) == 3 and fields[2] == module:
+            cumulative = int(fields[1])
+    assert cumulative is not None, f"No import time reported for {module}"
+    loaded = [m for m in result.stdout.strip().split(",") if m]
+    return cumulative, loaded
+
+
+@pytest.mark.parametrize(
+    "module",
+    [
+        "deployment.constants",
+        "deployment.networks",
+        "deployment.utils",
+        "deployment.registry",
+    ],
+)
+def test_deployment_import_time(module):
+    cumulative, loaded = _import_time(module)
+    assert not loaded, f"{module} eagerly imports {loaded}"
+    assert cumulative < IMPORT_TIME_BUDGET_MICROSECONDS
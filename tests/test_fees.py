@@ -0,0 +1,76 @@
+import pytest
+
+from deployment.fees import GWEI, FeeCapExceeded, Fees, FeeStrategy, fee_caps_from_config
+
+
+class ScriptedFeeHistory:
+    """Plays back eth_feeHistory results, one per call."""
+
+    def __init__(self, *histories):
+        self.histories = list(histories)
+        self.calls = list()
+
+    def __call__(self, block_count, newest_block, reward_percentiles):
+        self.calls.append((block_count, newest_block, reward_percentiles))
+        history = self.histories[min(len(self.calls), len(self.histories)) - 1]
+        return {
+            "baseFeePerGas": [base_fee * GWEI for base_fee in history["base_fees"]],
+            "reward": [[reward * GWEI] for reward in history["rewards"]],
+        }
+
+
+CALM = {"base_fees": [30, 31, 30, 32], "rewards": [2, 0, 3]}
+CONGESTED = {"base_fees": [300, 330, 360, 400], "rewards": [40, 50, 60]}
+
+
+def test_suggest_fees():
+    fee_history = ScriptedFeeHistory(CALM)
+    strategy = FeeStrategy(fee_history=fee_history, block_count=3, reward_percentile=60)
+    fees = strategy.suggest_fees()
+    # empty blocks (zero reward) are ignored; median of 2 and 3 gwei
+    assert fees.max_priority_fee == int(2.5 * GWEI)
+    # twice the base fee of the next block plus the priority fee
+    assert fees.max_fee == 2 * 32 * GWEI + int(2.5 * GWEI)
+    assert fee_history.calls == [(3, "latest", [60])]
+
+
+def test_suggest_fees_capped():
+    caps = Fees(max_fee=500 * GWEI, max_priority_fee=30 * GWEI)
+    strategy = FeeStrategy(fee_history=ScriptedFeeHistory(CONGESTED), caps=caps)
+    assert strategy.suggest_fees() == caps
+
+
+def test_replacement_fees():
+    strategy = FeeStrategy(fee_history=ScriptedFeeHistory(CALM))
+    sent = strategy.suggest_fees()
+
+    # fees are bumped by at least the 10% nodes require for replacements
+    replacement = strategy.replacement_fees(sent)
+    assert replacement.max_fee >= sent.max_fee * 1.1
+    assert replacement.max_priority_fee >= sent.max_priority_fee * 1.1
+
+    # when the network gets congested, the replacement follows the fee history
+    strategy = FeeStrategy(fee_history=ScriptedFeeHistory(CALM, CONGESTED))
+    sent = strategy.suggest_fees()
+    replacement = strategy.replacement_fees(sent)
+    assert replacement == Fees(max_fee=2 * 400 * GWEI + 50 * GWEI, max_priority_fee=50 * GWEI)
+
+
+def test_replacement_fees_capped():
+    caps = Fees(max_fee=100 * GWEI, max_priority_fee=10 * GWEI)
+    strategy = FeeStrategy(fee_history=ScriptedFeeHistory(CALM), caps=caps)
+    sent = Fees(max_fee=95 * GWEI, max_priority_fee=5 * GWEI)
+    with pytest.raises(FeeCapExceeded):
+        strategy.replacement_fees(sent)
+
+
+def test_fee_caps_from_config():
+    fee_caps_config = {
+        "polygon": {"amoy": {"max_fee": "500 gwei", "max_priority_fee": "100 gwei"}},
+    }
+    caps = fee_caps_from_config(fee_caps_config, "polygon", "amoy")
+    assert caps == Fees(max_fee=500 * GWEI, max_priority_fee=100 * GWEI)
+
+    # networks without caps are not capped
+    assert fee_caps_from_config(fee_caps_config, "polygon", "mainnet") is None
+    assert fee_caps_from_config(fee_caps_config, "ethereum", "mainnet") is None
@@ -0,0 +1,103 @@
+import time
+
+import pytest
+
+from deployment.legacy import CreationInfoFetcher, CreationInfoNotFound
+from deployment.utils import TokenBucket
+
+DEPLOYER = "0x3B42d26E19FF860bC4dEbB920DD8caA53F93c600"
+ADDRESSES = [f"0x{i:040x}" for i in range(1, 6)]
+UNKNOWN_ADDRESS = f"0x{99:040x}"
+
+
+class StubExplorer:
+    def __init__(self):
+        self.failures = dict()  # address -> number of 503 responses before succeeding
+
+    def __call__(self, params):
+        address = params["address"]
+        if self.failures.get(address, 0) > 0:
+            self.failures[address] -= 1
+            return 503, None
+
+        if address == UNKNOWN_ADDRESS:
+            return 200, {"status": "0", "message": "No transactions found", "result": []}
+        tx = {"hash": f"0x{address[-4:]:0>64}", "blockNumber": "42", "from": DEPLOYER.lower()}
+        return 200, {"status": "1", "message": "OK", "result": [tx]}
+
+
+@pytest.fixture()
+def explorer(stub_server):
+    stub_server.respond = StubExplorer()
+    return stub_server
+
+
+def requested_addresses(explorer):
+    return [params["address"] for params in explorer.requests]
+
+
+def _fetcher(explorer, cache_dir, **kwargs):
+    return CreationInfoFetcher(
+        api_key="test",
+        chain_id=1,
+        api_url=f"{explorer.url}/api",
+        rate_limit=100,
+        backoff=0.01,
+        cache_dir=cache_dir,
+        **kwargs,
+    )
+
+
+def test_token_bucket_rate():
+    bucket = TokenBucket(rate=50, capacity=1)
+    started = time.monotonic()
+    for _ in range(11):
+        bucket.acquire()
+    # the first token is available immediately, the next 10 take 1/50s each
+    assert time.monotonic() - started >= 10 / 50 * 0.9
+
+
+def test_fetch_many_and_cache(explorer, tmp_path):
+    fetcher = _fetcher(explorer, tmp_path)
+    creation_info = fetcher.fetch_many(ADDRESSES)
+    assert list(creation_info) == ADDRESSES
+    for address, info in creation_info.items():
+        assert info.tx_hash == f"0x{address[-4:]:0>64}"
+        assert info.block_number == 42
+        assert info.deployer == DEPLOYER
+    assert sorted(requested_addresses(explorer)) == sorted(ADDRESSES)
+
+    # reconversions are served from the on-disk cache
+    assert _fetcher(explorer, tmp_path).fetch_many(ADDRESSES) == creation_info
+    assert len(explorer.requests) == len(ADDRESSES)
+
+    # the cache is keyed by chain ID as well
+    other_chain_fetcher = CreationInfoFetcher(
+        api_key="test",
+        chain_id=5,
+        api_url=f"{explorer.url}/api",
+        rate_limit=100,
+        cache_dir=tmp_path,
+    )
+    other_chain_fetcher.fetch(ADDRESSES[0])
+    assert len(explorer.requests) == len(ADDRESSES) + 1
+
+
+def test_fetch_retries(explorer, tmp_path):
+    address = ADDRESSES[0]
+    explorer.respond.failures[address] = 2
+    info = _fetcher(explorer, tmp_path).fetch(address)
+    assert info.block_number == 42
+    assert requested_addresses(explorer) == [address] * 3
+
+    explorer.requests.clear()
+    explorer.respond.failures[ADDRESSES[1]] = 3
+    with pytest.raises(ConnectionError):
+        _fetcher(explorer, tmp_path, max_retries=2).fetch(ADDRESSES[1])
+    assert requested_addresses(explorer) == [ADDRESSES[1]] * 3
+
+
+def test_fetch_unknown_contract(explorer, tmp_path):
+    with pytest.raises(CreationInfoNotFound):
+        _fetcher(explorer, tmp_path).fetch(UNKNOWN_ADDRESS)
+    assert not (tmp_path / "1").exists()
@@ -0,0 +1,123 @@
+import pytest
+
+from deployment.metrics import MetricsCollector
+from deployment.multicall import Call, Multicall
+from deployment.ritual_monitor import RitualMonitor
+from tests.conftest import RitualState, gen_public_key, generate_transcript
+
+MAX_DKG_SIZE = 4
+DURATION = 48 * 60 * 60
+POOL_FUNDS = 10**18
+
+
+@pytest.fixture(scope="module")
+def nodes(accounts):
+    return sorted(accounts[:MAX_DKG_SIZE], key=lambda x: x.address.lower())
+
+
+@pytest.fixture(scope="module")
+def initiator(accounts):
+    return accounts[MAX_DKG_SIZE]
+
+
+@pytest.fixture(scope="module")
+def deployer(accounts):
+    return accounts[MAX_DKG_SIZE + 1]
+
+
+@pytest.fixture(scope="module")
+def fee_manager(deployer):
+    return deployer
+
+
+@pytest.fixture()
+def reimbursement_pool(project, deployer):
+    contract = project.ReimbursementPool.deploy(40_000, 10**11, sender=deployer)
+    deployer.transfer(contract.address, POOL_FUNDS)
+    return contract
+
+
+@pytest.fixture()
+def multicall(project, deployer):
+    # the deployed mock is reached through the ABI bundled with the deployment tooling
+    multicall = project.Multicall3.deploy(sender=deployer)
+    return Multicall.from_provider(address=multicall.address, batch_size=2)
+
+
+def initiate_ritual(coordinator, fee_model, erc20, initiator, nodes, global_allow_list):
+    cost = fee_model.getRitualCost(len(nodes), DURATION)
+    erc20.approve(fee_model.address, cost, sender=initiator)
+    coordinator.initiateRitual(
+        fee_model, nodes, initiator, DURATION, global_allow_list.address, sender=initiator
+    )
+
+
+def test_multicall(multicall, coordinator, application, nodes):
+    calls = [
+        Call(coordinator, "maxDkgSize"),
+        Call(coordinator, "getRitualState", (0,)),
+        Call(application, "authorizedStake", (nodes[0],)),
+        # reverts for a ritual that isn't finalized
+        Call(coordinator, "getPublicKeyFromRitualId", (0,)),
+        multicall.block_number(),
+    ]
+    max_dkg_size, state, stake, public_key, block_number = multicall.call(calls)
+    assert max_dkg_size == MAX_DKG_SIZE
+    assert state == RitualState.NON_INITIATED
+    assert stake == 42
+    assert public_key is None
+    assert block_number > 0
+
+
+def test_metrics_collector(
+    chain,
+    deployer,
+    coordinator,
+    fee_model,
+    erc20,
+    initiator,
+    nodes,
+    global_allow_list,
+    reimbursement_pool,
+    multicall,
+):
+    for node in nodes:
+        coordinator.setProviderPublicKey(gen_public_key(), sender=node)
+    for _ in range(2):
+        initiate_ritual(coordinator, fee_model, erc20, initiator, nodes, global_allow_list)
+
+    transcript = generate_transcript(len(nodes), coordinator.getThresholdForRitualSize(len(nodes)))
+    for node in nodes[:2]:
+        coordinator.publishTranscript(1, transcript, sender=node)
+
+    collector = MetricsCollector(
+        contracts={
+            "Coordinator": coordinator,
+            "ReimbursementPool": reimbursement_pool,
+            "FlatRateFeeModel": fee_model,
+        },
+        multicall=multicall,
+        ritual_monitor=RitualMonitor(
+            coordinator=coordinator, from_block=0, confirmations=0, on_transition=print
+        ),
+    )
+    collector.collect()
+    metrics = collector.render()
+
+    assert 'taco_rituals{state="DKG_AWAITING_TRANSCRIPTS"} 2' in metrics
+    assert 'taco_rituals{state="ACTIVE"} 0' in metrics
+    assert f"taco_reimbursement_pool_balance_wei {POOL_FUNDS}" in metrics
+    for node in nodes[:2]:
+        assert f'node="{node.address}",ritual_id="1"' in metrics
+    assert f'node="{nodes[2].address}"' not in metrics
+
+    # payouts decrease the pool balance between scrapes
+    first_block = collector.block_number._samples[()]
+    refunded = POOL_FUNDS // 10
+    reimbursement_pool.withdraw(refunded, initiator, sender=deployer)
+    chain.mine(4)
+    collector.collect()
+    blocks = collector.block_number._samples[()] - first_block
+    assert blocks >= 5
+    metrics = collector.render()
+    assert f"taco_reimbursement_pool_refunds_wei_per_block {refunded / blocks}" in metrics
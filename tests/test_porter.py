@@ -0,0 +1,90 @@
+import pytest
+
+from deployment.constants import LYNX, MAINNET
+from deployment.porter import PorterClient, PorterError, RetryablePorterError
+
+URSULAS = [f"0x{i:040X}" for i in (3, 1, 2)]
+
+
+class FakeTransport:
+    def __init__(self, failures=0):
+        self.calls = list()
+        self.failures = failures
+
+    def __call__(self, url, params, timeout):
+        self.calls.append(params)
+        if self.failures:
+            self.failures -= 1
+            raise RetryablePorterError("503 Service Unavailable")
+        ursulas = URSULAS[: params["quantity"]]
+        return {"result": {"ursulas": [{"checksum_address": u} for u in ursulas]}}
+
+
+def test_get_ursulas_is_cached_on_testnets():
+    transport = FakeTransport()
+    client = PorterClient(domain=LYNX, transport=transport, cache_ttl=60)
+
+    ursulas = client.get_ursulas(quantity=3, duration=86400)
+    assert ursulas == sorted(URSULAS, key=str.lower)
+    assert client.get_ursulas(quantity=3, duration=86400) == ursulas
+    assert len(transport.calls) == 1
+
+    # different parameters are a different cache entry
+    assert client.get_ursulas(quantity=2, duration=86400) == sorted(URSULAS[:2], key=str.lower)
+    assert len(transport.calls) == 2
+
+    # expired entries are fetched again
+    client = PorterClient(domain=LYNX, transport=transport, cache_ttl=0)
+    client.get_ursulas(quantity=3)
+    client.get_ursulas(quantity=3)
+    assert len(transport.calls) == 4
+
+
+def test_get_ursulas_retries():
+    transport = FakeTransport(failures=2)
+    client = PorterClient(domain=LYNX, transport=transport, backoff=0.01)
+    assert len(client.get_ursulas(quantity=3)) == 3
+    assert len(transport.calls) == 3
+
+    transport = FakeTransport(failures=3)
+    client = PorterClient(domain=LYNX, transport=transport, backoff=0.01, max_retries=2)
+    with pytest.raises(PorterError):
+        client.get_ursulas(quantity=3)
+    assert len(transport.calls) == 3
+
+
+def test_random_seed_only_on_mainnet():
+    client = PorterClient(domain=LYNX, transport=FakeTransport())
+    with pytest.raises(ValueError):
+        client.get_ursulas(quantity=3, random_seed=42)
+
+
+class FakePorter:
+    def __init__(self, failures=0):
+        self.failures = failures
+
+    def __call__(self, params):
+        if self.failures:
+            self.failures -= 1
+            return 503, None
+        ursulas = URSULAS[: int(params["quantity"])]
+        return 200, {"result": {"ursulas": ursulas}}
+
+
+def test_requests_transport_against_fake_porter(stub_server):
+    stub_server.respond = FakePorter(failures=1)
+    porter_url = f"{stub_server.url}/bucket_sampling"
+    client = PorterClient(domain=MAINNET, endpoint=porter_url, backoff=0.01)
+    excluded = URSULAS[0].lower()
+    ursulas = client.get_ursulas(quantity=2, random_seed=42, exclude_ursulas=[excluded])
+    assert ursulas == sorted(URSULAS[:2], key=str.lower)
+    assert len(stub_server.requests) == 2
+    assert stub_server.requests[-1] == {
+        "quantity": "2",
+        "random_seed": "42",
+        "exclude_ursulas": URSULAS[0],
+    }
+
+    # mainnet sampling is seeded and never cached
+    client.get_ursulas(quantity=2, random_seed=42)
+    assert len(stub_server.requests) == 3
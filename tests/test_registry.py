@@ -0,0 +1,289 @@
+import json
+import os
+import stat
+import threading
+
+import pytest
+from click.testing import CliRunner
+
+from deployment import registry
+from deployment.registry import (
+    ConflictResolution,
+    DiffStatus,
+    MergeRule,
+    RegistryEntry,
+    RegistryMergeConflict,
+    merge_registry_entries,
+    read_registry,
+    update_registry,
+    write_registry,
+)
+from scripts.merge_registries import cli as merge_registries_cli
+
+ABI = [
+    {"type": "function", "name": "b", "inputs": [], "outputs": []},
+    {"type": "function", "name": "a", "inputs": [], "outputs": []},
+    {"type": "event", "name": "C", "inputs": [], "anonymous": False},
+]
+
+
+def entry(name, address_index, block_number=1, chain_id=1, abi=ABI):
+    return RegistryEntry(
+        chain_id=chain_id,
+        name=name,
+        address=f"0x{address_index:040x}",
+        abi=abi,
+        tx_hash=f"0x{address_index:064x}",
+        block_number=block_number,
+        deployer=f"0x{0xde:040x}",
+    )
+
+
+REGISTRY_1 = [
+    entry("Coordinator", 1, block_number=10),
+    entry("TACoChildApplication", 2),
+    entry("Deprecated", 3),
+    entry("OnlyIn1", 4),
+]
+REGISTRY_2 = [
+    entry("Coordinator", 5, block_number=20),
+    entry("TACoChildApplication", 2, abi=list(reversed(ABI))),
+    entry("Deprecated", 3),
+    entry("OnlyIn2", 6),
+    entry("Coordinator", 7, chain_id=2),
+]
+
+
+def statuses(result):
+    return {(d.chain_id, d.name): d.status for d in result.diff}
+
+
+def addresses(entries):
+    return {(e.chain_id, e.name): e.address for e in entries}
+
+
+def test_merge_registry_entries():
+    result = merge_registry_entries(
+        iter(REGISTRY_1),
+        iter(REGISTRY_2),
+        rule=MergeRule.NEWER,
+        deprecated_contracts=["Deprecated"],
+    )
+    assert statuses(result) == {
+        (1, "Coordinator"): DiffStatus.CONFLICT,
+        (1, "TACoChildApplication"): DiffStatus.IDENTICAL,  # only the ABI order differs
+        (1, "Deprecated"): DiffStatus.DEPRECATED,
+        (1, "OnlyIn1"): DiffStatus.KEPT,
+        (1, "OnlyIn2"): DiffStatus.ADDED,
+        (2, "Coordinator"): DiffStatus.ADDED,  # entries are keyed by chain too
+    }
+    assert addresses(result.entries) == {
+        (1, "Coordinator"): REGISTRY_2[0].address,
+        (1, "TACoChildApplication"): REGISTRY_1[1].address,
+        (1, "OnlyIn1"): REGISTRY_1[3].address,
+        (1, "OnlyIn2"): REGISTRY_2[3].address,
+        (2, "Coordinator"): REGISTRY_2[4].address,
+    }
+    (conflict,) = result.conflicts
+    assert conflict.selected == 2
+    assert (conflict.address_1, conflict.address_2) == (
+        REGISTRY_1[0].address,
+        REGISTRY_2[0].address,
+    )
+    assert (conflict.block_number_1, conflict.block_number_2) == (10, 20)
+    assert not result.unresolved
+
+
+@pytest.mark.parametrize(
+    "rule,selected",
+    [
+        (MergeRule.REGISTRY_1, 1),
+        (MergeRule.REGISTRY_2, 2),
+        (MergeRule.ABORT, None),
+        (MergeRule.INTERACTIVE, None),  # without a way to prompt
+    ],
+)
+def test_merge_rules(rule, selected):
+    result = merge_registry_entries(iter(REGISTRY_1[:1]), iter(REGISTRY_2[:1]), rule=rule)
+    (conflict,) = result.conflicts
+    assert conflict.selected == selected
+    if selected is None:
+        assert result.unresolved == [conflict]
+        assert result.entries == []
+    else:
+        assert result.entries == [(REGISTRY_1 if selected == 1 else REGISTRY_2)[0]]
+
+
+def test_merge_rule_newer_prefers_registry_2_on_ties():
+    entry_1, entry_2 = entry("Coordinator", 1), entry("Coordinator", 2)
+    result = merge_registry_entries(iter([entry_1]), iter([entry_2]), rule=MergeRule.NEWER)
+    assert result.entries == [entry_2]
+    result = merge_registry_entries(iter([entry_2]), iter([entry_1]), rule=MergeRule.NEWER)
+    assert result.entries == [entry_1]
+
+
+def test_merge_rule_interactive():
+    prompted = list()
+
+    def select_interactively(entry_1, entry_2):
+        prompted.append((entry_1, entry_2))
+        return ConflictResolution.USE_1
+
+    result = merge_registry_entries(
+        iter(REGISTRY_1),
+        iter(REGISTRY_2),
+        rule=MergeRule.INTERACTIVE,
+        select_interactively=select_interactively,
+    )
+    # only conflicts are prompted for
+    assert prompted == [(REGISTRY_1[0], REGISTRY_2[0])]
+    assert addresses(result.entries)[(1, "Coordinator")] == REGISTRY_1[0].address
+
+
+@pytest.fixture()
+def registries(tmp_path):
+    registry_1, registry_2 = tmp_path / "registry_1.json", tmp_path / "registry_2.json"
+    write_registry(entries=REGISTRY_1, filepath=registry_1, silent=True)
+    write_registry(entries=REGISTRY_2, filepath=registry_2, silent=True)
+    return registry_1, registry_2
+
+
+def merge(registry_1, registry_2, *options):
+    args = ["--registry-1", str(registry_1), "--registry-2", str(registry_2), *options]
+    return CliRunner().invoke(merge_registries_cli, args)
+
+
+def test_merge_registries_cli(tmp_path, registries):
+    output = tmp_path / "merged.json"
+    result = merge(*registries, "-o", str(output), "--rule", "registry-1", "-d", "Deprecated")
+    assert result.exit_code == 0, result.output
+    merged = read_registry(output)
+    assert addresses(merged) == {
+        (1, "Coordinator"): REGISTRY_1[0].address,
+        (1, "TACoChildApplication"): REGISTRY_1[1].address,
+        (1, "OnlyIn1"): REGISTRY_1[3].address,
+        (1, "OnlyIn2"): REGISTRY_2[3].address,
+        (2, "Coordinator"): REGISTRY_2[4].address,
+    }
+
+    # an output registry is required unless checking
+    result = merge(*registries, "--rule", "registry-1")
+    assert result.exit_code != 0
+    assert "Output registry required" in result.output
+
+
+def test_merge_registries_cli_check(tmp_path, registries):
+    output, diff = tmp_path / "merged.json", tmp_path / "diff.json"
+
+    # check mode never prompts: conflicts are unresolved with the default interactive rule
+    result = merge(*registries, "--check", "--diff", str(diff))
+    assert isinstance(result.exception, RegistryMergeConflict)
+    assert "Coordinator on chain 1" in str(result.exception)
+
+    # the diff is written regardless
+    diff_data = json.loads(diff.read_text())
+    conflict = next(d for d in diff_data if d["status"] == DiffStatus.CONFLICT.value)
+    assert conflict == {
+        "chain_id": 1,
+        "name": "Coordinator",
+        "status": "conflict",
+        "address_1": REGISTRY_1[0].address,
+        "address_2": REGISTRY_2[0].address,
+        "block_number_1": 10,
+        "block_number_2": 20,
+        "selected": None,
+    }
+
+    result = merge(*registries, "--check", "--rule", "newer", "-o", str(output))
+    assert result.exit_code == 0, result.output
+    assert "1 conflict(s) resolved by rule 'newer'" in result.output
+    # nothing but the diff is written
+    assert not output.exists()
+
+
+def test_update_registry(tmp_path):
+    filepath = tmp_path / "registry.json"
+    update_registry(entries=REGISTRY_1, filepath=filepath)
+    assert addresses(read_registry(filepath)) == addresses(REGISTRY_1)
+
+    # entries of the same contracts are replaced, the rest of the chain is kept
+    other_chain = entry("Coordinator", 8, chain_id=2)
+    update_registry(entries=[REGISTRY_2[0], REGISTRY_2[3], other_chain], filepath=filepath)
+    assert addresses(read_registry(filepath)) == {
+        (1, "Coordinator"): REGISTRY_2[0].address,
+        (1, "TACoChildApplication"): REGISTRY_1[1].address,
+        (1, "Deprecated"): REGISTRY_1[2].address,
+        (1, "OnlyIn1"): REGISTRY_1[3].address,
+        (1, "OnlyIn2"): REGISTRY_2[3].address,
+        (2, "Coordinator"): other_chain.address,
+    }
+    assert not filepath.with_suffix(".unmerged.json").exists()
+
+    # only the chains of the entries are replaced as a whole
+    update_registry(entries=REGISTRY_1[:1], filepath=filepath, replace_chains=True)
+    assert addresses(read_registry(filepath)) == {
+        (1, "Coordinator"): REGISTRY_1[0].address,
+        (2, "Coordinator"): other_chain.address,
+    }
+
+    # the result is the same as writing the registry at once
+    expected = tmp_path / "expected.json"
+    write_registry(entries=[REGISTRY_1[0], other_chain], filepath=expected, silent=True)
+    assert filepath.read_text() == expected.read_text()
+
+
+def test_registry_write_is_atomic(tmp_path, monkeypatch):
+    filepath = tmp_path / "registry.json"
+    write_registry(entries=REGISTRY_1[:1], filepath=filepath, silent=True)
+    content = filepath.read_text()
+
+    def failing_dump(data, file, **kwargs):
+        file.write("{")
+        raise RuntimeError("Interrupted")
+
+    # a failed write leaves neither partial content nor temporary files behind
+    monkeypatch.setattr(registry.json, "dump", failing_dump)
+    with pytest.raises(RuntimeError):
+        write_registry(entries=REGISTRY_1[1:2], filepath=filepath, silent=True)
+    assert filepath.read_text() == content
+    assert os.listdir(tmp_path) == [filepath.name]
+
+
+def test_registry_file_mode(tmp_path):
+    umask = os.umask(0o022)
+    try:
+        filepath = tmp_path / "registry.json"
+        write_registry(entries=REGISTRY_1[:1], filepath=filepath, silent=True)
+        assert stat.S_IMODE(filepath.stat().st_mode) == 0o644
+
+        # the mode of an existing registry is kept
+        filepath.chmod(0o664)
+        write_registry(
+            entries=[entry("Coordinator", 1, chain_id=2)], filepath=filepath, silent=True
+        )
+        assert stat.S_IMODE(filepath.stat().st_mode) == 0o664
+        assert len(read_registry(filepath)) == 2
+    finally:
+        os.umask(umask)
+
+
+@pytest.mark.skipif(registry.fcntl is None, reason="flock is not available")
+def test_registry_lock(tmp_path):
+    filepath = tmp_path / "registry.json"
+    write_registry(entries=REGISTRY_1[:1], filepath=filepath, silent=True)
+
+    def update():
+        write_registry(
+            entries=[entry("Coordinator", 1, chain_id=2)], filepath=filepath, silent=True
+        )
+
+    # concurrent writers wait for the read-modify-write cycle in progress
+    with registry._registry_lock(filepath):
+        writer = threading.Thread(target=update)
+        writer.start()
+        writer.join(timeout=0.5)
+        assert writer.is_alive()
+        assert len(read_registry(filepath)) == 1
+    writer.join(timeout=5)
+    assert not writer.is_alive()
+    assert len(read_registry(filepath)) == 2
@@ -0,0 +1,121 @@
+import ape
+import pytest
+
+from deployment.reimbursements import get_accrued_reimbursements
+
+STATIC_GAS = 40_000
+MAX_GAS_PRICE = 10**11
+GAS_PRICE = 10**10
+POOL_FUNDS = 10**18
+GAS_SPENT = 100_000
+REFUND = (GAS_SPENT + STATIC_GAS) * GAS_PRICE
+
+
+@pytest.fixture(scope="module")
+def deployer(accounts):
+    return accounts[0]
+
+
+@pytest.fixture(scope="module")
+def caller(accounts):
+    # stands in for an authorized contract, e.g. the Coordinator
+    return accounts[1]
+
+
+@pytest.fixture(scope="module")
+def operators(accounts):
+    return accounts[2:5]
+
+
+@pytest.fixture()
+def reimbursement_pool(project, deployer, caller):
+    contract = project.ReimbursementPool.deploy(STATIC_GAS, MAX_GAS_PRICE, sender=deployer)
+    contract.authorize(caller, sender=deployer)
+    deployer.transfer(contract.address, POOL_FUNDS)
+    return contract
+
+
+def refund(reimbursement_pool, caller, receiver):
+    return reimbursement_pool.refund(
+        GAS_SPENT, receiver, sender=caller, max_fee=GAS_PRICE, max_priority_fee=GAS_PRICE
+    )
+
+
+def test_accrual_mode(reimbursement_pool, deployer, caller, operators):
+    operator = operators[0]
+
+    with ape.reverts():
+        reimbursement_pool.setAccrualMode(True, sender=operator)
+
+    # Refunds are sent right away by default
+    balance_before = operator.balance
+    refund(reimbursement_pool, caller, operator)
+    assert operator.balance == balance_before + REFUND
+    assert reimbursement_pool.accrued(operator) == 0
+
+    tx = reimbursement_pool.setAccrualMode(True, sender=deployer)
+    assert tx.events == [reimbursement_pool.AccrualModeUpdated(enabled=True)]
+    assert reimbursement_pool.accrualMode()
+
+    # Refunds are accrued
+    tx = refund(reimbursement_pool, caller, operator)
+    refund(reimbursement_pool, caller, operator)
+    assert tx.events == [reimbursement_pool.RefundAccrued(refundAmount=REFUND, receiver=operator)]
+    assert operator.balance == balance_before + REFUND
+    assert reimbursement_pool.accrued(operator) == 2 * REFUND
+    assert reimbursement_pool.totalAccrued() == 2 * REFUND
+
+    # Accrued refunds are reserved
+    pool_balance = reimbursement_pool.balance
+    with ape.reverts("Insufficient contract balance"):
+        reimbursement_pool.withdraw(pool_balance - REFUND, deployer, sender=deployer)
+
+    # Accruals remain claimable after disabling accrual mode
+    reimbursement_pool.setAccrualMode(False, sender=deployer)
+    with ape.reverts("Nothing to claim"):
+        reimbursement_pool.claim(sender=operators[1])
+
+    balance_before = operator.balance
+    tx = reimbursement_pool.claim(sender=operator, max_fee=GAS_PRICE, max_priority_fee=GAS_PRICE)
+    assert tx.events == [
+        reimbursement_pool.RefundClaimed(claimedAmount=2 * REFUND, receiver=operator)
+    ]
+    assert operator.balance == balance_before + 2 * REFUND - tx.total_fees_paid
+    assert reimbursement_pool.accrued(operator) == 0
+    assert reimbursement_pool.totalAccrued() == 0
+    assert reimbursement_pool.balance == pool_balance - 2 * REFUND
+
+
+def test_accrual_requires_funds(reimbursement_pool, deployer, caller, operators):
+    operator = operators[0]
+    reimbursement_pool.setAccrualMode(True, sender=deployer)
+    refund(reimbursement_pool, caller, operator)
+
+    # Only the accrued refund is left in the pool
+    reimbursement_pool.withdrawAll(deployer, sender=deployer)
+    assert reimbursement_pool.balance == REFUND
+
+    tx = refund(reimbursement_pool, caller, operators[1])
+    assert tx.events == [
+        reimbursement_pool.SendingEtherFailed(refundAmount=REFUND, receiver=operators[1])
+    ]
+    assert reimbursement_pool.accrued(operators[1]) == 0
+    assert reimbursement_pool.totalAccrued() == REFUND
+
+
+def test_accrued_reimbursements_report(chain, reimbursement_pool, deployer, caller, operators):
+    from_block = chain.blocks.head.number
+    reimbursement_pool.setAccrualMode(True, sender=deployer)
+    for times, operator in enumerate(operators, start=1):
+        for _ in range(times):
+            refund(reimbursement_pool, caller, operator)
+    reimbursement_pool.claim(sender=operators[0])
+
+    accruals = get_accrued_reimbursements(
+        reimbursement_pool=reimbursement_pool, from_block=from_block, block_window=2
+    )
+    assert [(accrual.operator, accrual.amount) for accrual in accruals] == [
+        (operators[2], 3 * REFUND),
+        (operators[1], 2 * REFUND),
+    ]
+    assert all(accrual.staking_provider is None for accrual in accruals)
@@ -0,0 +1,75 @@
+from types import SimpleNamespace
+
+from deployment.constants import RitualState
+from deployment.ritual_monitor import RitualMonitor
+
+NODES = [f"0x{i:040x}" for i in range(1, 4)]
+DKG_TIMEOUT = 3600
+
+
+def _monitor(**kwargs):
+    coordinator = SimpleNamespace(dkgTimeout=lambda: DKG_TIMEOUT)
+    transitions = list()
+    monitor = RitualMonitor(
+        coordinator=coordinator,
+        from_block=0,
+        on_transition=lambda ritual, previous: transitions.append((previous, ritual.state)),
+        **kwargs,
+    )
+    return monitor, transitions
+
+
+def test_ritual_lifecycle():
+    monitor, transitions = _monitor()
+    monitor.apply("StartRitual", {"ritualId": 0, "participants": NODES}, 10, 1000)
+    for i, node in enumerate(NODES):
+        monitor.apply("TranscriptPosted", {"ritualId": 0, "node": node}, 11 + i, 1010 + i)
+    monitor.apply("StartAggregationRound", {"ritualId": 0}, 13, 1012)
+    ritual = monitor.rituals[0]
+    assert ritual.transcript_lags == {NODES[0]: 10, NODES[1]: 11, NODES[2]: 12}
+    assert ritual.missing == NODES
+
+    for node in NODES[:2]:
+        monitor.apply("AggregationPosted", {"ritualId": 0, "node": node}, 20, 1100)
+    assert ritual.missing == NODES[2:]
+    monitor.apply("AggregationPosted", {"ritualId": 0, "node": NODES[2]}, 21, 1200)
+    monitor.apply("EndRitual", {"ritualId": 0, "successful": True}, 21, 1200)
+
+    assert ritual.aggregation_lags[NODES[2]] == 200
+    assert transitions == [
+        (RitualState.NON_INITIATED, RitualState.DKG_AWAITING_TRANSCRIPTS),
+        (RitualState.DKG_AWAITING_TRANSCRIPTS, RitualState.DKG_AWAITING_AGGREGATIONS),
+        (RitualState.DKG_AWAITING_AGGREGATIONS, RitualState.ACTIVE),
+    ]
+
+
+def test_ritual_filter_and_unknown_rituals():
+    monitor, transitions = _monitor(ritual_ids=[1])
+    monitor.apply("StartRitual", {"ritualId": 0, "participants": NODES}, 10, 1000)
+    # ritual 2 started before the first monitored block
+    monitor.apply("TranscriptPosted", {"ritualId": 2, "node": NODES[0]}, 11, 1010)
+    monitor.apply("EndRitual", {"ritualId": 2, "successful": False}, 12, 1020)
+    assert monitor.rituals == {}
+    assert transitions == []
+
+
+def test_timeout_risk_and_timeout(capsys):
+    monitor, transitions = _monitor(timeout_risk_threshold=0.5)
+    monitor.apply("StartRitual", {"ritualId": 0, "participants": NODES}, 10, 1000)
+    monitor.apply("TranscriptPosted", {"ritualId": 0, "node": NODES[0]}, 11, 1010)
+
+    monitor._check_timeouts(now=1000 + DKG_TIMEOUT // 4)
+    assert "at risk" not in capsys.readouterr().out
+
+    monitor._check_timeouts(now=1000 + DKG_TIMEOUT // 2)
+    output = capsys.readouterr().out
+    assert "Ritual #0 at risk of timing out in 1800s" in output
+    assert NODES[1] in output and NODES[2] in output and NODES[0] not in output
+
+    # reported only once
+    monitor._check_timeouts(now=1000 + DKG_TIMEOUT // 2 + 1)
+    assert "at risk" not in capsys.readouterr().out
+
+    monitor._check_timeouts(now=1000 + DKG_TIMEOUT + 1)
+    assert monitor.rituals[0].state == RitualState.DKG_TIMEOUT
+    assert transitions[-1] == (RitualState.DKG_AWAITING_TRANSCRIPTS, RitualState.DKG_TIMEOUT)
@@ -6,7 +6,12 @@ from eth.constants import ZERO_ADDRESS
 from eth_account.messages import _hash_eip191_message, encode_defunct
 from web3 import Web3
 
-from tests.conftest import ERC1271_INVALID_SIGNATURE, ERC1271_MAGIC_VALUE_BYTES, SigningRitualState
+from tests.conftest import (
+    ERC1271_INVALID_SIGNATURE,
+    ERC1271_MAGIC_VALUE_BYTES,
+    SigningRitualState,
+    check_authorized_stakes_gas,
+)
 
 TIMEOUT = 1000
 MAX_DKG_SIZE = 20
@@ -223,6 +228,11 @@ def other_chain_signing_coordinator_child(
     return _other_signing_coordinator_child
 
 
+def test_authorized_stakes_gas(deployer, nodes, oz_dependency):
+    # initiating a signing cohort queries authorizations of all the nodes
+    check_authorized_stakes_gas(deployer, oz_dependency, nodes)
+
+
 #
 # Signing
 #
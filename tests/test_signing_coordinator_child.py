@@ -2,6 +2,7 @@ import os
 
 import ape
 import pytest
+from ape.utils import ZERO_ADDRESS
 from eth_utils import to_checksum_address
 
 NUM_SIGNERS = 5
@@ -195,3 +196,135 @@ def test_update_multisig_parameters(
     )
     assert cohort_multisig_contract.threshold() == new_threshold
     assert cohort_multisig_contract.getSigners() == new_signers
+
+
+def test_counterfactual_deploy_cohort_multisig(
+    project,
+    chain,
+    deployer,
+    allowed_caller,
+    unauthorized_caller,
+    signers,
+    signing_coordinator_child,
+):
+    cohort_id = 7
+
+    # must be owner
+    with ape.reverts(f"account={allowed_caller.address}"):
+        signing_coordinator_child.setCounterfactualDeployment(True, sender=allowed_caller)
+
+    signing_coordinator_child.setCounterfactualDeployment(True, sender=deployer)
+    assert signing_coordinator_child.counterfactualDeployment()
+
+    factory = project.ThresholdSigningMultisigCloneFactory.at(
+        signing_coordinator_child.signingMultisigFactory()
+    )
+    expected_address = factory.getCloneAddress(cohort_id)
+
+    tx = signing_coordinator_child.deployCohortMultiSig(
+        cohort_id, signers, THRESHOLD, sender=allowed_caller
+    )
+    events = signing_coordinator_child.CohortMultisigRegistered.from_receipt(tx)
+    assert events == [
+        signing_coordinator_child.CohortMultisigRegistered(
+            cohortId=cohort_id, predictedMultisig=expected_address
+        )
+    ]
+
+    # only parameters recorded, nothing deployed yet
+    assert signing_coordinator_child.cohortMultisigs(cohort_id) == ZERO_ADDRESS
+    assert signing_coordinator_child.isCohortMultisigPending(cohort_id)
+    assert signing_coordinator_child.getCohortMultisig(cohort_id) == expected_address
+    assert len(chain.provider.get_code(expected_address)) == 0
+
+    with ape.reverts("Multisig already registered"):
+        signing_coordinator_child.deployCohortMultiSig(
+            cohort_id, signers, THRESHOLD, sender=allowed_caller
+        )
+
+    # lazy deployment must match recorded parameters
+    with ape.reverts("Invalid cohort parameters"):
+        signing_coordinator_child.deployPendingCohortMultiSig(
+            cohort_id, signers, THRESHOLD + 1, sender=unauthorized_caller
+        )
+    with ape.reverts("Multisig not registered"):
+        signing_coordinator_child.deployPendingCohortMultiSig(
+            cohort_id + 1, signers, THRESHOLD, sender=unauthorized_caller
+        )
+
+    # anyone can deploy on first use
+    tx = signing_coordinator_child.deployPendingCohortMultiSig(
+        cohort_id, signers, THRESHOLD, sender=unauthorized_caller
+    )
+    events = signing_coordinator_child.CohortMultisigDeployed.from_receipt(tx)
+    assert events == [
+        signing_coordinator_child.CohortMultisigDeployed(
+            cohortId=cohort_id, multisig=expected_address
+        )
+    ]
+    assert signing_coordinator_child.cohortMultisigs(cohort_id) == expected_address
+    assert signing_coordinator_child.getCohortMultisig(cohort_id) == expected_address
+    assert not signing_coordinator_child.isCohortMultisigPending(cohort_id)
+
+    multisig = project.ThresholdSigningMultisig.at(expected_address)
+    assert multisig.getSigners() == signers
+    assert multisig.threshold() == THRESHOLD
+
+    with ape.reverts("Multisig not registered"):
+        signing_coordinator_child.deployPendingCohortMultiSig(
+            cohort_id, signers, THRESHOLD, sender=unauthorized_caller
+        )
+
+
+def test_counterfactual_update_multisig_parameters(
+    project, deployer, allowed_caller, unauthorized_caller, signers, signing_coordinator_child
+):
+    cohort_id = 8
+    signing_coordinator_child.setCounterfactualDeployment(True, sender=deployer)
+    signing_coordinator_child.deployCohortMultiSig(
+        cohort_id, signers, THRESHOLD, sender=allowed_caller
+    )
+
+    new_threshold = 3
+    new_signers = sorted(
+        [to_checksum_address(os.urandom(20)) for _ in range(NUM_SIGNERS)], key=str.lower
+    )
+
+    # additive updates need the deployed multisig
+    with ape.reverts("Multisig pending deployment"):
+        signing_coordinator_child.updateMultiSigParameters(
+            cohort_id, new_signers, new_threshold, False, sender=allowed_caller
+        )
+
+    # full replacement only updates the recorded parameters
+    signing_coordinator_child.updateMultiSigParameters(
+        cohort_id, new_signers, new_threshold, True, sender=allowed_caller
+    )
+    assert signing_coordinator_child.isCohortMultisigPending(cohort_id)
+
+    with ape.reverts("Invalid cohort parameters"):
+        signing_coordinator_child.deployPendingCohortMultiSig(
+            cohort_id, signers, THRESHOLD, sender=unauthorized_caller
+        )
+    signing_coordinator_child.deployPendingCohortMultiSig(
+        cohort_id, new_signers, new_threshold, sender=unauthorized_caller
+    )
+    multisig = project.ThresholdSigningMultisig.at(
+        signing_coordinator_child.cohortMultisigs(cohort_id)
+    )
+    assert multisig.getSigners() == new_signers
+    assert multisig.threshold() == new_threshold
+
+    # deployed multisig is updated directly from now on
+    signing_coordinator_child.updateMultiSigParameters(
+        cohort_id, signers, THRESHOLD, True, sender=allowed_caller
+    )
+    assert multisig.getSigners() == signers
+    assert multisig.threshold() == THRESHOLD
+
+    # switching the mode off restores eager deployment
+    signing_coordinator_child.setCounterfactualDeployment(False, sender=deployer)
+    signing_coordinator_child.deployCohortMultiSig(
+        cohort_id + 1, signers, THRESHOLD, sender=allowed_caller
+    )
+    assert signing_coordinator_child.cohortMultisigs(cohort_id + 1) != ZERO_ADDRESS
@@ -20,8 +20,12 @@ import ape
 import pytest
 from ape.utils import ZERO_ADDRESS
 from eth_account.messages import encode_defunct
+from eth_utils import to_checksum_address
 from web3 import Web3
 
+from deployment.constants import EIP1967_ADMIN_SLOT
+from deployment.storage_layout import get_storage_layout
+from deployment.subscription import StandardSubscriptionFees
 from tests.conftest import RitualState
 
 BASE_FEE_RATE = 42
@@ -84,11 +88,10 @@ def global_allow_list(project, creator, coordinator):
     return contract
 
 
-@pytest.fixture()
-def subscription(
-    project, creator, coordinator, global_allow_list, erc20, adopter_setter, treasury, oz_dependency
+def deploy_implementation(
+    container, creator, coordinator, global_allow_list, erc20, adopter_setter
 ):
-    contract = project.StandardSubscription.deploy(
+    return container.deploy(
         coordinator.address,
         global_allow_list.address,
         erc20.address,
@@ -103,6 +106,21 @@ def subscription(
         sender=creator,
     )
 
+
+def deploy_subscription(
+    container,
+    creator,
+    coordinator,
+    global_allow_list,
+    erc20,
+    adopter_setter,
+    treasury,
+    oz_dependency,
+):
+    contract = deploy_implementation(
+        container, creator, coordinator, global_allow_list, erc20, adopter_setter
+    )
+
     encoded_initializer_function = b""
     proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
         contract.address,
@@ -110,12 +128,28 @@ def subscription(
         encoded_initializer_function,
         sender=creator,
     )
-    proxy_contract = project.StandardSubscription.at(proxy.address)
+    proxy_contract = container.at(proxy.address)
     coordinator.setFeeModel(proxy_contract.address, sender=creator)
     proxy_contract.initialize(treasury.address, sender=treasury)
     return proxy_contract
 
 
+@pytest.fixture()
+def subscription(
+    project, creator, coordinator, global_allow_list, erc20, adopter_setter, treasury, oz_dependency
+):
+    return deploy_subscription(
+        project.StandardSubscription,
+        creator,
+        coordinator,
+        global_allow_list,
+        erc20,
+        adopter_setter,
+        treasury,
+        oz_dependency,
+    )
+
+
 def test_adopter_setter(subscription, adopter_setter, adopter):
     with ape.reverts("Only adopter setter can set adopter"):
         subscription.setAdopter(adopter, sender=adopter)
@@ -127,6 +161,24 @@ def test_adopter_setter(subscription, adopter_setter, adopter):
         subscription.setAdopter(adopter_setter, sender=adopter_setter)
 
 
+def test_base_fees(subscription):
+    fees = StandardSubscriptionFees.from_contract(subscription)
+    for period_number in range(10):
+        assert fees.base_fees(period_number) == base_fee(period_number)
+
+    # No overflow in later periods, and the Python calculator stays exact
+    for period_number in (15, 16, 17, 31, 100, 255):
+        base_fees = subscription.baseFees(period_number)
+        assert base_fees == fees.base_fees(period_number)
+        assert base_fees > subscription.baseFees(period_number - 1)
+
+    encryptor_slots = 7
+    duration = subscription.subscriptionPeriodDuration()
+    assert fees.encryptor_fees(encryptor_slots, duration) == subscription.encryptorFees(
+        encryptor_slots, duration
+    )
+
+
 def test_pay_subscription(
     erc20, subscription, coordinator, global_allow_list, adopter, adopter_setter, treasury, chain
 ):
@@ -886,6 +938,168 @@ def test_before_is_authorized(
     assert global_allow_list.isAuthorized(ritual_id, bytes(signature), bytes(data))
 
 
+def authorization_gas(
+    subscription, coordinator, global_allow_list, erc20, adopter, adopter_setter, treasury, accounts
+):
+    ritual_id = 6
+    batch_size = 10
+    encryptors = [account.address for account in accounts[10 : 10 + 2 * batch_size]]
+
+    erc20.approve(subscription.address, ERC20_SUPPLY, sender=adopter)
+    subscription.setAdopter(adopter, sender=adopter_setter)
+    subscription.payForSubscription(len(encryptors) + 1, sender=adopter)
+    coordinator.setRitual(
+        ritual_id, RitualState.ACTIVE, 0, global_allow_list.address, sender=treasury
+    )
+    coordinator.processRitualPayment(adopter, ritual_id, MAX_NODES, DURATION, sender=treasury)
+
+    single_gas = [
+        global_allow_list.authorize(ritual_id, [encryptor], sender=adopter).gas_used
+        for encryptor in encryptors[:batch_size]
+    ]
+    batch_tx = global_allow_list.authorize(ritual_id, encryptors[batch_size:], sender=adopter)
+    global_allow_list.authorize(ritual_id, [adopter.address], sender=adopter)
+    assert subscription.usedEncryptorSlots() == len(encryptors) + 1
+
+    data = os.urandom(32)
+    signable_message = encode_defunct(Web3.keccak(data))
+    signature = Web3().eth.account.sign_message(signable_message, private_key=adopter.private_key)
+    assert global_allow_list.isAuthorized(ritual_id, bytes(signature.signature), bytes(data))
+    is_authorized_gas = global_allow_list.isAuthorized.estimate_gas_cost(
+        ritual_id, bytes(signature.signature), bytes(data)
+    )
+    return single_gas, batch_tx.gas_used, is_authorized_gas
+
+
+def test_authorization_gas(
+    project,
+    erc20,
+    subscription,
+    coordinator,
+    adopter,
+    adopter_setter,
+    global_allow_list,
+    treasury,
+    creator,
+    accounts,
+    oz_dependency,
+):
+    single_gas, batch_gas, is_authorized_gas = authorization_gas(
+        subscription,
+        coordinator,
+        global_allow_list,
+        erc20,
+        adopter,
+        adopter_setter,
+        treasury,
+        accounts,
+    )
+
+    # Same calls against used slots kept in their own storage slot
+    legacy_coordinator = project.CoordinatorForStandardSubscriptionMock.deploy(sender=creator)
+    legacy_allow_list = project.GlobalAllowList.deploy(legacy_coordinator.address, sender=creator)
+    legacy_subscription = deploy_subscription(
+        project.LegacyStandardSubscriptionMock,
+        creator,
+        legacy_coordinator,
+        legacy_allow_list,
+        erc20,
+        adopter_setter,
+        treasury,
+        oz_dependency,
+    )
+    legacy_single_gas, legacy_batch_gas, legacy_is_authorized_gas = authorization_gas(
+        legacy_subscription,
+        legacy_coordinator,
+        legacy_allow_list,
+        erc20,
+        adopter,
+        adopter_setter,
+        treasury,
+        accounts,
+    )
+
+    # Used slots are read and written with the packed subscription slot, which is already warm
+    assert all(gas < legacy_gas for gas, legacy_gas in zip(single_gas, legacy_single_gas))
+    assert batch_gas < legacy_batch_gas
+    assert is_authorized_gas < legacy_is_authorized_gas
+    # Slot accounting is paid once per batch
+    assert batch_gas < sum(single_gas[1:])
+
+
+def test_used_encryptor_slots_migration(
+    project,
+    chain,
+    erc20,
+    coordinator,
+    adopter,
+    adopter_setter,
+    global_allow_list,
+    treasury,
+    creator,
+    accounts,
+    oz_dependency,
+):
+    ritual_id = 6
+    encryptors = [account.address for account in accounts[10:15]]
+    subscription = deploy_subscription(
+        project.LegacyStandardSubscriptionMock,
+        creator,
+        coordinator,
+        global_allow_list,
+        erc20,
+        adopter_setter,
+        treasury,
+        oz_dependency,
+    )
+    erc20.approve(subscription.address, ERC20_SUPPLY, sender=adopter)
+    subscription.setAdopter(adopter, sender=adopter_setter)
+    subscription.payForSubscription(len(encryptors), sender=adopter)
+    coordinator.setRitual(
+        ritual_id, RitualState.ACTIVE, 0, global_allow_list.address, sender=treasury
+    )
+    coordinator.processRitualPayment(adopter, ritual_id, MAX_NODES, DURATION, sender=treasury)
+
+    # Slots used before the upgrade are stored in the former slot
+    global_allow_list.authorize(ritual_id, encryptors[:3], sender=adopter)
+    stub = next(
+        variable
+        for variable in get_storage_layout("StandardSubscription").variables
+        if variable.label == "usedEncryptorSlotsStub"
+    )
+
+    def stub_value():
+        value = chain.provider.get_storage_at(address=subscription.address, slot=stub.slot)
+        return int.from_bytes(value, "big")
+
+    assert stub_value() == 3
+
+    implementation = deploy_implementation(
+        project.StandardSubscription, creator, coordinator, global_allow_list, erc20, adopter_setter
+    )
+    admin_slot = chain.provider.get_storage_at(
+        address=subscription.address, slot=EIP1967_ADMIN_SLOT
+    )
+    proxy_admin = oz_dependency.ProxyAdmin.at(to_checksum_address(admin_slot[-20:]))
+    proxy_admin.upgradeAndCall(subscription.address, implementation.address, b"", sender=creator)
+    subscription = project.StandardSubscription.at(subscription.address)
+
+    # The former value is counted until the first update folds it in
+    assert subscription.usedEncryptorSlots() == 3
+    with ape.reverts("Encryptors slots filled up"):
+        global_allow_list.authorize(ritual_id, encryptors[3:] + [adopter.address], sender=adopter)
+    assert stub_value() == 3
+
+    global_allow_list.authorize(ritual_id, encryptors[3:], sender=adopter)
+    assert subscription.usedEncryptorSlots() == len(encryptors)
+    assert stub_value() == 0
+
+    global_allow_list.deauthorize(ritual_id, encryptors, sender=adopter)
+    assert subscription.usedEncryptorSlots() == 0
+    global_allow_list.authorize(ritual_id, encryptors, sender=adopter)
+    assert subscription.usedEncryptorSlots() == len(encryptors)
+
+
 def test_transfer_ownership(
     subscription,
     creator,
@@ -0,0 +1,152 @@
+from types import SimpleNamespace
+
+import pytest
+
+from deployment.storage_layout import (
+    IncompatibleStorageLayout,
+    StorageLayout,
+    StorageVariable,
+    _get_source_path,
+    check_storage_compatibility,
+    validate_storage_compatibility,
+)
+
+GAP = StorageVariable(label="__gap", slot=3, offset=0, type="uint256[10]", size=320)
+
+
+def layout(*variables, structs=None, array_structs=()):
+    return StorageLayout(
+        contract="Upgradeable",
+        variables=list(variables),
+        structs=structs or dict(),
+        array_structs=array_structs,
+    )
+
+
+def variable(label, slot, offset=0, type="uint256", size=32):
+    return StorageVariable(label=label, slot=slot, offset=offset, type=type, size=size)
+
+
+BASELINE = layout(
+    variable("owner", 0, type="address", size=20),
+    variable("paused", 0, offset=20, type="bool", size=1),
+    variable("counter", 1),
+    variable("balances", 2, type="mapping(address => uint256)"),
+    GAP,
+)
+
+
+def reasons(old, new):
+    return [issue.reason for issue in check_storage_compatibility(old=old, new=new)]
+
+
+def test_unchanged_layout():
+    assert check_storage_compatibility(old=BASELINE, new=BASELINE) == []
+    validate_storage_compatibility(old=BASELINE, new=BASELINE)
+
+
+def test_appended_variable():
+    # after the gap
+    new = layout(*BASELINE.variables, variable("fee", 13))
+    assert reasons(BASELINE, new) == []
+
+    # or in the free space of a packed slot
+    new = layout(*BASELINE.variables, variable("version", 0, offset=21, type="uint8", size=1))
+    assert reasons(BASELINE, new) == []
+
+
+def test_gap_shrink():
+    # using the gap for a new variable keeps the following storage in place
+    used_gap = GAP._replace(slot=4, type="uint256[9]", size=288)
+    new = layout(*BASELINE.variables[:-1], variable("fee", 3), used_gap)
+    assert reasons(BASELINE, new) == []
+
+    # shrinking it without using the space shifts everything after it
+    shrunk_gap = GAP._replace(type="uint256[9]", size=288)
+    new = layout(*BASELINE.variables[:-1], shrunk_gap)
+    assert reasons(BASELINE, new) == ["gap '__gap' must end at slot 13, now ends at slot 12"]
+
+
+def test_slot_reorder():
+    new = layout(
+        BASELINE.variables[0],
+        BASELINE.variables[1],
+        variable("balances", 1, type="mapping(address => uint256)"),
+        variable("counter", 2),
+        GAP,
+    )
+    assert reasons(BASELINE, new) == [
+        "'counter' moved to slot 2 offset 0",
+        "'balances' moved to slot 1 offset 0",
+    ]
+
+    # even when the swapped variables have the same type
+    new = layout(*BASELINE.variables[:2], variable("counter", 2), variable("balances", 1), GAP)
+    base = layout(*BASELINE.variables[:2], variable("counter", 1), variable("balances", 2), GAP)
+    assert reasons(base, new) == [
+        "'counter' moved to slot 2 offset 0",
+        "'balances' moved to slot 1 offset 0",
+    ]
+
+    # as well as inserting a variable in the middle
+    new = layout(
+        *BASELINE.variables[:2],
+        variable("fee", 1),
+        variable("counter", 2),
+        variable("balances", 3, type="mapping(address => uint256)"),
+        GAP._replace(slot=4, type="uint256[9]", size=288),
+    )
+    assert reasons(BASELINE, new) == [
+        "'counter' moved to slot 2 offset 0",
+        "'balances' moved to slot 3 offset 0",
+    ]
+
+
+def test_type_change():
+    new = layout(
+        *BASELINE.variables[:2],
+        variable("counter", 1, type="int256"),
+        *BASELINE.variables[3:],
+    )
+    assert reasons(BASELINE, new) == ["'counter' type changed from uint256 to int256"]
+    with pytest.raises(IncompatibleStorageLayout, match="type changed"):
+        validate_storage_compatibility(old=BASELINE, new=new)
+
+    # renames and equivalent types are fine
+    new = layout(
+        variable("owner", 0, type="contract Ownable", size=20),
+        variable("stubPaused", 0, offset=20, type="bool", size=1),
+        *BASELINE.variables[2:],
+    )
+    assert reasons(BASELINE, new) == []
+
+
+def test_struct_in_array_resize():
+    members = [variable("amount", 0, type="uint96", size=12)]
+    structs = {"struct Info": members}
+    appended = {"struct Info": members + [variable("endTime", 1)]}
+
+    assert reasons(layout(structs=structs), layout(structs=appended)) == []
+    old = layout(structs=structs, array_structs=("struct Info",))
+    new = layout(structs=appended, array_structs=("struct Info",))
+    assert reasons(old, new) == ["size changed from 1 to 2 slots, but it is stored in arrays"]
+
+
+def test_layout_serialization():
+    old = layout(*BASELINE.variables, array_structs=("struct Info",))
+    assert StorageLayout.from_dict(old.to_dict()) == old
+    assert layout().array_structs == ()
+
+
+def test_source_path_in_other_project(tmp_path):
+    # the layout at a git ref is compiled from the source declaring the contract at that ref
+    contracts_folder = tmp_path / "contracts"
+    (contracts_folder / "moved").mkdir(parents=True)
+    (contracts_folder / "Other.sol").write_text("contract UpgradeableV2 {}\n")
+    source_path = contracts_folder / "moved" / "Upgradeable.sol"
+    source_path.write_text("import './Other.sol';\n\nabstract contract Upgradeable {}\n")
+    project_manager = SimpleNamespace(contracts_folder=contracts_folder)
+
+    assert _get_source_path("Upgradeable", project_manager) == source_path
+    with pytest.raises(FileNotFoundError):
+        _get_source_path("Coordinator", project_manager)
@@ -0,0 +1,179 @@
+import threading
+
+import pytest
+
+from deployment import params
+from deployment.fees import GWEI, FeeStrategy
+from deployment.params import Transactor
+
+STATIC_GAS = 40_000
+MAX_GAS_PRICE = 10**11
+STUCK_TIMEOUT = 0.5
+
+
+@pytest.fixture()
+def deployer(accounts):
+    return accounts[0]
+
+
+@pytest.fixture()
+def reimbursement_pool(project, deployer):
+    return project.ReimbursementPool.deploy(STATIC_GAS, MAX_GAS_PRICE, sender=deployer)
+
+
+@pytest.fixture()
+def manual_mining(chain, reimbursement_pool):
+    # transactions are mined on demand once the contract is deployed
+    chain.provider.auto_mine = False
+    yield
+    chain.provider.auto_mine = True
+
+
+def mine(chain):
+    # evm_mine includes pending transactions
+    chain.provider.make_request("evm_mine", [])
+
+
+class MiningFeeStrategy(FeeStrategy):
+    """Suggests the fees of the latest block and mines when a replacement is requested."""
+
+    def __init__(self, chain, mining_delay):
+        base_fee = chain.blocks.head.base_fee
+        super().__init__(
+            fee_history=lambda *_args: {"baseFeePerGas": [base_fee], "reward": [[GWEI]]}
+        )
+        self.chain = chain
+        self.mining_delay = mining_delay
+        self.replaced = list()
+
+    def replacement_fees(self, fees):
+        self.replaced.append(fees)
+        if self.mining_delay:
+            threading.Timer(self.mining_delay, mine, args=(self.chain,)).start()
+        else:
+            mine(self.chain)
+        return super().replacement_fees(fees)
+
+
+@pytest.fixture()
+def wait_timeouts(chain, monkeypatch):
+    eth = chain.provider.web3.eth
+    timeouts = list()
+    wait_for_transaction_receipt = eth.wait_for_transaction_receipt
+
+    def wait(txn_hash, timeout):
+        timeouts.append(timeout)
+        return wait_for_transaction_receipt(txn_hash, timeout=timeout)
+
+    monkeypatch.setattr(eth, "wait_for_transaction_receipt", wait)
+    return timeouts
+
+
+def test_stuck_transaction_is_replaced(
+    chain, monkeypatch, deployer, reimbursement_pool, manual_mining, wait_timeouts
+):
+    monkeypatch.setattr(Transactor, "STUCK_TIMEOUT", STUCK_TIMEOUT)
+    monkeypatch.setattr(Transactor, "MAX_REPLACEMENTS", 1)
+    fee_strategy = MiningFeeStrategy(chain, mining_delay=2 * STUCK_TIMEOUT)
+    transactor = Transactor(account=deployer, autosign=True, fee_strategy=fee_strategy)
+    nonce = deployer.nonce
+
+    receipt = transactor.transact(reimbursement_pool.authorize, deployer.address)
+
+    # the replacement, sent with higher fees and the same nonce, is mined
+    (sent_fees,) = fee_strategy.replaced
+    assert sent_fees == fee_strategy.suggest_fees()
+    assert receipt.transaction.nonce == nonce
+    assert receipt.transaction.max_fee > sent_fees.max_fee
+    assert receipt.transaction.max_priority_fee > sent_fees.max_priority_fee
+    assert reimbursement_pool.isAuthorized(deployer.address)
+
+    # the last version is awaited for as long as any other transaction;
+    # ape awaits the receipt once more when fetching it
+    acceptance_timeout = chain.provider.network.transaction_acceptance_timeout
+    assert wait_timeouts[:2] == [STUCK_TIMEOUT, acceptance_timeout]
+
+
+def test_stuck_transaction_mined_before_replacement(
+    chain, monkeypatch, deployer, reimbursement_pool, manual_mining, wait_timeouts
+):
+    monkeypatch.setattr(Transactor, "STUCK_TIMEOUT", STUCK_TIMEOUT)
+    fee_strategy = MiningFeeStrategy(chain, mining_delay=0)
+    transactor = Transactor(account=deployer, autosign=True, fee_strategy=fee_strategy)
+
+    receipt = transactor.transact(reimbursement_pool.authorize, deployer.address)
+
+    # the replacement is rejected since the earlier version has been mined meanwhile
+    (sent_fees,) = fee_strategy.replaced
+    assert receipt.transaction.max_fee == sent_fees.max_fee
+    assert receipt.transaction.max_priority_fee == sent_fees.max_priority_fee
+    assert reimbursement_pool.isAuthorized(deployer.address)
+    assert wait_timeouts[:2] == [STUCK_TIMEOUT, STUCK_TIMEOUT]
+
+
+def test_fee_strategy_is_opt_in(chain, monkeypatch, deployer, reimbursement_pool):
+    def fee_history(*_args):
+        raise AssertionError("Fee history must not be requested")
+
+    # not even on live networks
+    monkeypatch.setattr(params, "is_local_network", lambda: False)
+    monkeypatch.setattr(FeeStrategy, "from_provider", fee_history)
+    receipt = Transactor(account=deployer, autosign=True).transact(
+        reimbursement_pool.authorize, deployer.address
+    )
+    assert not receipt.failed
+
+    with pytest.raises(ValueError):
+        Transactor(
+            account=deployer,
+            autosign=True,
+            max_fee="10 gwei",
+            fee_strategy=FeeStrategy(fee_history=fee_history),
+        )
+
+
+def test_transact_many(chain, deployer, accounts, reimbursement_pool):
+    transactor = Transactor(account=deployer, autosign=True)
+    contracts = accounts[1:5]
+    nonce = deployer.nonce
+
+    results = transactor.transact_many(
+        [(reimbursement_pool.authorize, (contract.address,)) for contract in contracts]
+    )
+
+    # calls are sent with consecutive nonces, in call order
+    assert [result.args for result in results] == [(contract.address,) for contract in contracts]
+    assert not any(result.failed for result in results)
+    assert [result.receipt.transaction.nonce for result in results] == list(
+        range(nonce, nonce + len(contracts))
+    )
+    block_numbers = [result.receipt.block_number for result in results]
+    assert block_numbers == sorted(block_numbers)
+    assert deployer.nonce == nonce + len(contracts)
+    assert all(reimbursement_pool.isAuthorized(contract.address) for contract in contracts)
+
+
+def test_transact_many_with_reverted_call(deployer, accounts, reimbursement_pool):
+    transactor = Transactor(account=deployer, autosign=True)
+    contract_1, contract_2, receiver = accounts[1:4]
+    nonce = deployer.nonce
+    calls = [
+        (reimbursement_pool.authorize, (contract_1.address,)),
+        # the pool has no funds
+        (reimbursement_pool.withdraw, (1, receiver.address)),
+        (reimbursement_pool.authorize, (contract_2.address,)),
+    ]
+
+    results = transactor.transact_many(calls)
+
+    # the failure is reported for the reverted call only, the other calls are still mined
+    assert [result.failed for result in results] == [False, True, False]
+    reverted = results[1]
+    assert reverted.args == (1, receiver.address)
+    assert reverted.receipt.failed
+    assert [result.receipt.transaction.nonce for result in results] == [nonce, nonce + 1, nonce + 2]
+    assert reimbursement_pool.isAuthorized(contract_1.address)
+    assert reimbursement_pool.isAuthorized(contract_2.address)
+
+    with pytest.raises(RuntimeError, match="1 of 3 transactions failed"):
+        transactor.transact_all(calls)
@@ -0,0 +1,82 @@
+import json
+from types import SimpleNamespace
+
+import pytest
+from ape_etherscan.exceptions import ContractVerificationError
+
+from deployment import utils
+
+ADDRESSES = [f"0x{i:040x}" for i in range(1, 4)]
+
+
+@pytest.fixture()
+def published(monkeypatch, tmp_path):
+    monkeypatch.setattr(
+        utils, "VERIFIED_CONTRACTS_FILEPATH", tmp_path / ".build" / "verified_contracts.json"
+    )
+    monkeypatch.setattr(utils, "_get_explorer_rate_limit", lambda: 100)
+    addresses = list()
+    failing = set()
+
+    def publish(address):
+        addresses.append(address)
+        if address in failing:
+            raise ContractVerificationError("Fail - Unable to verify")
+
+    monkeypatch.setattr(utils, "_publish_contract", publish)
+    return SimpleNamespace(addresses=addresses, failing=failing)
+
+
+def _contracts(addresses):
+    return [
+        SimpleNamespace(address=address, contract_type=SimpleNamespace(name=f"C{i}"))
+        for i, address in enumerate(addresses)
+    ]
+
+
+def test_verified_contracts_are_skipped(chain, published):
+    utils.verify_contracts(_contracts(ADDRESSES[:2]))
+    assert sorted(published.addresses) == ADDRESSES[:2]
+    verified_contracts = json.loads(utils.VERIFIED_CONTRACTS_FILEPATH.read_text())
+    assert verified_contracts == {str(chain.chain_id): {ADDRESSES[0]: "C0", ADDRESSES[1]: "C1"}}
+
+    # only the new contract is submitted, the record is extended
+    published.addresses.clear()
+    utils.verify_contracts(_contracts(ADDRESSES))
+    assert published.addresses == [ADDRESSES[2]]
+    verified_contracts = json.loads(utils.VERIFIED_CONTRACTS_FILEPATH.read_text())
+    assert sorted(verified_contracts[str(chain.chain_id)]) == ADDRESSES
+
+    # unless forced
+    published.addresses.clear()
+    utils.verify_contracts(_contracts(ADDRESSES), force=True)
+    assert sorted(published.addresses) == ADDRESSES
+
+
+def test_failed_verifications_are_not_recorded(chain, published):
+    published.failing.add(ADDRESSES[1])
+    with pytest.raises(ContractVerificationError, match=f"C1 at {ADDRESSES[1]}"):
+        utils.verify_contracts(_contracts(ADDRESSES))
+    assert sorted(published.addresses) == ADDRESSES
+    verified_contracts = json.loads(utils.VERIFIED_CONTRACTS_FILEPATH.read_text())
+    assert sorted(verified_contracts[str(chain.chain_id)]) == [ADDRESSES[0], ADDRESSES[2]]
+
+    # the failed contract is retried on the next run
+    published.failing.clear()
+    published.addresses.clear()
+    utils.verify_contracts(_contracts(ADDRESSES))
+    assert published.addresses == [ADDRESSES[1]]
+
+
+def test_verified_contracts_are_recorded_per_chain(chain, published):
+    utils.VERIFIED_CONTRACTS_FILEPATH.parent.mkdir(parents=True)
+    utils.VERIFIED_CONTRACTS_FILEPATH.write_text(json.dumps({"1": {ADDRESSES[0]: "C0"}}))
+
+    # an address verified on another chain is verified again
+    utils.verify_contracts(_contracts(ADDRESSES[:1]))
+    assert published.addresses == [ADDRESSES[0]]
+    verified_contracts = json.loads(utils.VERIFIED_CONTRACTS_FILEPATH.read_text())
+    assert verified_contracts == {
+        "1": {ADDRESSES[0]: "C0"},
+        str(chain.chain_id): {ADDRESSES[0]: "C0"},
+    }
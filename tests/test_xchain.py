@@ -0,0 +1,287 @@
+import ape
+import pytest
+from ape.utils import ZERO_ADDRESS
+from eth_abi import decode
+from web3 import Web3
+
+from deployment.xchain import get_flush_batches, get_queued_updates
+
+OPERATOR_SLOT = 0
+AUTHORIZATION_SLOT = 1
+DEAUTHORIZING_SLOT = 4
+
+MIN_AUTHORIZATION = Web3.to_wei(40_000, "ether")
+UPDATES = 20
+
+
+@pytest.fixture(scope="module")
+def creator(accounts):
+    return accounts[0]
+
+
+@pytest.fixture(scope="module")
+def fx_child(accounts):
+    # relays state syncs to the child tunnel
+    return accounts[1]
+
+
+@pytest.fixture(scope="module")
+def staking_providers(accounts):
+    return accounts[2:6]
+
+
+@pytest.fixture(scope="module")
+def operators(accounts):
+    return accounts[6:10]
+
+
+@pytest.fixture()
+def state_sender(project, creator):
+    return project.StateSenderMock.deploy(sender=creator)
+
+
+@pytest.fixture()
+def fx_root(project, creator, fx_child, state_sender):
+    contract = project.FxRootMock.deploy(state_sender.address, fx_child, sender=creator)
+    state_sender.register(contract.address, fx_child, sender=creator)
+    return contract
+
+
+@pytest.fixture()
+def root_application(project, creator):
+    return project.RootApplicationForTACoChildApplicationMock.deploy(sender=creator)
+
+
+@pytest.fixture()
+def polygon_child(project, creator, fx_child):
+    return project.PolygonChild.deploy(fx_child, sender=creator)
+
+
+@pytest.fixture()
+def child_application(project, creator, polygon_child, oz_dependency):
+    contract = project.TACoChildApplication.deploy(
+        polygon_child.address, MIN_AUTHORIZATION, sender=creator
+    )
+    proxy = oz_dependency.TransparentUpgradeableProxy.deploy(
+        contract.address,
+        creator,
+        b"",
+        sender=creator,
+    )
+    proxy_contract = project.TACoChildApplication.at(proxy.address)
+    polygon_child.setChildApplication(proxy_contract.address, sender=creator)
+    return proxy_contract
+
+
+@pytest.fixture()
+def polygon_root(project, creator, fx_root, root_application, polygon_child, child_application):
+    contract = project.PolygonRoot.deploy(
+        creator, fx_root.address, root_application.address, polygon_child.address, sender=creator
+    )
+    root_application.setChildApplication(contract.address, sender=creator)
+    polygon_child.setFxRootTunnel(contract.address, sender=creator)
+    return contract
+
+
+def relay(state_sender, polygon_child, fx_child, tx):
+    """Delivers state syncs of the L1 transaction to the child tunnel, as FxChild does."""
+    state_syncs = tx.events.filter(state_sender.StateSynced)
+    for state_sync in state_syncs:
+        sender, _receiver, message = decode(["address", "address", "bytes"], state_sync.data)
+        polygon_child.processMessageFromRoot(state_sync.id, sender, message, sender=fx_child)
+    return len(state_syncs)
+
+
+def test_batching(
+    chain,
+    creator,
+    fx_child,
+    state_sender,
+    root_application,
+    polygon_root,
+    polygon_child,
+    child_application,
+    staking_providers,
+    operators,
+):
+    staking_provider_1, staking_provider_2, *_ = staking_providers
+    operator_1, operator_2, *_ = operators
+
+    with ape.reverts():
+        polygon_root.setBatching(True, sender=staking_provider_1)
+
+    # Each message is sent right away by default
+    tx = root_application.updateOperator(staking_provider_1, operator_1, sender=creator)
+    assert relay(state_sender, polygon_child, fx_child, tx) == 1
+    assert child_application.operatorToStakingProvider(operator_1) == staking_provider_1
+
+    tx = polygon_root.setBatching(True, sender=creator)
+    assert tx.events == [polygon_root.BatchingUpdated(enabled=True)]
+    assert polygon_root.batching()
+    assert not polygon_root.hasQueuedUpdates()
+    from_block = chain.blocks.head.number
+
+    # Messages are queued until flushed
+    updates = []
+    for tx in (
+        root_application.updateAuthorization(
+            staking_provider_1, MIN_AUTHORIZATION, 0, 0, sender=creator
+        ),
+        root_application.updateOperator(staking_provider_2, operator_2, sender=creator),
+        root_application.updateAuthorization(
+            staking_provider_2, 2 * MIN_AUTHORIZATION, MIN_AUTHORIZATION, 0, sender=creator
+        ),
+        root_application.updateOperator(staking_provider_2, ZERO_ADDRESS, sender=creator),
+        root_application.updateOperator(staking_provider_1, operator_2, sender=creator),
+    ):
+        assert not tx.events.filter(state_sender.StateSynced)
+        (event,) = tx.events.filter(polygon_root.UpdateQueued)
+        updates.append(bytes(event.update))
+    assert polygon_root.hasQueuedUpdates()
+    assert child_application.stakingProviderInfo(staking_provider_1)[AUTHORIZATION_SLOT] == 0
+    assert child_application.operatorToStakingProvider(operator_2) == ZERO_ADDRESS
+
+    with ape.reverts("Queue is not empty"):
+        polygon_root.setBatching(False, sender=creator)
+    with ape.reverts("Nothing to flush"):
+        polygon_root.flush([], [], sender=creator)
+    with ape.reverts("Updates don't match the queue"):
+        polygon_root.flush(updates[:-1], [], sender=creator)
+    with ape.reverts("Updates don't match the queue"):
+        polygon_root.flush(list(reversed(updates)), [], sender=creator)
+
+    assert get_queued_updates(polygon_root, from_block=from_block) == updates
+
+    # All queued messages are delivered in order as one state sync, anyone can flush
+    tx = polygon_root.flush(updates, [], sender=staking_provider_1)
+    assert tx.events.filter(polygon_root.UpdatesFlushed) == [
+        polygon_root.UpdatesFlushed(updatesHash=polygon_root.queuedUpdatesHash(), updates=5)
+    ]
+    assert not polygon_root.hasQueuedUpdates()
+    assert relay(state_sender, polygon_child, fx_child, tx) == 1
+
+    info = child_application.stakingProviderInfo(staking_provider_1)
+    assert info[OPERATOR_SLOT] == operator_2
+    assert info[AUTHORIZATION_SLOT] == MIN_AUTHORIZATION
+    assert info[DEAUTHORIZING_SLOT] == 0
+    info = child_application.stakingProviderInfo(staking_provider_2)
+    assert info[OPERATOR_SLOT] == ZERO_ADDRESS
+    assert info[AUTHORIZATION_SLOT] == 2 * MIN_AUTHORIZATION
+    assert info[DEAUTHORIZING_SLOT] == MIN_AUTHORIZATION
+    assert child_application.operatorToStakingProvider(operator_2) == staking_provider_1
+    assert child_application.operatorToStakingProvider(operator_1) == ZERO_ADDRESS
+
+    # Flushed messages can't be delivered twice
+    assert get_queued_updates(polygon_root, from_block=from_block) == []
+    with ape.reverts("Updates don't match the queue"):
+        polygon_root.flush(updates, [], sender=creator)
+
+    tx = polygon_root.setBatching(False, sender=creator)
+    assert tx.events == [polygon_root.BatchingUpdated(enabled=False)]
+
+
+def test_flush_in_batches(
+    chain,
+    creator,
+    fx_child,
+    state_sender,
+    root_application,
+    polygon_root,
+    polygon_child,
+    child_application,
+    staking_providers,
+):
+    with ape.reverts():
+        polygon_root.setMaxBatchSize(2, sender=staking_providers[0])
+    with ape.reverts("Batch size must be specified"):
+        polygon_root.setMaxBatchSize(0, sender=creator)
+    tx = polygon_root.setMaxBatchSize(2, sender=creator)
+    assert tx.events == [polygon_root.MaxBatchSizeUpdated(maxBatchSize=2)]
+
+    polygon_root.setBatching(True, sender=creator)
+    from_block = chain.blocks.head.number
+    for i, staking_provider in enumerate(staking_providers[:3], start=1):
+        root_application.updateAuthorization(
+            staking_provider, i * MIN_AUTHORIZATION, 0, 0, sender=creator
+        )
+    updates = get_queued_updates(polygon_root, from_block=from_block)
+    assert len(updates) == 3
+
+    with ape.reverts("Too many updates"):
+        polygon_root.flush(updates, [], sender=creator)
+
+    batches = get_flush_batches(updates, max_batch_size=2)
+    assert [len(batch) for batch, _remaining in batches] == [2, 1]
+    (first_batch, remaining_update_hashes), (last_batch, _) = batches
+
+    # The rest of the queue must be proven with the hashes of the remaining updates
+    with ape.reverts("Updates don't match the queue"):
+        polygon_root.flush(first_batch, [], sender=creator)
+    with ape.reverts("Updates don't match the queue"):
+        polygon_root.flush(first_batch, [bytes(32)], sender=creator)
+
+    # The oldest updates are delivered first, the rest stays queued
+    tx = polygon_root.flush(first_batch, remaining_update_hashes, sender=creator)
+    assert tx.events.filter(polygon_root.UpdatesFlushed)[0].updates == 2
+    assert relay(state_sender, polygon_child, fx_child, tx) == 1
+    assert polygon_root.hasQueuedUpdates()
+    assert get_queued_updates(polygon_root, from_block=from_block) == last_batch
+    for i, staking_provider in enumerate(staking_providers[:3], start=1):
+        expected = i * MIN_AUTHORIZATION if i <= 2 else 0
+        assert (
+            child_application.stakingProviderInfo(staking_provider)[AUTHORIZATION_SLOT] == expected
+        )
+
+    # A flushed prefix can't be delivered twice
+    with ape.reverts("Updates don't match the queue"):
+        polygon_root.flush(first_batch, remaining_update_hashes, sender=creator)
+
+    tx = polygon_root.flush(last_batch, [], sender=creator)
+    assert relay(state_sender, polygon_child, fx_child, tx) == 1
+    assert not polygon_root.hasQueuedUpdates()
+    assert child_application.stakingProviderInfo(staking_providers[2])[AUTHORIZATION_SLOT] == (
+        3 * MIN_AUTHORIZATION
+    )
+
+
+def test_batch_update_access(creator, child_application):
+    with ape.reverts("Caller must be the root application"):
+        child_application.batchUpdate([], sender=creator)
+
+
+def test_gas_per_update(
+    creator,
+    fx_child,
+    state_sender,
+    root_application,
+    polygon_root,
+    polygon_child,
+    staking_providers,
+):
+    def update(i):
+        staking_provider = staking_providers[i % len(staking_providers)]
+        return root_application.updateAuthorization(
+            staking_provider, MIN_AUTHORIZATION + i, 0, 0, sender=creator
+        )
+
+    direct_gas = 0
+    for i in range(UPDATES):
+        tx = update(i)
+        assert relay(state_sender, polygon_child, fx_child, tx) == 1
+        direct_gas += tx.gas_used
+
+    polygon_root.setBatching(True, sender=creator)
+    batched_gas = 0
+    updates = []
+    for i in range(UPDATES, 2 * UPDATES):
+        tx = update(i)
+        batched_gas += tx.gas_used
+        updates.extend(bytes(event.update) for event in tx.events.filter(polygon_root.UpdateQueued))
+    tx = polygon_root.flush(updates, [], sender=creator)
+    assert relay(state_sender, polygon_child, fx_child, tx) == 1
+    batched_gas += tx.gas_used
+
+    # L1 gas per update, including the flush transaction
+    direct_gas_per_update = direct_gas // UPDATES
+    batched_gas_per_update = batched_gas // UPDATES
+    assert batched_gas_per_update < direct_gas_per_update